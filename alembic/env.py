@@ -4,7 +4,7 @@ from alembic import context
 
 from app.config import settings
 from app.infrastructure.database import Base
-from app.domain.models import School, Student, Invoice, Payment
+from app.domain.models import School, Student, Invoice, Payment, ApiKey
 
 config = context.config
 
@@ -0,0 +1,31 @@
+"""add_invoice_search_indexes
+
+Revision ID: 4c1d8e2a7b36
+Revises: 9e9735fef405
+Create Date: 2026-10-19 09:12:41.503217
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '4c1d8e2a7b36'
+down_revision = '9e9735fef405'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_invoices_student_status_created', 'invoices', ['student_id', 'status', 'created_at'], unique=False)
+    op.drop_index('ix_invoices_student_id', table_name='invoices')
+    op.create_index('ix_invoices_issued_at', 'invoices', ['issued_at'], unique=False)
+    op.create_index('ix_invoices_created_at', 'invoices', ['created_at'], unique=False)
+    op.create_index('ix_invoices_currency_created', 'invoices', ['currency', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoices_currency_created', table_name='invoices')
+    op.drop_index('ix_invoices_created_at', table_name='invoices')
+    op.drop_index('ix_invoices_issued_at', table_name='invoices')
+    op.create_index('ix_invoices_student_id', 'invoices', ['student_id'], unique=False)
+    op.drop_index('ix_invoices_student_status_created', table_name='invoices')
@@ -0,0 +1,41 @@
+"""add_open_invoice_partial_indexes
+
+Revision ID: 7a2f5c90d1e4
+Revises: 4c1d8e2a7b36
+Create Date: 2026-10-19 10:34:08.917342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '7a2f5c90d1e4'
+down_revision = '4c1d8e2a7b36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so large invoice tables stay writable during the migration.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_invoices_not_void_student_created', 'invoices', ['student_id', 'created_at'],
+            unique=False, postgresql_where=sa.text("status <> 'VOID'"), postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_invoices_open_student_due', 'invoices', ['student_id', 'due_date'],
+            unique=False, postgresql_where=sa.text("status IN ('ISSUED', 'PARTIAL')"), postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_invoices_open_due_date', 'invoices', ['due_date'],
+            unique=False, postgresql_where=sa.text("status IN ('ISSUED', 'PARTIAL')"), postgresql_concurrently=True,
+        )
+        op.drop_index('ix_invoices_status', table_name='invoices', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_invoices_status', 'invoices', ['status'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_invoices_open_due_date', table_name='invoices', postgresql_concurrently=True)
+        op.drop_index('ix_invoices_open_student_due', table_name='invoices', postgresql_concurrently=True)
+        op.drop_index('ix_invoices_not_void_student_created', table_name='invoices', postgresql_concurrently=True)
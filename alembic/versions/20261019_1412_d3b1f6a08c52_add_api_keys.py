@@ -0,0 +1,37 @@
+"""add_api_keys
+
+Revision ID: d3b1f6a08c52
+Revises: 7a2f5c90d1e4
+Create Date: 2026-10-19 14:12:41.306518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = 'd3b1f6a08c52'
+down_revision = '7a2f5c90d1e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('api_keys',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('prefix', sa.String(length=16), nullable=False),
+        sa.Column('key_hash', sa.String(length=64), nullable=False),
+        sa.Column('scopes', postgresql.ARRAY(sa.String(length=50)), nullable=False),
+        sa.Column('school_id', sa.BigInteger(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['school_id'], ['schools.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('prefix')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('api_keys')
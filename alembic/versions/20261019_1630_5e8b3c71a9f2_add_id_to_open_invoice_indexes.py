@@ -0,0 +1,41 @@
+"""add_id_to_open_invoice_indexes
+
+Revision ID: 5e8b3c71a9f2
+Revises: d3b1f6a08c52
+Create Date: 2026-10-19 16:30:12.584193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '5e8b3c71a9f2'
+down_revision = 'd3b1f6a08c52'
+branch_labels = None
+depends_on = None
+
+OPEN = "status IN ('ISSUED', 'PARTIAL')"
+
+
+def _rebuild(name: str, columns: list) -> None:
+    # The replacement is built next to the old index and renamed into place,
+    # so open-invoice queries never run without one.
+    op.create_index(
+        f'{name}_new', 'invoices', columns,
+        unique=False, postgresql_where=sa.text(OPEN), postgresql_concurrently=True,
+    )
+    op.drop_index(name, table_name='invoices', postgresql_concurrently=True)
+    op.execute(f'ALTER INDEX {name}_new RENAME TO {name}')
+
+
+def upgrade() -> None:
+    # id matches the tiebreaker of the open-invoice ORDER BY (due_date, id)
+    with op.get_context().autocommit_block():
+        _rebuild('ix_invoices_open_student_due', ['student_id', 'due_date', 'id'])
+        _rebuild('ix_invoices_open_due_date', ['due_date', 'id'])
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        _rebuild('ix_invoices_open_due_date', ['due_date'])
+        _rebuild('ix_invoices_open_student_due', ['student_id', 'due_date'])
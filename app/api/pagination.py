@@ -0,0 +1,12 @@
+from fastapi import Response
+
+from app.repositories.base import TotalCount
+
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_EXACT_HEADER = "X-Total-Count-Exact"
+
+
+def set_total_count_headers(response: Response, total: TotalCount) -> None:
+    response.headers[TOTAL_COUNT_HEADER] = str(total.value)
+    response.headers[TOTAL_COUNT_EXACT_HEADER] = "true" if total.exact else "false"
@@ -0,0 +1,52 @@
+from functools import lru_cache
+from typing import Any, List, Mapping, Sequence, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+class ModelJSONResponse(Response):
+    """
+    JSON written by pydantic-core straight from validated models, in one pass.
+
+    FastAPI's response_model handling dumps a returned model to dicts,
+    validates them again, converts them to JSON-compatible values and only then
+    runs json.dumps. Returning this response skips all of that, so it must only
+    carry the route's response_model type; keep response_model on the route
+    for the OpenAPI schema. Decimals are written as strings, as before.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        adapter: TypeAdapter | None = None,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ):
+        self.adapter = adapter
+        super().__init__(content, status_code, headers)
+
+    def render(self, content: Any) -> bytes:
+        if self.adapter is not None:
+            return self.adapter.dump_json(content)
+        return content.__pydantic_serializer__.to_json(content)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def model_list_response(
+    model: Type[BaseModel],
+    items: Sequence[Any],
+    headers: Mapping[str, str] | None = None,
+) -> ModelJSONResponse:
+    """
+    A JSON array of model for items, which may be ORM objects (read through
+    from_attributes, one validation) or model instances (passed through).
+    """
+    adapter = _list_adapter(model)
+    return ModelJSONResponse(adapter.validate_python(items, from_attributes=True), adapter=adapter, headers=headers)
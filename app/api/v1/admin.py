@@ -0,0 +1,20 @@
+from typing import List
+from fastapi import APIRouter, Depends, status
+
+from app.infrastructure.auth import require_scope
+from app.infrastructure.slow_queries import slow_query_log
+from app.schemas.admin import SlowQueryResponse
+from app.domain.enums import ApiKeyScope
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_scope(ApiKeyScope.ADMIN))])
+
+
+@router.get("/slow-queries", response_model=List[SlowQueryResponse])
+def list_slow_queries() -> List[SlowQueryResponse]:
+    return slow_query_log.snapshot()
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries() -> None:
+    slow_query_log.clear()
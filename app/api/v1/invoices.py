@@ -1,12 +1,25 @@
-from typing import List
-from fastapi import APIRouter, Depends, status, Query
+from typing import List, Literal
+from datetime import date, datetime
+from decimal import Decimal
+from fastapi import APIRouter, Depends, Response, status, Query
 from sqlalchemy.orm import Session
 
 from app.infrastructure.database import get_db
-from app.infrastructure.auth import verify_api_key
+from app.infrastructure.auth import ApiKeyPrincipal, require_scope, authorize_school
+from app.api.pagination import set_total_count_headers
+from app.api.responses import model_list_response
 from app.services.invoice_service import InvoiceService
-from app.schemas.invoice import InvoiceCreate, InvoiceUpdate, InvoiceResponse
-from app.domain.enums import InvoiceStatus
+from app.schemas.invoice import (
+    InvoiceCreate,
+    InvoiceUpdate,
+    InvoiceFilter,
+    InvoiceResponse,
+    InvoiceBalanceResponse,
+    InvoiceBulkVoid,
+    InvoiceBulkUpdate,
+    InvoiceBulkResponse,
+)
+from app.domain.enums import InvoiceStatus, ApiKeyScope
 
 
 router = APIRouter(prefix="/invoices", tags=["invoices"])
@@ -16,31 +29,91 @@ def get_invoice_service(db: Session = Depends(get_db)) -> InvoiceService:
     return InvoiceService(db)
 
 
+def get_invoice_filter(
+    student_id: int | None = Query(None, gt=0, description="Filter by student ID"),
+    school_id: int | None = Query(None, gt=0, description="Filter by school ID"),
+    status: InvoiceStatus | None = Query(None, description="Filter by invoice status"),
+    currency: str | None = Query(None, min_length=3, max_length=3, description="Filter by currency code"),
+    due_date_from: date | None = Query(None, description="Due date lower bound (inclusive)"),
+    due_date_to: date | None = Query(None, description="Due date upper bound (inclusive)"),
+    issued_from: datetime | None = Query(None, description="Issue timestamp lower bound (inclusive)"),
+    issued_to: datetime | None = Query(None, description="Issue timestamp upper bound (inclusive)"),
+    amount_min: Decimal | None = Query(None, ge=0, description="Minimum amount_total (inclusive)"),
+    amount_max: Decimal | None = Query(None, ge=0, description="Maximum amount_total (inclusive)"),
+    open_only: bool = Query(False, description="Only ISSUED and PARTIAL invoices, ordered by due date"),
+) -> InvoiceFilter:
+    return InvoiceFilter(
+        student_id=student_id,
+        school_id=school_id,
+        status=status,
+        currency=currency,
+        due_date_from=due_date_from,
+        due_date_to=due_date_to,
+        issued_from=issued_from,
+        issued_to=issued_to,
+        amount_min=amount_min,
+        amount_max=amount_max,
+        open_only=open_only,
+    )
+
+
 @router.post("", response_model=InvoiceResponse, status_code=status.HTTP_201_CREATED)
 def create_invoice(
     invoice: InvoiceCreate,
     service: InvoiceService = Depends(get_invoice_service),
-    _: str = Depends(verify_api_key)
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.INVOICES_WRITE))
 ) -> InvoiceResponse:
+    if principal.school_id is not None:
+        authorize_school(principal, service.get_student_school_id(invoice.student_id))
     return service.create(invoice)
 
 
-@router.get("", response_model=List[InvoiceResponse])
+@router.get("", response_model=List[InvoiceBalanceResponse] | List[InvoiceResponse])
 def list_invoices(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
     offset: int = Query(0, ge=0, description="Number of items to skip"),
-    student_id: int | None = Query(None, description="Filter by student ID"),
-    status: InvoiceStatus | None = Query(None, description="Filter by invoice status"),
+    include: Literal["balance"] | None = Query(None, description="Embed computed paid/pending amounts"),
+    filters: InvoiceFilter = Depends(get_invoice_filter),
     service: InvoiceService = Depends(get_invoice_service)
-) -> List[InvoiceResponse]:
-    return service.get_all(limit=limit, offset=offset, student_id=student_id, status=status)
+) -> List[InvoiceBalanceResponse] | List[InvoiceResponse]:
+    set_total_count_headers(response, service.count(filters=filters))
+    if include == "balance":
+        invoices = service.get_all_with_balance(limit=limit, offset=offset, filters=filters)
+        return model_list_response(InvoiceBalanceResponse, invoices, headers=response.headers)
+    invoices = service.get_all(limit=limit, offset=offset, filters=filters)
+    return model_list_response(InvoiceResponse, invoices, headers=response.headers)
+
+
+@router.post(":bulk-void", response_model=InvoiceBulkResponse)
+def bulk_void_invoices(
+    selection: InvoiceBulkVoid,
+    service: InvoiceService = Depends(get_invoice_service),
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.INVOICES_WRITE))
+) -> InvoiceBulkResponse:
+    # A bulk selection can span schools
+    authorize_school(principal, None)
+    return service.bulk_void(selection)
 
 
-@router.get("/{invoice_id}", response_model=InvoiceResponse)
+@router.post(":bulk-update", response_model=InvoiceBulkResponse)
+def bulk_update_invoices(
+    changes: InvoiceBulkUpdate,
+    service: InvoiceService = Depends(get_invoice_service),
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.INVOICES_WRITE))
+) -> InvoiceBulkResponse:
+    authorize_school(principal, None)
+    return service.bulk_update(changes)
+
+
+@router.get("/{invoice_id}", response_model=InvoiceBalanceResponse | InvoiceResponse)
 def get_invoice(
     invoice_id: int,
+    include: Literal["balance"] | None = Query(None, description="Embed computed paid/pending amounts"),
     service: InvoiceService = Depends(get_invoice_service)
-) -> InvoiceResponse:
+) -> InvoiceBalanceResponse | InvoiceResponse:
+    if include == "balance":
+        return service.get_by_id_with_balance(invoice_id)
     return service.get_by_id(invoice_id)
 
 
@@ -49,8 +122,10 @@ def update_invoice(
     invoice_id: int,
     invoice: InvoiceUpdate,
     service: InvoiceService = Depends(get_invoice_service),
-    _: str = Depends(verify_api_key)
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.INVOICES_WRITE))
 ) -> InvoiceResponse:
+    if principal.school_id is not None:
+        authorize_school(principal, service.get_school_id(invoice_id))
     return service.update(invoice_id, invoice)
 
 
@@ -58,7 +133,9 @@ def update_invoice(
 def void_invoice(
     invoice_id: int,
     service: InvoiceService = Depends(get_invoice_service),
-    _: str = Depends(verify_api_key)
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.INVOICES_WRITE))
 ) -> None:
+    if principal.school_id is not None:
+        authorize_school(principal, service.get_school_id(invoice_id))
     service.void(invoice_id)
 
@@ -3,9 +3,11 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 from app.infrastructure.database import get_db
-from app.infrastructure.auth import verify_api_key
+from app.infrastructure.auth import ApiKeyPrincipal, require_scope, authorize_school
 from app.services.payment_service import PaymentService
 from app.schemas.payment import PaymentCreate, PaymentResponse
+from app.api.responses import model_list_response
+from app.domain.enums import ApiKeyScope
 
 
 router = APIRouter(prefix="/invoices", tags=["payments"])
@@ -20,8 +22,10 @@ def create_payment(
     invoice_id: int,
     payment: PaymentCreate,
     service: PaymentService = Depends(get_payment_service),
-    _: str = Depends(verify_api_key)
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.PAYMENTS_WRITE))
 ) -> PaymentResponse:
+    if principal.school_id is not None:
+        authorize_school(principal, service.get_school_id(invoice_id))
     return service.create(invoice_id, payment)
 
 
@@ -30,5 +34,5 @@ def list_payments(
     invoice_id: int,
     service: PaymentService = Depends(get_payment_service)
 ) -> List[PaymentResponse]:
-    return service.get_by_invoice(invoice_id)
+    return model_list_response(PaymentResponse, service.get_by_invoice(invoice_id))
 
@@ -0,0 +1,37 @@
+from typing import List
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.async_database import get_async_db
+from app.infrastructure.auth import ApiKeyPrincipal, require_scope, authorize_school
+from app.services.payment_service import AsyncPaymentService
+from app.schemas.payment import PaymentCreate, PaymentResponse
+from app.api.responses import model_list_response
+from app.domain.enums import ApiKeyScope
+
+
+router = APIRouter(prefix="/invoices", tags=["payments"])
+
+
+def get_payment_service(db: AsyncSession = Depends(get_async_db)) -> AsyncPaymentService:
+    return AsyncPaymentService(db)
+
+
+@router.post("/{invoice_id}/payments", response_model=PaymentResponse, status_code=status.HTTP_201_CREATED)
+async def create_payment(
+    invoice_id: int,
+    payment: PaymentCreate,
+    service: AsyncPaymentService = Depends(get_payment_service),
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.PAYMENTS_WRITE))
+) -> PaymentResponse:
+    if principal.school_id is not None:
+        authorize_school(principal, await service.get_school_id(invoice_id))
+    return await service.create(invoice_id, payment)
+
+
+@router.get("/{invoice_id}/payments", response_model=List[PaymentResponse])
+async def list_payments(
+    invoice_id: int,
+    service: AsyncPaymentService = Depends(get_payment_service)
+) -> List[PaymentResponse]:
+    return model_list_response(PaymentResponse, await service.get_by_invoice(invoice_id))
@@ -1,11 +1,14 @@
 from typing import List
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.infrastructure.database import get_db
-from app.infrastructure.auth import verify_api_key
+from app.infrastructure.auth import ApiKeyPrincipal, require_scope, authorize_school
+from app.api.pagination import set_total_count_headers
+from app.api.responses import model_list_response
 from app.services.school_service import SchoolService
 from app.schemas.school import SchoolCreate, SchoolUpdate, SchoolResponse
+from app.domain.enums import ApiKeyScope
 
 
 router = APIRouter(prefix="/schools", tags=["schools"])
@@ -19,19 +22,23 @@ def get_school_service(db: Session = Depends(get_db)) -> SchoolService:
 def create_school(
     school: SchoolCreate,
     service: SchoolService = Depends(get_school_service),
-    _: str = Depends(verify_api_key)
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.SCHOOLS_WRITE))
 ) -> SchoolResponse:
+    authorize_school(principal, None)
     return service.create(school)
 
 
 @router.get("", response_model=List[SchoolResponse])
 def list_schools(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
     offset: int = Query(0, ge=0, description="Number of items to skip"),
     is_active: bool | None = Query(None, description="Filter by active status"),
     service: SchoolService = Depends(get_school_service)
 ) -> List[SchoolResponse]:
-    return service.get_all(limit=limit, offset=offset, is_active=is_active)
+    set_total_count_headers(response, service.count(is_active=is_active))
+    schools = service.get_all(limit=limit, offset=offset, is_active=is_active)
+    return model_list_response(SchoolResponse, schools, headers=response.headers)
 
 
 @router.get("/{school_id}", response_model=SchoolResponse)
@@ -47,8 +54,9 @@ def update_school(
     school_id: int,
     school: SchoolUpdate,
     service: SchoolService = Depends(get_school_service),
-    _: str = Depends(verify_api_key)
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.SCHOOLS_WRITE))
 ) -> SchoolResponse:
+    authorize_school(principal, school_id)
     return service.update(school_id, school)
 
 
@@ -56,8 +64,9 @@ def update_school(
 def delete_school(
     school_id: int,
     service: SchoolService = Depends(get_school_service),
-    _: str = Depends(verify_api_key)
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.SCHOOLS_WRITE))
 ) -> None:
+    authorize_school(principal, school_id)
     service.delete(school_id)
 
 
@@ -65,7 +74,8 @@ def delete_school(
 def activate_school(
     school_id: int,
     service: SchoolService = Depends(get_school_service),
-    _: str = Depends(verify_api_key)
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.SCHOOLS_WRITE))
 ) -> SchoolResponse:
+    authorize_school(principal, school_id)
     return service.activate(school_id)
 
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from app.infrastructure.database import get_db
 from app.services.statement_service import StatementService
 from app.schemas.statement import StudentStatementResponse, SchoolStatementResponse
+from app.api.responses import ModelJSONResponse
 
 
 router = APIRouter(tags=["statements"])
@@ -18,7 +19,7 @@ def get_student_statement(
     student_id: int,
     service: StatementService = Depends(get_statement_service)
 ) -> StudentStatementResponse:
-    return service.get_student_statement(student_id)
+    return ModelJSONResponse(service.get_student_statement(student_id))
 
 
 @router.get("/schools/{school_id}/statement", response_model=SchoolStatementResponse)
@@ -26,5 +27,5 @@ def get_school_statement(
     school_id: int,
     service: StatementService = Depends(get_statement_service)
 ) -> SchoolStatementResponse:
-    return service.get_school_statement(school_id)
+    return ModelJSONResponse(service.get_school_statement(school_id))
 
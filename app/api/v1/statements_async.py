@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.async_database import get_async_db
+from app.services.statement_service import AsyncStatementService
+from app.schemas.statement import StudentStatementResponse, SchoolStatementResponse
+from app.api.responses import ModelJSONResponse
+
+
+router = APIRouter(tags=["statements"])
+
+
+def get_statement_service(db: AsyncSession = Depends(get_async_db)) -> AsyncStatementService:
+    return AsyncStatementService(db)
+
+
+@router.get("/students/{student_id}/statement", response_model=StudentStatementResponse)
+async def get_student_statement(
+    student_id: int,
+    service: AsyncStatementService = Depends(get_statement_service)
+) -> StudentStatementResponse:
+    return ModelJSONResponse(await service.get_student_statement(student_id))
+
+
+@router.get("/schools/{school_id}/statement", response_model=SchoolStatementResponse)
+async def get_school_statement(
+    school_id: int,
+    service: AsyncStatementService = Depends(get_statement_service)
+) -> SchoolStatementResponse:
+    return ModelJSONResponse(await service.get_school_statement(school_id))
@@ -1,11 +1,14 @@
 from typing import List
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.infrastructure.database import get_db
-from app.infrastructure.auth import verify_api_key
+from app.infrastructure.auth import ApiKeyPrincipal, require_scope, authorize_school
+from app.api.pagination import set_total_count_headers
+from app.api.responses import model_list_response
 from app.services.student_service import StudentService
 from app.schemas.student import StudentCreate, StudentUpdate, StudentResponse
+from app.domain.enums import ApiKeyScope
 
 
 router = APIRouter(prefix="/students", tags=["students"])
@@ -19,19 +22,23 @@ def get_student_service(db: Session = Depends(get_db)) -> StudentService:
 def create_student(
     student: StudentCreate,
     service: StudentService = Depends(get_student_service),
-    _: str = Depends(verify_api_key)
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.STUDENTS_WRITE))
 ) -> StudentResponse:
+    authorize_school(principal, student.school_id)
     return service.create(student)
 
 
 @router.get("", response_model=List[StudentResponse])
 def list_students(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
     offset: int = Query(0, ge=0, description="Number of items to skip"),
     school_id: int | None = Query(None, description="Filter by school ID"),
     service: StudentService = Depends(get_student_service)
 ) -> List[StudentResponse]:
-    return service.get_all(limit=limit, offset=offset, school_id=school_id)
+    set_total_count_headers(response, service.count(school_id=school_id))
+    students = service.get_all(limit=limit, offset=offset, school_id=school_id)
+    return model_list_response(StudentResponse, students, headers=response.headers)
 
 
 @router.get("/{student_id}", response_model=StudentResponse)
@@ -47,8 +54,10 @@ def update_student(
     student_id: int,
     student: StudentUpdate,
     service: StudentService = Depends(get_student_service),
-    _: str = Depends(verify_api_key)
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.STUDENTS_WRITE))
 ) -> StudentResponse:
+    if principal.school_id is not None:
+        authorize_school(principal, service.get_school_id(student_id))
     return service.update(student_id, student)
 
 
@@ -56,7 +65,9 @@ def update_student(
 def delete_student(
     student_id: int,
     service: StudentService = Depends(get_student_service),
-    _: str = Depends(verify_api_key)
+    principal: ApiKeyPrincipal = Depends(require_scope(ApiKeyScope.STUDENTS_WRITE))
 ) -> None:
+    if principal.school_id is not None:
+        authorize_school(principal, service.get_school_id(student_id))
     service.delete(student_id)
 
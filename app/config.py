@@ -10,11 +10,64 @@ class Settings(BaseSettings):
     )
 
     DATABASE_URL: str
+    DB_PREPARE_THRESHOLD: int | None = 5
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # "<statement_timeout ms>:<lock_timeout ms>" per route class; empty sets neither
+    DB_TIMEOUT_READS: str = "5000:1000"
+    DB_TIMEOUT_STATEMENTS: str = "15000:1000"
+    DB_TIMEOUT_WRITES: str = "5000:2000"
+    DB_TIMEOUT_BULK: str = "60000:5000"
+    # Requests that would wait longer than this for a connection get a 503
+    DB_POOL_WAIT_BUDGET_SECONDS: float = 1.0
+    # Primary connections kept out of the connection gate, for API key lookups
+    DB_POOL_RESERVE: int = 2
+    # Sync handler threads; empty means pool size + overflow + 10
+    THREADPOOL_SIZE: int | None = None
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_STICKINESS_SECONDS: float = 5
+    REPLICA_HEALTH_CHECK_SECONDS: float = 2
+    REPLICA_PROBE_TIMEOUT_SECONDS: float = 1
+    READINESS_DB_TIMEOUT_SECONDS: float = 2
+    READINESS_CACHE_SECONDS: float = 1
+    # After SIGTERM, /health/ready fails for this long before shutdown starts
+    SHUTDOWN_DRAIN_SECONDS: float = 5
     API_V1_PREFIX: str = "/api/v1"
     API_KEY: str = "dev-secret-key"
+    API_KEY_CACHE_TTL_SECONDS: float = 60
     
     ENVIRONMENT: str = "development"
     LOG_LEVEL: str = "INFO"
+    # "<event>:<share kept>,..." for high-volume debug/info events
+    LOG_SAMPLE_RATES: str = "payment_validation:0.01,student_statement_generated:0.1,school_statement_generated:0.1"
+    LOG_QUEUE_SIZE: int = 10_000
+
+    EXACT_COUNT_THRESHOLD: int = 100_000
+    COUNT_CACHE_TTL_SECONDS: float = 0
+
+    SLOW_QUERY_THRESHOLD_MS: float = 500
+    SLOW_QUERY_EXPLAIN: bool = False
+    SLOW_QUERY_HISTORY: int = 10
+
+    # "<requests per second>:<burst>" per client and route group; empty disables
+    RATE_LIMIT_STATEMENTS: str = "5:10"
+    RATE_LIMIT_WRITES: str = "20:40"
+    RATE_LIMIT_LISTS: str = "50:100"
+
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 4
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # "otlp", "console" or "file" (TRACING_FILE); empty disables tracing
+    TRACING_EXPORTER: str = ""
+    TRACING_SAMPLE_RATIO: float = 0.05
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_FILE: str = ""
 
 
 settings = Settings()
\ No newline at end of file
@@ -12,4 +12,12 @@ class PaymentMethod(str, Enum):
     CARD = "CARD"
     TRANSFER = "TRANSFER"
     CHECK = "CHECK"
-    OTHER = "OTHER"
\ No newline at end of file
+    OTHER = "OTHER"
+
+
+class ApiKeyScope(str, Enum):
+    SCHOOLS_WRITE = "schools:write"
+    STUDENTS_WRITE = "students:write"
+    INVOICES_WRITE = "invoices:write"
+    PAYMENTS_WRITE = "payments:write"
+    ADMIN = "admin"
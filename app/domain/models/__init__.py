@@ -2,6 +2,7 @@ from app.domain.models.school import School
 from app.domain.models.student import Student
 from app.domain.models.invoice import Invoice
 from app.domain.models.payment import Payment
+from app.domain.models.api_key import ApiKey
 
-__all__ = ["School", "Student", "Invoice", "Payment"]
+__all__ = ["School", "Student", "Invoice", "Payment", "ApiKey"]
 
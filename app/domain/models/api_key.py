@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import List
+from sqlalchemy import BigInteger, String, DateTime, Boolean, ForeignKey
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.database import Base
+from app.domain.utils import utc_now
+
+
+class ApiKey(Base):
+    """
+    A client's API key. Only a SHA-256 hash of the key is stored; prefix is
+    the public part of the key ("mtl_<prefix>_<secret>") used to find the row.
+    """
+
+    __tablename__ = "api_keys"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    prefix: Mapped[str] = mapped_column(String(16), nullable=False, unique=True)
+    key_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    scopes: Mapped[List[str]] = mapped_column(ARRAY(String(50)), nullable=False, default=list)
+    school_id: Mapped[int | None] = mapped_column(BigInteger, ForeignKey("schools.id", ondelete="CASCADE"), nullable=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utc_now, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=utc_now, onupdate=utc_now, nullable=False)
+
+    __mapper_args__ = {"eager_defaults": True}
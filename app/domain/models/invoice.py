@@ -1,6 +1,6 @@
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import BigInteger, String, Numeric, Date, DateTime, ForeignKey, Index, CheckConstraint
+from sqlalchemy import BigInteger, String, Numeric, Date, DateTime, ForeignKey, Index, CheckConstraint, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import List, TYPE_CHECKING
 
@@ -12,6 +12,8 @@ if TYPE_CHECKING:
     from app.domain.models.student import Student
     from app.domain.models.payment import Payment
 
+OPEN_INVOICE_STATUSES = (InvoiceStatus.ISSUED.value, InvoiceStatus.PARTIAL.value)
+
 
 class Invoice(Base):
     __tablename__ = "invoices"
@@ -30,10 +32,33 @@ class Invoice(Base):
     student: Mapped["Student"] = relationship("Student", back_populates="invoices")
     payments: Mapped[List["Payment"]] = relationship("Payment", back_populates="invoice")
 
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         CheckConstraint("amount_total > 0", name="check_invoice_amount_positive"),
-        Index("ix_invoices_student_id", "student_id"),
-        Index("ix_invoices_status", "status"),
+        Index("ix_invoices_student_status_created", "student_id", "status", "created_at"),
         Index("ix_invoices_due_date", "due_date"),
+        Index(
+            "ix_invoices_not_void_student_created",
+            "student_id",
+            "created_at",
+            postgresql_where=text("status <> 'VOID'"),
+        ),
+        Index(
+            "ix_invoices_open_student_due",
+            "student_id",
+            "due_date",
+            "id",
+            postgresql_where=text("status IN ('ISSUED', 'PARTIAL')"),
+        ),
+        Index(
+            "ix_invoices_open_due_date",
+            "due_date",
+            "id",
+            postgresql_where=text("status IN ('ISSUED', 'PARTIAL')"),
+        ),
+        Index("ix_invoices_issued_at", "issued_at"),
+        Index("ix_invoices_created_at", "created_at"),
+        Index("ix_invoices_currency_created", "currency", "created_at"),
     )
 
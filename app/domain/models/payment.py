@@ -24,6 +24,8 @@ class Payment(Base):
 
     invoice: Mapped["Invoice"] = relationship("Invoice", back_populates="payments")
 
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         CheckConstraint("amount > 0", name="check_payment_amount_positive"),
         Index("ix_payments_invoice_id", "invoice_id"),
@@ -23,6 +23,8 @@ class School(Base):
 
     students: Mapped[List["Student"]] = relationship("Student", back_populates="school")
 
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         UniqueConstraint("name", "country", name="uq_school_name_country"),
     )
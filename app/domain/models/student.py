@@ -25,6 +25,8 @@ class Student(Base):
     school: Mapped["School"] = relationship("School", back_populates="students")
     invoices: Mapped[List["Invoice"]] = relationship("Invoice", back_populates="student")
 
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         Index("ix_students_school_id", "school_id"),
     )
@@ -2,5 +2,5 @@ from datetime import datetime, timezone
 
 
 def utc_now() -> datetime:
-    return datetime.now(timezone.utc)
-
+    # Timestamp columns are TIMESTAMP WITHOUT TIME ZONE holding UTC; asyncpg rejects aware values for them
+    return datetime.now(timezone.utc).replace(tzinfo=None)
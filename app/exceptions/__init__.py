@@ -8,13 +8,16 @@ from .http import (
     InvalidOperation,
     ValidationError,
     DatabaseError,
+    DatabaseTimeout,
+    ServiceUnavailable,
 )
 
 
 async def app_exception_handler(request: Request, exc: AppException):
     return JSONResponse(
         status_code=exc.status_code,
-        content={"detail": exc.detail}
+        content={"detail": exc.detail},
+        headers=exc.headers
     )
 
 
@@ -25,6 +28,8 @@ __all__ = [
     "InvalidOperation",
     "ValidationError",
     "DatabaseError",
+    "DatabaseTimeout",
+    "ServiceUnavailable",
     "app_exception_handler",
 ]
 
@@ -4,6 +4,7 @@ from fastapi import status
 class AppException(Exception):
     status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR
     detail: str = "Internal server error"
+    headers: dict | None = None
     
     def __init__(self, detail: str | None = None):
         if detail:
@@ -32,6 +32,21 @@ class ValidationError(AppException):
         super().__init__(message)
 
 
+class ServiceUnavailable(AppException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    
+    def __init__(self, message: str, retry_after: int):
+        self.headers = {"Retry-After": str(retry_after)}
+        super().__init__(message)
+
+
+class DatabaseTimeout(AppException):
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    
+    def __init__(self):
+        super().__init__("Database query timed out")
+
+
 class DatabaseError(AppException):
     status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
     
@@ -0,0 +1,71 @@
+from typing import AsyncGenerator
+from fastapi import Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.infrastructure.database import wants_read_after
+from app.infrastructure.drivers import driver_options, pool_options
+from app.infrastructure.instrumentation import instrument_engine
+from app.infrastructure.logging import get_logger
+from app.infrastructure.metrics import watch_pool
+from app.infrastructure.pool import build_gate
+from app.infrastructure.replicas import PRIMARY_LSN_SQL
+from app.infrastructure.slow_queries import watch_slow_queries
+from app.infrastructure.routes import route_class
+from app.infrastructure.timeouts import set_timeouts_on_begin, timeout_error, timeout_policy
+
+logger = get_logger(__name__)
+
+
+def async_database_url(url: str) -> str:
+    """
+    Point a postgresql:// (or postgresql+driver://) URL at the asyncpg driver.
+    psycopg 3 URLs are kept: the same driver has an asyncio mode.
+    """
+    if make_url(url).get_driver_name() == "psycopg":
+        return url
+    _, _, rest = url.partition("://")
+    return f"postgresql+asyncpg://{rest}"
+
+
+ASYNC_URL = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+
+async_engine = create_async_engine(
+    ASYNC_URL,
+    **pool_options(),
+    **driver_options(ASYNC_URL),
+)
+instrument_engine(async_engine.sync_engine)
+watch_slow_queries(async_engine.sync_engine)
+watch_pool(async_engine.sync_engine, "async")
+
+connection_gate = build_gate("async")
+
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
+    bind=async_engine,
+)
+
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    route = route_class(request.method, request.url.path)
+    timeouts = timeout_policy.for_request(request.method, request.url.path)
+    async with connection_gate.slot(), AsyncSessionLocal() as db:
+        if timeouts is not None:
+            set_timeouts_on_begin(db.sync_session, timeouts)
+        try:
+            yield db
+        except Exception as e:
+            timeout = timeout_error(e, route)
+            if timeout is not None:
+                raise timeout from e
+            raise
+        if wants_read_after(request):
+            # Services have committed; see database.remember_primary_lsn
+            try:
+                request.state.primary_lsn = (await db.execute(PRIMARY_LSN_SQL)).scalar_one()
+            except SQLAlchemyError as e:
+                logger.warning("primary_lsn_failed", path=request.url.path, error_type=type(e).__name__, error=str(e))
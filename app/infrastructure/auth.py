@@ -1,30 +1,191 @@
-from fastapi import HTTPException, Security, status
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Tuple
+
+from fastapi import Depends, HTTPException, Security, status
 from fastapi.security import APIKeyHeader
+from sqlalchemy.orm import Session
+
 from app.config import settings
+from app.domain.enums import ApiKeyScope
+from app.infrastructure.cache import TTLCache
+from app.infrastructure.database import SessionLocal
+from app.infrastructure.metrics import watch_cache
+from app.repositories.api_key_repository import ApiKeyRepository
 
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Keys look like "mtl_<8 hex prefix>_<secret>"; the prefix finds the row
+KEY_PREFIX = "mtl"
+ALL_SCOPES = frozenset(scope.value for scope in ApiKeyScope)
+
+# Well-formed keys that matched no row are remembered this long, at most this
+# many, so retrying a bad key does not cost a query every time
+UNKNOWN_KEY_TTL_SECONDS = 5
+MAX_UNKNOWN_KEYS = 10_000
+
+
+@dataclass(frozen=True)
+class ApiKeyPrincipal:
+    """Who a request authenticated as. A school_id restricts writes to that school."""
+
+    name: str
+    scopes: FrozenSet[str]
+    school_id: int | None = None
+
+    def has_scope(self, scope: ApiKeyScope) -> bool:
+        return scope.value in self.scopes
+
+
+# settings.API_KEY: the single shared key from before api_keys existed, kept as a
+# bootstrap key with every scope. An empty API_KEY disables it.
+BOOTSTRAP_PRINCIPAL = ApiKeyPrincipal(name="bootstrap", scopes=ALL_SCOPES)
+
+
+def hash_api_key(api_key: str) -> str:
+    # Keys carry 256 random bits, so a fast unsalted hash is enough; a slow
+    # password hash would only add latency to every cache miss
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def generate_api_key() -> Tuple[str, str, str]:
+    """A new (key, prefix, key_hash). Only the prefix and hash are stored."""
+    prefix = secrets.token_hex(4)
+    api_key = f"{KEY_PREFIX}_{prefix}_{secrets.token_urlsafe(32)}"
+    return api_key, prefix, hash_api_key(api_key)
+
+
+def key_prefix(api_key: str) -> str | None:
+    parts = api_key.split("_", 2)
+    if len(parts) != 3 or parts[0] != KEY_PREFIX or len(parts[1]) != 8 or not parts[2]:
+        return None
+    return parts[1]
+
+
+class _UnknownKey(Exception):
+    """Raised by the cache loader so unknown keys are never cached."""
+
+
+class ApiKeyStore:
+    """
+    Resolves presented keys against the api_keys table.
+
+    Rows are looked up by the key's prefix and the hashes compared in
+    constant time. Known keys are cached by hash for the cache's TTL, so a
+    revoked key stops working within API_KEY_CACHE_TTL_SECONDS. Unknown keys
+    never enter that cache; their hashes are kept apart for
+    UNKNOWN_KEY_TTL_SECONDS in a map bounded to MAX_UNKNOWN_KEYS (oldest
+    dropped first).
+    """
 
-def verify_api_key(api_key: str = Security(api_key_header)) -> str:
+    def __init__(self, session_factory: Callable[[], Session], cache: TTLCache):
+        self.session_factory = session_factory
+        self.cache = cache
+        # key hash -> when to look it up again
+        self._unknown: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def authenticate(self, api_key: str) -> ApiKeyPrincipal | None:
+        prefix = key_prefix(api_key)
+        if prefix is None:
+            return None
+        key_hash = hash_api_key(api_key)
+        if self._recently_unknown(key_hash):
+            return None
+        try:
+            return self.cache.get_or_load(key_hash, ("api_keys",), lambda: self._load(prefix, key_hash))
+        except _UnknownKey:
+            self._remember_unknown(key_hash)
+            return None
+
+    def _recently_unknown(self, key_hash: str) -> bool:
+        with self._lock:
+            expires_at = self._unknown.get(key_hash)
+            if expires_at is None:
+                return False
+            if expires_at > time.monotonic():
+                return True
+            del self._unknown[key_hash]
+            return False
+
+    def _remember_unknown(self, key_hash: str) -> None:
+        with self._lock:
+            self._unknown.pop(key_hash, None)
+            self._unknown[key_hash] = time.monotonic() + UNKNOWN_KEY_TTL_SECONDS
+            while len(self._unknown) > MAX_UNKNOWN_KEYS:
+                self._unknown.popitem(last=False)
+
+    def is_verified(self, api_key: str) -> bool:
+        """Whether api_key authenticated recently (is cached), checked without touching the database."""
+        return self.cache.contains(hash_api_key(api_key))
+
+    def invalidate(self) -> None:
+        self.cache.invalidate("api_keys")
+        with self._lock:
+            self._unknown.clear()
+
+    def _load(self, prefix: str, key_hash: str) -> ApiKeyPrincipal:
+        with self.session_factory() as session:
+            api_key = ApiKeyRepository(session).get_active_by_prefix(prefix)
+            if api_key is None or not hmac.compare_digest(api_key.key_hash, key_hash):
+                raise _UnknownKey()
+            return ApiKeyPrincipal(
+                name=api_key.name,
+                scopes=frozenset(api_key.scopes),
+                school_id=api_key.school_id,
+            )
+
+
+api_key_store = ApiKeyStore(SessionLocal, TTLCache(ttl_seconds=settings.API_KEY_CACHE_TTL_SECONDS))
+watch_cache(api_key_store.cache, "api_keys")
+
+
+def _is_bootstrap_key(api_key: str) -> bool:
+    return bool(settings.API_KEY) and hmac.compare_digest(api_key.encode(), settings.API_KEY.encode())
+
+
+def is_verified_key(api_key: str) -> bool:
+    return _is_bootstrap_key(api_key) or api_key_store.is_verified(api_key)
+
+
+def authenticate(api_key: str = Security(api_key_header)) -> ApiKeyPrincipal:
     if api_key is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing API Key"
         )
-    print(f"API Key: {api_key}")
-    print(f"Settings API Key: {settings.API_KEY}")
-    print(f"API Key length: {len(api_key)}")
-    print(f"Settings API Key length: {len(settings.API_KEY)}")
-    print(f"API Key equals Settings API Key: {api_key == settings.API_KEY}")
-    print(f"API Key type: {type(api_key)}")
-    print(f"Settings API Key type: {type(settings.API_KEY)}")
-    print(f"API Key is equal to Settings API Key: {api_key == settings.API_KEY}")
-    print(f"API Key is not equal to Settings API Key: {api_key != settings.API_KEY}")
-    if api_key != settings.API_KEY:
+    if _is_bootstrap_key(api_key):
+        return BOOTSTRAP_PRINCIPAL
+    principal = api_key_store.authenticate(api_key)
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid API Key"
         )
-    
-    return api_key
+    return principal
+
 
+def require_scope(scope: ApiKeyScope) -> Callable[..., ApiKeyPrincipal]:
+    """Dependency that authenticates the request and requires scope on its key."""
+    def dependency(principal: ApiKeyPrincipal = Depends(authenticate)) -> ApiKeyPrincipal:
+        if not principal.has_scope(scope):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"API key lacks the {scope.value} scope"
+            )
+        return principal
+    return dependency
+
+
+def authorize_school(principal: ApiKeyPrincipal, school_id: int | None) -> None:
+    """Reject a school-bound key acting on another school (or on no single school)."""
+    if principal.school_id is not None and principal.school_id != school_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="API key is not allowed for this school"
+        )
@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Tuple
+
+from app.config import settings
+from app.infrastructure.metrics import watch_cache
+
+
+class TTLCache:
+    """
+    In-process cache whose entries expire after ttl_seconds.
+
+    Entries carry tags (table names) so writes can drop every entry that
+    depends on a table. A ttl of 0 disables caching.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[float, FrozenSet[str], Any]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get_or_load(self, key: Hashable, tags: Iterable[str], loader: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return loader()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+
+        with self._lock:
+            # Skip the store if an invalidation ran while the value was loading
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, frozenset(tags), value)
+        return value
+
+    def contains(self, key: Hashable) -> bool:
+        """Whether key has a live entry; never loads and is not counted as a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def invalidate(self, tag: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries = {
+                key: entry for key, entry in self._entries.items() if tag not in entry[1]
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+count_cache = TTLCache(ttl_seconds=settings.COUNT_CACHE_TTL_SECONDS)
+watch_cache(count_cache, "counts")
@@ -0,0 +1,186 @@
+import re
+import zlib
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is a C extension; without it responses fall back to gzip
+    brotli = None
+
+# Preferred first when the client accepts several with the same q-value
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+class CompressionLevels(NamedTuple):
+    gzip: int = 6  # zlib level, 1-9
+    br: int = 4    # brotli quality, 0-11
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """Best supported encoding for an Accept-Encoding header, honouring q-values; None for identity."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Compressor:
+    def __init__(self, encoding: str, levels: CompressionLevels):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=levels.br)
+            self._zlib = None
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(levels.gzip, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        """Compress data; with flush, everything written so far can be decoded by the client."""
+        if self._brotli is not None:
+            return self._brotli.process(data) + (self._brotli.flush() if flush else b"")
+        return self._zlib.compress(data) + (self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else b"")
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    gzip/brotli response compression negotiated from Accept-Encoding.
+
+    JSON and text bodies under minimum_size go out as is. Streaming bodies
+    (more_body) are compressed chunk by chunk, each chunk flushed, so clients
+    still receive them incrementally; chunks are only held back until the
+    first minimum_size bytes have arrived. route_levels overrides the levels
+    for paths matching a regex (first match wins).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        levels: CompressionLevels = CompressionLevels(),
+        route_levels: Sequence[Tuple[str, CompressionLevels]] = (),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = levels
+        self.route_levels: List[Tuple[re.Pattern, CompressionLevels]] = [
+            (re.compile(pattern), route_level) for pattern, route_level in route_levels
+        ]
+
+    def levels_for(self, path: str) -> CompressionLevels:
+        for pattern, levels in self.route_levels:
+            if pattern.search(path):
+                return levels
+        return self.levels
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(send, encoding, self.levels_for(scope["path"]), self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: str, levels: CompressionLevels, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.levels = levels
+        self.minimum_size = minimum_size
+        self.start_message: Message | None = None
+        self.buffer = b""
+        self.compressor: _Compressor | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not content_type.startswith(_COMPRESSIBLE_TYPES)
+            )
+            if self.passthrough:
+                await self._send(message)
+            else:
+                # Held back until the body shows whether it reaches minimum_size
+                self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            # Responses wrapped by function middleware always arrive as streams,
+            # so small chunks are collected before deciding
+            self.buffer += body
+            if more_body and len(self.buffer) < self.minimum_size:
+                return
+            body, self.buffer = self.buffer, b""
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                headers["Content-Length"] = str(len(body))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+
+            self.compressor = _Compressor(self.encoding, self.levels)
+            headers["Content-Encoding"] = self.encoding
+            if not more_body:
+                body = self.compressor.compress(body, flush=False) + self.compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            del headers["Content-Length"]
+            await self._send(start)
+
+        if more_body:
+            await self._send({
+                "type": "http.response.body",
+                "body": self.compressor.compress(body, flush=True),
+                "more_body": True,
+            })
+        else:
+            await self._send({
+                "type": "http.response.body",
+                "body": self.compressor.compress(body, flush=False) + self.compressor.finish(),
+            })
@@ -1,28 +1,120 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 
 from app.config import settings
+from app.infrastructure.replicas import PRIMARY_LSN_SQL, build_replica_router, read_after_lsn
+from app.infrastructure.drivers import driver_options, pool_options
+from app.infrastructure.instrumentation import instrument_engine
+from app.infrastructure.metrics import watch_pool
+from app.infrastructure.pool import build_gate
+from app.infrastructure.slow_queries import watch_slow_queries
+from app.infrastructure.routes import READ_METHODS, route_class
+from app.infrastructure.timeouts import timeout_error, timeout_policy
+from app.infrastructure.unit_of_work import UnitOfWork
+from app.infrastructure.logging import get_logger
+from app.exceptions import DatabaseError
+
+logger = get_logger(__name__)
 
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    **pool_options(),
+    **driver_options(settings.DATABASE_URL),
 )
+instrument_engine(engine)
+watch_slow_queries(engine)
+watch_pool(engine, "primary")
 
+# IDs and defaults come back from the flush (RETURNING / eager_defaults), so
+# entities stay readable after commit without a SELECT per object
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,
     bind=engine,
 )
 
+replica_router = build_replica_router()
+
+# Replicas get the same pool settings, so one gate sized to a pool covers
+# whichever engine bind_for picks. DB_POOL_RESERVE primary connections stay
+# outside it for API key lookups on a cache miss, which run before the
+# request's slot is taken; every other check-out goes through the gate or
+# uses an unpooled engine (readiness, replica probes, EXPLAIN).
+connection_gate = build_gate("primary", reserve=settings.DB_POOL_RESERVE)
+
 Base = declarative_base()
 
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+def bind_for(request: Request) -> Engine:
+    """Replica for reads when DATABASE_REPLICA_URLS is set, primary for writes and read-your-writes."""
+    if replica_router is None or request.method not in READ_METHODS:
+        return engine
+    return replica_router.choose(min_lsn=read_after_lsn(request)) or engine
+
+
+def wants_read_after(request: Request) -> bool:
+    return replica_router is not None and request.method not in READ_METHODS
+
+
+def remember_primary_lsn(request: Request, connection: Connection) -> None:
+    """
+    After a committed write, keep the primary's LSN in request.state for the
+    read-your-writes token, read on the request's own connection (no extra
+    checkout). A failure only costs the client's stickiness, so it is logged.
+    """
     try:
-        yield db
+        request.state.primary_lsn = connection.execute(PRIMARY_LSN_SQL).scalar_one()
+    except SQLAlchemyError as e:
+        logger.warning("primary_lsn_failed", path=request.url.path, error_type=type(e).__name__, error=str(e))
+
+
+async def connection_slot() -> AsyncGenerator[None, None]:
+    """Wait on the event loop for a connection slot before any thread checks out a connection."""
+    async with connection_gate.slot():
+        yield
+
+
+def get_uow(request: Request, _slot: None = Depends(connection_slot)) -> Generator[UnitOfWork, None, None]:
+    """
+    The request's unit of work, committed once after the endpoint returns
+    (before the response is sent) and rolled back if it raises. Statement
+    and lock timeouts follow the route class; hitting one is a 504 or 503.
+    """
+    route = route_class(request.method, request.url.path)
+    uow = UnitOfWork(bind_for(request), SessionLocal, timeouts=timeout_policy.for_request(request.method, request.url.path))
+    try:
+        yield uow
+    except Exception as e:
+        uow.rollback()
+        timeout = timeout_error(e, route)
+        if timeout is not None:
+            raise timeout from e
+        raise
+    else:
+        try:
+            uow.commit()
+        except SQLAlchemyError as e:
+            uow.rollback()
+            timeout = timeout_error(e, route)
+            if timeout is not None:
+                raise timeout from e
+            logger.error(
+                "request_commit_failed",
+                path=request.url.path,
+                error_type=type(e).__name__,
+                error=str(e)
+            )
+            raise DatabaseError("commit transaction")
+        if wants_read_after(request):
+            remember_primary_lsn(request, uow.connection)
     finally:
-        db.close()
\ No newline at end of file
+        uow.close()
+
+
+def get_db(uow: UnitOfWork = Depends(get_uow)) -> Session:
+    return uow.session
\ No newline at end of file
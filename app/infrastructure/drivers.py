@@ -0,0 +1,83 @@
+import math
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+
+
+def driver_options(url: str) -> Dict[str, Any]:
+    """create_engine() options for the driver named in a postgresql[+driver]:// URL."""
+    driver = make_url(url).get_driver_name()
+    if driver == "psycopg":
+        # psycopg 3 prepares a statement server-side once it has run this many
+        # times on a connection, so hot queries skip parsing and planning
+        return {"connect_args": {"prepare_threshold": settings.DB_PREPARE_THRESHOLD}}
+    if driver == "psycopg2":
+        # Page executemany UPDATE/DELETE with execute_batch instead of one round trip per row
+        return {"executemany_mode": "values_plus_batch"}
+    # asyncpg keeps its own per-connection prepared statement cache
+    return {}
+
+
+def pool_options() -> Dict[str, Any]:
+    """create_engine() pool options from settings, the same for the primary, replicas and the async engine."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def probe_engine(url: str | URL, timeout_seconds: float) -> Engine:
+    """
+    Unpooled engine for health probes and diagnostics. It opens its own connections, so it
+    works (and measures the database, not the queue) while the request pool
+    is full, and connecting and each query give up after timeout_seconds.
+    """
+    return create_engine(
+        url,
+        poolclass=NullPool,
+        connect_args={
+            "connect_timeout": max(1, math.ceil(timeout_seconds)),
+            "options": f"-c statement_timeout={int(timeout_seconds * 1000)}",
+        },
+    )
+
+
+# Execution option for statements whose result nobody reads: inside pipeline()
+# they stay queued and go out with the next statement
+PIPELINE_DEFERRED = "pipeline_deferred"
+
+
+@contextmanager
+def pipeline(session: Session) -> Iterator[None]:
+    """
+    psycopg 3 pipeline mode for the block: statements executed with
+    execution_options(pipeline_deferred=True) are only queued, and the next
+    statement sends them together with itself in a single round trip.
+    SQLAlchemy reads every other statement's result (rows, row counts) right
+    away, so those still wait for the server. Other drivers run the block as
+    usual.
+    """
+    connection = session.connection()
+    if connection.dialect.driver != "psycopg" or connection.dialect.is_async:
+        yield
+        return
+
+    with connection.connection.driver_connection.pipeline() as queue:
+        def sync_unless_deferred(conn, cursor, statement, parameters, context, executemany):
+            if not context.execution_options.get(PIPELINE_DEFERRED, False):
+                queue.sync()
+
+        event.listen(connection, "after_cursor_execute", sync_unless_deferred)
+        try:
+            yield
+        finally:
+            event.remove(connection, "after_cursor_execute", sync_unless_deferred)
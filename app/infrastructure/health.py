@@ -0,0 +1,165 @@
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
+
+from app.config import settings
+from app.infrastructure.database import connection_gate, replica_router
+from app.infrastructure.drivers import probe_engine
+from app.infrastructure.logging import get_logger
+from app.infrastructure.pool import ConnectionGate
+from app.infrastructure.replicas import ReplicaRouter
+
+logger = get_logger(__name__)
+
+ALEMBIC_DIR = Path(__file__).resolve().parent.parent.parent / "alembic"
+
+
+def alembic_heads(directory: Path = ALEMBIC_DIR) -> FrozenSet[str] | None:
+    """Head revisions of the migrations shipped with the code; None when they are not shipped."""
+    if not directory.is_dir():
+        return None
+    from alembic.script import ScriptDirectory
+    return frozenset(ScriptDirectory(str(directory)).get_heads())
+
+
+@dataclass
+class Readiness:
+    ready: bool
+    checks: Dict[str, Any] = field(default_factory=dict)
+
+
+class ReadinessCheck:
+    """
+    Whether this instance should get traffic: the database answers within
+    timeout_seconds, it is migrated to the code's Alembic head, and the
+    connection gate is not rejecting requests. Results are cached for
+    cache_seconds, so load balancer probes cost at most one ping per
+    interval. Once draining, the instance reports not ready for good.
+
+    The ping uses its own unpooled connection (see probe_engine).
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        gate: ConnectionGate,
+        expected_heads: FrozenSet[str] | None,
+        timeout_seconds: float = 2.0,
+        cache_seconds: float = 1.0,
+        replicas: ReplicaRouter | None = None,
+    ):
+        self.gate = gate
+        self.expected_heads = expected_heads
+        self.cache_seconds = cache_seconds
+        self.replicas = replicas
+        self.draining = False
+        self._engine = probe_engine(database_url, timeout_seconds)
+        self._cached: Tuple[float, Readiness] | None = None
+        self._lock = threading.Lock()
+
+    def check(self) -> Readiness:
+        if self.draining:
+            return Readiness(ready=False, checks={"shutdown": "draining"})
+        # One probe at a time; concurrent callers wait for it and share the result
+        with self._lock:
+            if self._cached is not None and self._cached[0] > time.monotonic():
+                return self._cached[1]
+            readiness = self._run()
+            self._cached = (time.monotonic() + self.cache_seconds, readiness)
+        if not readiness.ready:
+            logger.warning("instance_not_ready", **readiness.checks)
+        return readiness
+
+    def _run(self) -> Readiness:
+        checks: Dict[str, Any] = {}
+        ready = self._check_database(checks)
+
+        expected_wait = self.gate.expected_wait()
+        saturated = expected_wait > self.gate.wait_budget
+        checks["pool"] = {
+            "status": "saturated" if saturated else "ok",
+            "in_use": self.gate.in_use,
+            "capacity": self.gate.capacity,
+            "waiting": self.gate.waiting,
+        }
+        ready = ready and not saturated
+
+        # Informational: reads fall back to the primary when replicas are down
+        if self.replicas is not None:
+            checks["replicas"] = {
+                replica.name: "ok" if replica.healthy else "unhealthy" for replica in self.replicas.replicas
+            }
+        return Readiness(ready=ready, checks=checks)
+
+    def _check_database(self, checks: Dict[str, Any]) -> bool:
+        started = time.perf_counter()
+        try:
+            with self._engine.connect() as conn:
+                try:
+                    revisions = frozenset(conn.execute(text("SELECT version_num FROM alembic_version")).scalars())
+                except ProgrammingError:
+                    revisions = frozenset()
+        except SQLAlchemyError as e:
+            checks["database"] = {"status": "unreachable", "error": type(e).__name__}
+            return False
+        checks["database"] = {"status": "ok", "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+        if self.expected_heads is None:
+            checks["migrations"] = {"status": "unknown"}
+            return True
+        migrated = revisions == self.expected_heads
+        checks["migrations"] = {
+            "status": "ok" if migrated else "mismatch",
+            "database": sorted(revisions),
+            "expected": sorted(self.expected_heads),
+        }
+        return migrated
+
+
+def drain_on_sigterm(check: ReadinessCheck, drain_seconds: float) -> None:
+    """
+    On SIGTERM, report not ready for drain_seconds before the server's own
+    handler starts shutting down, so load balancers stop routing here while
+    in-flight and already-routed requests still complete. A second signal
+    shuts down at once. Only the main thread can install signal handlers, so
+    this does nothing elsewhere (tests, embedded servers).
+
+    The handler itself only flips a flag and starts a thread: it runs
+    between two bytecodes of whatever the main thread was doing, possibly
+    inside the log queue's lock, so logging happens on the drain thread.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+    if not callable(previous):
+        return
+
+    def drain(signum, frame):
+        logger.info("shutdown_draining", drain_seconds=drain_seconds)
+        time.sleep(drain_seconds)
+        previous(signum, frame)
+
+    def handle_sigterm(signum, frame):
+        if check.draining:
+            previous(signum, frame)
+            return
+        check.draining = True
+        threading.Thread(target=drain, args=(signum, frame), name="shutdown-drain", daemon=True).start()
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+
+readiness_check = ReadinessCheck(
+    settings.DATABASE_URL,
+    connection_gate,
+    alembic_heads(),
+    timeout_seconds=settings.READINESS_DB_TIMEOUT_SECONDS,
+    cache_seconds=settings.READINESS_CACHE_SECONDS,
+    replicas=replica_router,
+)
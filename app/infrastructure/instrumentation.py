@@ -0,0 +1,68 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, MutableMapping
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.infrastructure.tracing import trace_engine
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration_ms: float = 0.0
+
+
+# Holds the stats of the current request. The object is mutated in place, so
+# threadpool workers and run_sync greenlets, which run on copies of the
+# context, still report into it.
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration_ms += (time.perf_counter() - context._query_started_at) * 1000
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count queries and DB time on engine for whoever is tracking the current context, and trace them."""
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    trace_engine(engine)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _query_stats.get()
+
+
+def add_query_stats(logger: Any, method_name: str, event_dict: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+    """structlog processor: stamp log lines emitted during a request with its query count and DB time so far."""
+    stats = _query_stats.get()
+    if stats is not None:
+        event_dict.setdefault("db_queries", stats.count)
+        event_dict.setdefault("db_time_ms", round(stats.duration_ms, 2))
+    return event_dict
+
+
+def server_timing(stats: QueryStats, total_ms: float) -> str:
+    return f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries", total;dur={total_ms:.1f}'
@@ -1,32 +1,145 @@
+import atexit
 import logging
+import queue
+import random
 import sys
-from typing import Any
+import threading
+from typing import Any, Dict, List, MutableMapping, TextIO
 import structlog
 
+from app.infrastructure.instrumentation import add_query_stats
+from app.infrastructure.metrics import LOG_EVENTS_DROPPED, LOG_EVENTS_SAMPLED_OUT
 
-def setup_logging(log_level: str = "INFO") -> None:
+_SAMPLED_LEVELS = frozenset({"debug", "info"})
+
+
+class QueueLogWriter:
+    """
+    Writes log lines from a background thread.
+
+    Request threads only put the rendered line on a bounded queue; when it
+    is full (the stream cannot keep up) the line is dropped and counted
+    rather than making the request wait.
+    """
+
+    def __init__(self, stream: TextIO, max_size: int = 10_000, batch_size: int = 256):
+        self.stream = stream
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, line: str) -> None:
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            LOG_EVENTS_DROPPED.inc("buffer_full")
+
+    def flush(self) -> None:
+        """Block until every line queued so far is written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            lines: List[str | None] = [self._queue.get()]
+            while len(lines) < self.batch_size:
+                try:
+                    lines.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            closing = None in lines
+            text = "".join(line + "\n" for line in lines if line is not None)
+            try:
+                self.stream.write(text)
+                self.stream.flush()
+            except (OSError, ValueError):
+                LOG_EVENTS_DROPPED.inc("write_failed")
+            for _ in lines:
+                self._queue.task_done()
+            if closing:
+                return
+
+
+class QueueLogger:
+    """structlog logger that hands rendered events to a QueueLogWriter."""
+
+    def __init__(self, writer: QueueLogWriter):
+        self._writer = writer
+
+    def msg(self, message: str) -> None:
+        self._writer.write(message)
+
+    log = debug = info = warn = warning = error = critical = exception = fatal = msg
+
+
+class QueueLoggerFactory:
+    def __init__(self, writer: QueueLogWriter):
+        self.writer = writer
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        return QueueLogger(self.writer)
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """"payment_validation:0.01,school_statement_generated:0.1" -> {event: share kept}."""
+    rates = {}
+    for part in value.split(","):
+        if part.strip():
+            event, _, rate = part.partition(":")
+            rates[event.strip()] = float(rate)
+    return rates
+
+
+class EventSampler:
+    """structlog processor keeping only a share of high-volume debug/info events; warnings and errors always pass."""
+
+    def __init__(self, rates: Dict[str, float]):
+        self.rates = rates
+
+    def __call__(self, logger: Any, method_name: str, event_dict: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+        rate = self.rates.get(event_dict.get("event"))
+        if rate is not None and method_name in _SAMPLED_LEVELS and random.random() >= rate:
+            LOG_EVENTS_SAMPLED_OUT.inc(event_dict["event"])
+            raise structlog.DropEvent
+        return event_dict
+
+
+_writer: QueueLogWriter | None = None
+
+
+def setup_logging(log_level: str = "INFO", sample_rates: Dict[str, float] | None = None, queue_size: int = 10_000) -> None:
+    global _writer
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
         level=log_level,
     )
 
+    if _writer is None:
+        _writer = QueueLogWriter(sys.stdout, max_size=queue_size)
+        atexit.register(_writer.close)
+
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
+            EventSampler(sample_rates or {}),
+            add_query_stats,
             structlog.processors.add_log_level,
             structlog.processors.StackInfoRenderer(),
             structlog.dev.set_exc_info,
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.JSONRenderer()
         ],
-        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+        wrapper_class=structlog.make_filtering_bound_logger(logging.getLevelName(log_level.upper())),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
-        cache_logger_on_first_use=False,
+        logger_factory=QueueLoggerFactory(_writer),
+        cache_logger_on_first_use=True,
     )
 
 
 def get_logger(name: str) -> Any:
     return structlog.get_logger(name)
-
@@ -0,0 +1,255 @@
+import bisect
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; covers fast lookups up to slow statements
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _add_values(total: Dict[LabelValues, list], shard: Dict[LabelValues, list]) -> None:
+    for labels, values in list(shard.items()):
+        existing = total.get(labels)
+        if existing is None:
+            total[labels] = list(values)
+        else:
+            for index, value in enumerate(values):
+                existing[index] += value
+
+
+class _Metric:
+    """
+    Base for metrics written from many threads.
+
+    Each thread records into its own shard, so writers never wait on each
+    other; a lock is only taken the first time a thread touches the metric
+    and when a scrape collects the shards. Worker threads come and go (anyio
+    retires idle ones), so the shards of finished threads are folded into a
+    retired total and dropped whenever a new shard is added or a scrape runs.
+    """
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict[LabelValues, list]]] = []
+        self._retired: Dict[LabelValues, list] = {}
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict[LabelValues, list]:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._retire_finished_threads()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_finished_threads(self) -> None:
+        # Caller holds the lock; a finished thread no longer writes to its shard
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                _add_values(self._retired, shard)
+        self._shards = live
+
+    def _merged(self) -> Dict[LabelValues, list]:
+        with self._lock:
+            self._retire_finished_threads()
+            merged = {labels: list(values) for labels, values in self._retired.items()}
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            _add_values(merged, shard)
+        return merged
+
+    def collect(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        shard = self._shard()
+        values = shard.get(labels)
+        if values is None:
+            shard[labels] = [amount]
+        else:
+            values[0] += amount
+
+    def value(self, *labels: str) -> float:
+        return self._merged().get(labels, [0.0])[0]
+
+    def collect(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(values[0])}"
+            for labels, values in sorted(self._merged().items())
+        ]
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        values = shard.get(labels)
+        if values is None:
+            # Per-bucket (not cumulative) counts, then +Inf, sum and count
+            values = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def count(self, *labels: str) -> int:
+        return self._merged().get(labels, [0])[-1]
+
+    def collect(self) -> List[str]:
+        lines = []
+        bucket_names = self.labelnames + ("le",)
+        for labels, values in sorted(self._merged().items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), values):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(bucket_names, labels + (_format_value(bound),))} {cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{label_text} {values[-1]}")
+        return lines
+
+
+class CallbackMetric:
+    """A gauge or counter whose samples are read from the source at scrape time."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], type: str = "gauge"):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.type = type
+        self._sources: List[Tuple[LabelValues, Callable[[], float]]] = []
+        self._lock = threading.Lock()
+
+    def add_source(self, read: Callable[[], float], *labels: str) -> None:
+        with self._lock:
+            self._sources = [source for source in self._sources if source[0] != labels] + [(labels, read)]
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            sources = list(self._sources)
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(read())}"
+            for labels, read in sources
+        ]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric | CallbackMetric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def exposition(self) -> str:
+        """All metrics in the Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            metrics: Iterable = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route", "status"),
+))
+DB_POOL_CHECKED_OUT = registry.register(CallbackMetric(
+    "db_pool_checked_out_connections", "Connections currently checked out of the pool", ("pool",),
+))
+DB_POOL_OVERFLOW = registry.register(CallbackMetric(
+    "db_pool_overflow_connections", "Connections open beyond pool_size", ("pool",),
+))
+DB_POOL_WAIT = registry.register(Histogram(
+    "db_pool_wait_seconds", "Time requests waited for a database connection slot", ("pool",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+))
+DB_POOL_WAITING = registry.register(CallbackMetric(
+    "db_pool_waiting_requests", "Requests currently queued for a connection slot", ("pool",),
+))
+DB_POOL_REJECTED = registry.register(Counter(
+    "db_pool_rejected_total", "Requests answered 503 because the connection wait exceeded its budget", ("pool",),
+))
+DB_TIMEOUTS = registry.register(Counter(
+    "db_timeouts_total", "Requests ended by statement_timeout or lock_timeout", ("timeout", "route_class"),
+))
+LOG_EVENTS_DROPPED = registry.register(Counter(
+    "log_events_dropped_total", "Log lines lost because the log queue was full or the write failed", ("reason",),
+))
+LOG_EVENTS_SAMPLED_OUT = registry.register(Counter(
+    "log_events_sampled_out_total", "High-volume log events skipped by sampling", ("event",),
+))
+STATEMENT_DURATION = registry.register(Histogram(
+    "statement_generation_seconds", "Time to build an account statement", ("kind",),
+))
+STATEMENT_INVOICES = registry.register(Histogram(
+    "statement_invoice_count", "Invoices included in an account statement", ("kind",),
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000),
+))
+PAYMENTS_PROCESSED = registry.register(Counter(
+    "payments_processed_total", "Payments recorded", ("method",),
+))
+PAYMENT_FAILURES = registry.register(Counter(
+    "payment_failures_total", "Payments rejected or failed", ("reason",),
+))
+CACHE_REQUESTS = registry.register(CallbackMetric(
+    "cache_requests_total", "In-process cache lookups", ("cache", "result"), type="counter",
+))
+
+
+def watch_pool(engine, pool_name: str) -> None:
+    """Export the checked-out and overflow connection counts of engine's pool."""
+    pool = engine.pool
+    DB_POOL_CHECKED_OUT.add_source(pool.checkedout, pool_name)
+    DB_POOL_OVERFLOW.add_source(lambda: max(pool.overflow(), 0), pool_name)
+
+
+def watch_cache(cache, cache_name: str) -> None:
+    """Export a TTLCache's hits and misses; the hit ratio is hit / (hit + miss)."""
+    CACHE_REQUESTS.add_source(lambda: cache.hits, cache_name, "hit")
+    CACHE_REQUESTS.add_source(lambda: cache.misses, cache_name, "miss")
@@ -0,0 +1,129 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque
+
+from app.config import settings
+from app.exceptions import ServiceUnavailable
+from app.infrastructure.logging import get_logger
+from app.infrastructure.metrics import DB_POOL_REJECTED, DB_POOL_WAIT, DB_POOL_WAITING
+
+logger = get_logger(__name__)
+
+# Threads beyond the connection slots, for sync work outside the gate:
+# API key lookups, health checks, middleware
+THREADPOOL_HEADROOM = 10
+
+
+def pool_capacity() -> int:
+    return settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+
+def threadpool_size() -> int:
+    size = settings.THREADPOOL_SIZE or pool_capacity() + THREADPOOL_HEADROOM
+    if size < pool_capacity():
+        logger.warning("threadpool_smaller_than_pool", threadpool_size=size, pool_capacity=pool_capacity())
+    return size
+
+
+class ConnectionGate:
+    """
+    Admits at most capacity requests at a time to an engine, one connection each.
+
+    Requests queue here, on the event loop, instead of in the pool's
+    checkout, where each waiter would block a threadpool thread; once every
+    thread waited on the pool, requests holding connections could not get a
+    thread back to finish and release them. A request whose expected wait
+    (queue length times the recent slot hold time, over capacity) exceeds
+    wait_budget is rejected at once with a 503, and so is one still queued
+    when the budget runs out.
+    """
+
+    def __init__(self, name: str, capacity: int, wait_budget: float):
+        self.name = name
+        self.capacity = capacity
+        self.wait_budget = wait_budget
+        self.in_use = 0
+        self.hold_seconds = 0.05  # Moving average of how long a request keeps its slot
+        self._waiters: Deque[asyncio.Future] = deque()
+        DB_POOL_WAITING.add_source(lambda: len(self._waiters), name)
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self) -> float:
+        if self.in_use < self.capacity:
+            return 0.0
+        return (len(self._waiters) + 1) * self.hold_seconds / self.capacity
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        started = time.perf_counter()
+        await self._acquire()
+        acquired = time.perf_counter()
+        DB_POOL_WAIT.observe(acquired - started, self.name)
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - acquired)
+
+    async def _acquire(self) -> None:
+        if self.in_use < self.capacity and not self._waiters:
+            self.in_use += 1
+            return
+        expected = self.expected_wait()
+        if expected > self.wait_budget:
+            self._reject(expected)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # asyncio.wait, unlike wait_for, leaves the future alone on timeout
+            await asyncio.wait([waiter], timeout=self.wait_budget)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        if not waiter.done():
+            self._abandon(waiter)
+            self._reject(self.expected_wait())
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # A slot was handed over just as we gave up; pass it on
+            self._release(None)
+        else:
+            waiter.cancel()
+            self._waiters.remove(waiter)
+
+    def _release(self, held_seconds: float | None) -> None:
+        if held_seconds is not None:
+            self.hold_seconds = 0.8 * self.hold_seconds + 0.2 * held_seconds
+        # The slot goes straight to the oldest waiter, so in_use stays the same
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_use -= 1
+
+    def _reject(self, expected_wait: float) -> None:
+        DB_POOL_REJECTED.inc(self.name)
+        logger.warning(
+            "db_pool_exhausted",
+            pool=self.name,
+            in_use=self.in_use,
+            waiting=len(self._waiters),
+            expected_wait_s=round(expected_wait, 3),
+        )
+        raise ServiceUnavailable(
+            "Database connection pool exhausted",
+            retry_after=max(1, math.ceil(expected_wait)),
+        )
+
+
+def build_gate(name: str, reserve: int = 0) -> ConnectionGate:
+    """Gate for an engine's pool, leaving reserve connections to checkouts that do not pass through it."""
+    return ConnectionGate(name, max(1, pool_capacity() - reserve), settings.DB_POOL_WAIT_BUDGET_SECONDS)
@@ -0,0 +1,132 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple
+
+from app.config import settings
+from app.infrastructure.auth import hash_api_key, is_verified_key
+from app.infrastructure.routes import BULK, READS, STATEMENTS, WRITES, route_class
+
+LISTS = "lists"
+
+# Limit group of each route class: bulk endpoints count against the writes limit
+_GROUPS = {READS: LISTS, STATEMENTS: STATEMENTS, WRITES: WRITES, BULK: WRITES}
+
+
+class Limit(NamedTuple):
+    rate: float   # tokens added per second
+    burst: float  # bucket size
+
+
+def parse_limit(value: str) -> Limit | None:
+    """"20:40" -> 20 requests/second with bursts of 40; "" or a zero rate disables the limit."""
+    if not value.strip():
+        return None
+    rate, _, burst = value.partition(":")
+    limit = Limit(rate=float(rate), burst=float(burst or rate))
+    if limit.rate <= 0:
+        return None
+    if limit.burst < 1:
+        raise ValueError(f"Rate limit {value!r} needs a burst of at least 1")
+    return limit
+
+
+def route_group(method: str, path: str) -> str | None:
+    """Which limit applies to a request; None for requests outside the API (health checks, docs)."""
+    return _GROUPS.get(route_class(method, path))
+
+
+class RateLimitBackend:
+    """Token buckets shared by the limiter. Replace with a shared store to limit across processes."""
+
+    def take(self, key: str, limit: Limit) -> float:
+        """Take a token from key's bucket: 0 if allowed, else seconds until a token is available."""
+        raise NotImplementedError
+
+
+class InMemoryBackend(RateLimitBackend):
+    """
+    Buckets in a dict, per process. With N workers a client gets up to N times
+    the configured rate. The dict keeps at most max_keys buckets; past that
+    the least recently used one is evicted, which at worst hands an idle
+    client a fresh bucket.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> [tokens, updated_at], least recently used first
+        self._buckets: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: Limit) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = limit.burst
+            else:
+                tokens = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+                self._buckets.move_to_end(key)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / limit.rate
+            self._buckets[key] = [tokens, now]
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class RateLimiter:
+    """
+    Token-bucket limits per client and route group.
+
+    Writes are limited per X-API-Key (hashed, never kept in the clear) once
+    verify_key vouches for the key without a database lookup; everything
+    else, reads and writes with unknown or made-up keys, is limited per
+    client IP, since a fresh fake key per request would otherwise buy a
+    fresh bucket each time. Without verify_key every limit is per IP.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, Limit | None],
+        backend: RateLimitBackend,
+        verify_key: Callable[[str], bool] | None = None,
+    ):
+        self.limits = limits
+        self.backend = backend
+        self.verify_key = verify_key
+
+    def check(self, method: str, path: str, api_key: str | None, client_ip: str | None) -> float:
+        """0 if the request may proceed, else seconds the client should wait."""
+        group = route_group(method, path)
+        limit = self.limits.get(group) if group is not None else None
+        if limit is None:
+            return 0.0
+        if group == WRITES and api_key and self.verify_key is not None and self.verify_key(api_key):
+            client = f"key:{hash_api_key(api_key)}"
+        else:
+            client = f"ip:{client_ip}"
+        return self.backend.take(f"{group}:{client}", limit)
+
+
+def retry_after_header(wait_seconds: float) -> str:
+    return str(max(1, math.ceil(wait_seconds)))
+
+
+rate_limiter = RateLimiter(
+    limits={
+        STATEMENTS: parse_limit(settings.RATE_LIMIT_STATEMENTS),
+        WRITES: parse_limit(settings.RATE_LIMIT_WRITES),
+        LISTS: parse_limit(settings.RATE_LIMIT_LISTS),
+    },
+    backend=InMemoryBackend(),
+    verify_key=is_verified_key,
+)
@@ -0,0 +1,167 @@
+import itertools
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import settings
+from app.infrastructure.logging import get_logger
+from app.infrastructure.drivers import driver_options, pool_options, probe_engine
+from app.infrastructure.instrumentation import instrument_engine
+from app.infrastructure.metrics import watch_pool
+from app.infrastructure.slow_queries import watch_slow_queries
+
+logger = get_logger(__name__)
+
+READ_AFTER_COOKIE = "read_after"
+READ_AFTER_HEADER = "X-Read-After"
+
+# Replayed LSN on a standby; falls back to the current LSN when the URL points at a primary
+_REPLICA_LSN_SQL = text("SELECT COALESCE(pg_last_wal_replay_lsn(), pg_current_wal_lsn())::text")
+PRIMARY_LSN_SQL = text("SELECT pg_current_wal_lsn()::text")
+
+
+def parse_lsn(lsn: str) -> int:
+    """'16/B374D848' -> 0x16B374D848, so LSNs compare as integers."""
+    high, low = lsn.split("/")
+    return (int(high, 16) << 32) + int(low, 16)
+
+
+class Replica:
+    """
+    A read replica: engine serves requests, probe (by default engine itself)
+    runs health checks, so they need not wait for a pooled connection.
+    """
+
+    def __init__(self, name: str, engine: Engine, probe: Engine | None = None):
+        self.name = name
+        self.engine = engine
+        self.probe = probe or engine
+        self.healthy = True
+        self.lsn = 0
+        self.checked_at: float | None = None
+
+    def refresh(self) -> None:
+        """Probe the replica: a failure marks it unhealthy until the next check."""
+        try:
+            with self.probe.connect() as conn:
+                self.lsn = parse_lsn(conn.execute(_REPLICA_LSN_SQL).scalar_one())
+            if not self.healthy:
+                logger.info("replica_recovered", replica=self.name)
+            self.healthy = True
+        except SQLAlchemyError as e:
+            if self.healthy:
+                logger.warning("replica_unhealthy", replica=self.name, error_type=type(e).__name__, error=str(e))
+            self.healthy = False
+        finally:
+            self.checked_at = time.monotonic()
+
+
+class ReplicaRouter:
+    """
+    Picks read replicas round-robin, skipping replicas whose last health check
+    failed. Health checks (which also record the replayed LSN) run every
+    check_interval seconds on a background thread once start() is called, so
+    requests never wait on a probe; until then every replica counts as
+    healthy with an unknown (zero) LSN.
+    """
+
+    def __init__(self, replicas: List[Replica], check_interval: float):
+        self.replicas = replicas
+        self.check_interval = check_interval
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def refresh(self) -> None:
+        for replica in self.replicas:
+            replica.refresh()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.check_interval)
+
+    def choose(self, min_lsn: int | None = None) -> Optional[Engine]:
+        """
+        Engine of the next healthy replica, or None to read from the primary.
+
+        With min_lsn (a recent write by this client) only replicas whose last
+        recorded LSN has reached it qualify, so a write's own reads go to the
+        primary until the next health check sees a replica catch up.
+        """
+        with self._lock:
+            start = next(self._next)
+
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if not replica.healthy:
+                continue
+            if min_lsn is not None and replica.lsn < min_lsn:
+                continue
+            return replica.engine
+        return None
+
+
+def build_replica_router() -> Optional[ReplicaRouter]:
+    urls = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    if not urls:
+        return None
+    replicas = [
+        Replica(
+            name=f"replica-{index}",
+            engine=create_engine(url, **pool_options(), **driver_options(url)),
+            probe=probe_engine(url, settings.REPLICA_PROBE_TIMEOUT_SECONDS),
+        )
+        for index, url in enumerate(urls)
+    ]
+    for replica in replicas:
+        instrument_engine(replica.engine)
+        watch_slow_queries(replica.engine)
+        watch_pool(replica.engine, replica.name)
+    return ReplicaRouter(replicas, check_interval=settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+
+def read_after_lsn(request: Request) -> int | None:
+    """
+    LSN of the client's last write while its stickiness window is open.
+
+    The token is "<lsn>:<unix expiry>", sent back by the client as the
+    read_after cookie or the X-Read-After header.
+    """
+    token = request.headers.get(READ_AFTER_HEADER) or request.cookies.get(READ_AFTER_COOKIE)
+    if not token:
+        return None
+    try:
+        lsn, expires_at = token.split(":")
+        if float(expires_at) < time.time():
+            return None
+        return parse_lsn(lsn)
+    except ValueError:
+        return None
+
+
+def set_read_after(response: Response, primary_lsn: str) -> None:
+    window = settings.REPLICA_STICKINESS_SECONDS
+    token = f"{primary_lsn}:{int(time.time() + window)}"
+    response.headers[READ_AFTER_HEADER] = token
+    response.set_cookie(READ_AFTER_COOKIE, token, max_age=max(int(window), 1), httponly=True, samesite="lax")
@@ -0,0 +1,21 @@
+from app.config import settings
+
+# Route classes: what kind of work a request does, for the limits and
+# timeouts configured per class
+READS = "reads"
+STATEMENTS = "statements"
+WRITES = "writes"
+BULK = "bulk"
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def route_class(method: str, path: str) -> str | None:
+    """Class of a request; None outside the API (health checks, docs, metrics)."""
+    if not path.startswith(settings.API_V1_PREFIX):
+        return None
+    if method not in READ_METHODS:
+        return BULK if ":bulk-" in path else WRITES
+    if path.endswith("/statement"):
+        return STATEMENTS
+    return READS
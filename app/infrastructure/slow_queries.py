@@ -0,0 +1,206 @@
+import hashlib
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Set
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.infrastructure.drivers import probe_engine
+from app.infrastructure.logging import get_logger
+from app.infrastructure.instrumentation import instrument_engine
+
+logger = get_logger(__name__)
+
+# Values that identify rows but not people; everything else (names, emails,
+# references, free text) is redacted before it reaches logs or the admin API
+_SAFE_PARAM_TYPES = (bool, int, float, Decimal, date, datetime)
+REDACTED = "<redacted>"
+
+# Expanded IN lists ("IN (%(id_1_1)s, %(id_1_2)s, ...)" or "IN ($1, $2, ...)") vary with the list length
+_IN_LIST = re.compile(r"IN \((?:(?:%\(\w+\)s|\$\d+)(?:, )?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# EXPLAINs queued or running at once; slow queries beyond that go unexplained
+MAX_PENDING_EXPLAINS = 20
+EXPLAIN_TIMEOUT_SECONDS = 5
+
+
+def normalize_sql(statement: str) -> str:
+    return _IN_LIST.sub("IN (...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:12]
+
+
+def redact_parameters(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) for value in parameters]
+    if parameters is None or isinstance(parameters, _SAFE_PARAM_TYPES):
+        return parameters
+    return REDACTED
+
+
+def calling_repository_method() -> str | None:
+    """
+    "InvoiceRepository.count_search" for the outermost repository method on the
+    stack, i.e. the one a service called, not the BaseRepository helpers below it.
+    """
+    caller = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        instance = frame.f_locals.get("self")
+        if instance is not None and frame.f_globals.get("__name__", "").startswith("app.repositories."):
+            caller = f"{type(instance).__name__}.{frame.f_code.co_name}"
+        elif caller is not None:
+            break
+        frame = frame.f_back
+    return caller
+
+
+class SlowQueryLog:
+    """
+    Keeps the most recent samples (and, optionally, EXPLAIN plans) of each
+    distinct slow query, keyed by the fingerprint of its normalized SQL.
+
+    Holds at most max_queries fingerprints, dropping the least recently seen.
+    EXPLAIN runs on a single background thread so it never adds to the
+    request's latency; plans are filled into the sample once they arrive.
+    At most one EXPLAIN per fingerprint (and MAX_PENDING_EXPLAINS in all) is
+    pending at a time, and each runs on its own unpooled connection, so a
+    burst of slow queries can neither grow the queue nor take connections
+    from requests.
+    """
+
+    def __init__(self, threshold_ms: float, history: int, explain: bool, max_queries: int = 200):
+        self.threshold_ms = threshold_ms
+        self.history = history
+        self.explain = explain
+        self.max_queries = max_queries
+        self._queries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._explainer: ThreadPoolExecutor | None = None
+        self._pending_explains: Set[str] = set()
+        self._explain_engines: Dict[Any, Engine] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def record(self, engine: Engine, statement: str, parameters: Any, duration_ms: float, executemany: bool) -> None:
+        normalized = normalize_sql(statement)
+        query_id = fingerprint(normalized)
+        sample = {
+            "captured_at": datetime.now(timezone.utc),
+            "duration_ms": round(duration_ms, 2),
+            "repository_method": calling_repository_method(),
+            "parameters": f"<{len(parameters)} rows>" if executemany else redact_parameters(parameters),
+            "plan": None,
+        }
+
+        logger.warning(
+            "slow_query",
+            query_id=query_id,
+            sql=normalized,
+            duration_ms=sample["duration_ms"],
+            repository_method=sample["repository_method"],
+            parameters=sample["parameters"],
+        )
+
+        with self._lock:
+            entry = self._queries.pop(query_id, None) or {
+                "query_id": query_id,
+                "sql": normalized,
+                "count": 0,
+                "max_duration_ms": 0.0,
+                "samples": deque(maxlen=self.history),
+            }
+            entry["count"] += 1
+            entry["max_duration_ms"] = max(entry["max_duration_ms"], sample["duration_ms"])
+            entry["samples"].appendleft(sample)
+            self._queries[query_id] = entry
+            while len(self._queries) > self.max_queries:
+                self._queries.popitem(last=False)
+
+        # The async engine's connections only work inside its event loop
+        if self.explain and not executemany and not engine.dialect.is_async and self._claim_explain(query_id):
+            self._explainer_pool().submit(self._explain, query_id, engine, statement, parameters, sample)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Slow queries, slowest first, each with its recent samples (newest first)."""
+        with self._lock:
+            entries = [{**entry, "samples": list(entry["samples"])} for entry in self._queries.values()]
+        return sorted(entries, key=lambda entry: entry["max_duration_ms"], reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._queries.clear()
+
+    def _claim_explain(self, query_id: str) -> bool:
+        with self._lock:
+            if query_id in self._pending_explains or len(self._pending_explains) >= MAX_PENDING_EXPLAINS:
+                return False
+            self._pending_explains.add(query_id)
+            return True
+
+    def _explain_engine(self, engine: Engine) -> Engine:
+        with self._lock:
+            if engine.url not in self._explain_engines:
+                self._explain_engines[engine.url] = probe_engine(engine.url, EXPLAIN_TIMEOUT_SECONDS)
+            return self._explain_engines[engine.url]
+
+    def _explainer_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._explainer is None:
+                self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+            return self._explainer
+
+    def _explain(self, query_id: str, engine: Engine, statement: str, parameters: Any, sample: Dict[str, Any]) -> None:
+        # EXPLAIN without ANALYZE only plans the statement, so this is safe for writes too
+        try:
+            connection = self._explain_engine(engine).raw_connection()
+            try:
+                cursor = connection.cursor()
+                cursor.execute(f"EXPLAIN (ANALYZE off, FORMAT JSON) {statement}", parameters)
+                plan = cursor.fetchone()[0]
+                sample["plan"] = plan[0] if isinstance(plan, list) else plan
+            finally:
+                connection.rollback()
+                connection.close()
+        except Exception as e:
+            logger.warning("slow_query_explain_failed", error_type=type(e).__name__, error=str(e))
+        finally:
+            with self._lock:
+                self._pending_explains.discard(query_id)
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    history=settings.SLOW_QUERY_HISTORY,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not slow_query_log.enabled:
+        return
+    duration_ms = (time.perf_counter() - context._query_started_at) * 1000
+    if duration_ms >= slow_query_log.threshold_ms:
+        slow_query_log.record(conn.engine, statement, parameters, duration_ms, executemany)
+
+
+def watch_slow_queries(engine: Engine) -> None:
+    """Record statements on engine slower than SLOW_QUERY_THRESHOLD_MS (timed by the instrumentation hooks)."""
+    instrument_engine(engine)
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,120 @@
+from typing import Dict, NamedTuple
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.exceptions import AppException, DatabaseTimeout, ServiceUnavailable
+from app.infrastructure.logging import get_logger
+from app.infrastructure.metrics import DB_TIMEOUTS
+from app.infrastructure.routes import BULK, READS, STATEMENTS, WRITES, route_class
+
+logger = get_logger(__name__)
+
+# SQLSTATEs: query_canceled (statement_timeout) and lock_not_available (lock_timeout)
+_STATEMENT_TIMEOUT = "57014"
+_LOCK_TIMEOUT = "55P03"
+
+# Both are transaction-scoped (is_local), so they end with the request's transaction
+SET_TIMEOUTS_SQL = text(
+    "SELECT set_config('statement_timeout', :statement_timeout, true),"
+    " set_config('lock_timeout', :lock_timeout, true)"
+)
+
+
+class Timeouts(NamedTuple):
+    statement_ms: int
+    lock_ms: int
+
+
+def parse_timeouts(value: str) -> Timeouts | None:
+    """"5000:1000" -> statement_timeout 5 s, lock_timeout 1 s; "" disables both for the class."""
+    if not value.strip():
+        return None
+    statement_ms, _, lock_ms = value.partition(":")
+    return Timeouts(statement_ms=int(statement_ms), lock_ms=int(lock_ms or 0))
+
+
+class TimeoutPolicy:
+    """Statement and lock timeouts per route class, set at the start of each request's transaction."""
+
+    def __init__(self, timeouts: Dict[str, Timeouts | None]):
+        self.timeouts = timeouts
+
+    @classmethod
+    def from_settings(cls) -> "TimeoutPolicy":
+        return cls({
+            READS: parse_timeouts(settings.DB_TIMEOUT_READS),
+            STATEMENTS: parse_timeouts(settings.DB_TIMEOUT_STATEMENTS),
+            WRITES: parse_timeouts(settings.DB_TIMEOUT_WRITES),
+            BULK: parse_timeouts(settings.DB_TIMEOUT_BULK),
+        })
+
+    def for_request(self, method: str, path: str) -> Timeouts | None:
+        return self.timeouts.get(route_class(method, path))
+
+
+timeout_policy = TimeoutPolicy.from_settings()
+
+
+def timeout_parameters(timeouts: Timeouts) -> Dict[str, str]:
+    return {"statement_timeout": str(timeouts.statement_ms), "lock_timeout": str(timeouts.lock_ms)}
+
+
+def set_timeouts_on_begin(session: Session, timeouts: Timeouts) -> None:
+    """
+    Set timeouts at the start of every database transaction session begins
+    or joins. A unit of work's session re-joins the same transaction after
+    each service commit; that does not set them again.
+    """
+    applied_to = []
+
+    @event.listens_for(session, "after_begin")
+    def set_timeouts(session, transaction, connection):
+        database_transaction = connection.get_transaction()
+        if applied_to and applied_to[0] is database_transaction:
+            return
+        connection.execute(SET_TIMEOUTS_SQL, timeout_parameters(timeouts))
+        applied_to[:] = [database_transaction]
+
+
+def _sqlstate(error: DBAPIError) -> str | None:
+    # psycopg2 exposes pgcode; psycopg 3 and asyncpg (behind SQLAlchemy's adapter) sqlstate
+    for candidate in (error.orig, getattr(error.orig, "__cause__", None)):
+        code = getattr(candidate, "pgcode", None) or getattr(candidate, "sqlstate", None)
+        if code:
+            return code
+    return None
+
+
+def _record_timeout(timeout: str, route: str | None, error: DBAPIError) -> None:
+    DB_TIMEOUTS.inc(timeout, route or "other")
+    logger.warning(
+        "db_timeout",
+        timeout=timeout,
+        route_class=route,
+        statement=error.statement,
+    )
+
+
+def timeout_error(exc: BaseException, route: str | None) -> AppException | None:
+    """
+    The 503/504 for a statement or lock timeout anywhere in exc's chain, or None.
+
+    Services wrap SQLAlchemy errors in DatabaseError; the original stays
+    reachable through __cause__/__context__.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, DBAPIError):
+            code = _sqlstate(exc)
+            if code == _STATEMENT_TIMEOUT:
+                _record_timeout("statement", route, exc)
+                return DatabaseTimeout()
+            if code == _LOCK_TIMEOUT:
+                _record_timeout("lock", route, exc)
+                return ServiceUnavailable("Resource is locked by another operation", retry_after=1)
+        exc = exc.__cause__ or exc.__context__
+    return None
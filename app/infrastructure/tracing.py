@@ -0,0 +1,209 @@
+import functools
+import inspect
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Mapping, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+        SpanExporter,
+    )
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # opentelemetry-sdk is optional; without it every hook below is a no-op
+    trace = None
+
+SERVICE_NAME = "mattilda-billing-api"
+
+# Query text is the parameterised statement (no values); long IN lists are cut
+MAX_STATEMENT_LENGTH = 2048
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Set by configure_tracing; None means tracing is off and hooks return at once
+_tracer = None
+_provider = None
+
+
+def build_exporter(name: str, otlp_endpoint: str = "", file_path: str = "") -> "SpanExporter":
+    """otlp (HTTP/protobuf to a collector), console (stdout) or file (one JSON span per line)."""
+    if trace is None:
+        raise RuntimeError("TRACING_EXPORTER is set but opentelemetry-sdk is not installed")
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=otlp_endpoint or None)
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "file":
+        if not file_path:
+            raise ValueError("TRACING_EXPORTER=file needs TRACING_FILE")
+        return ConsoleSpanExporter(
+            out=open(file_path, "a", buffering=1),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    raise ValueError(f"Unknown tracing exporter: {name}")
+
+
+def configure_tracing(exporter: "SpanExporter", sample_ratio: float = 1.0, batch: bool = True) -> "TracerProvider":
+    """
+    Start recording spans into exporter.
+
+    A sample_ratio share of new traces is recorded; requests arriving with a
+    traceparent header follow the caller's decision instead. Spans are
+    exported off the request path by a batch processor unless batch=False.
+    """
+    global _tracer, _provider
+    shutdown_tracing()
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(sample_ratio)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter) if batch else SimpleSpanProcessor(exporter))
+    _tracer = _provider.get_tracer(__name__)
+    return _provider
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and turn tracing off."""
+    global _tracer, _provider
+    if _provider is not None:
+        _provider.shutdown()
+    _tracer = _provider = None
+
+
+def setup_tracing(exporter_name: str, sample_ratio: float, otlp_endpoint: str = "", file_path: str = "") -> None:
+    if exporter_name:
+        configure_tracing(build_exporter(exporter_name, otlp_endpoint, file_path), sample_ratio)
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+def _in_unsampled_trace() -> bool:
+    # Children of an unsampled span are never recorded, so skip creating them
+    parent = trace.get_current_span()
+    return parent.get_span_context().is_valid and not parent.is_recording()
+
+
+def traced(name: str, *attributes: str) -> Callable[[F], F]:
+    """
+    Run the decorated function in a span called name.
+
+    attributes names arguments of the function (e.g. "school_id") whose
+    values are recorded on the span.
+    """
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None or _in_unsampled_trace():
+                return func(*args, **kwargs)
+            with _tracer.start_as_current_span(name) as span:
+                if attributes and span.is_recording():
+                    arguments = signature.bind(*args, **kwargs).arguments
+                    for attribute in attributes:
+                        if arguments.get(attribute) is not None:
+                            span.set_attribute(attribute, arguments[attribute])
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    """Record attributes (row counts, totals) on the current span, if one is being recorded."""
+    if _tracer is None:
+        return
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attributes({key: value for key, value in attributes.items() if value is not None})
+
+
+@contextmanager
+def request_span(method: str, path: str, headers: Mapping[str, str]) -> Iterator[Any]:
+    """
+    Server span for one HTTP request, continuing the trace in headers if any.
+
+    Yields None when tracing is off. The span is named after the path until
+    finish_request_span renames it after the matched route template.
+    """
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(
+        f"{method} {path}",
+        context=propagate.extract(headers),
+        kind=SpanKind.SERVER,
+        attributes={"http.request.method": method, "url.path": path},
+    ) as span:
+        yield span
+
+
+def finish_request_span(span: Any, method: str, route: Any, status_code: int) -> None:
+    if span is None or not span.is_recording():
+        return
+    if route is not None:
+        span.update_name(f"{method} {route.path}")
+        span.set_attribute("http.route", route.path)
+    span.set_attribute("http.response.status_code", status_code)
+    if status_code >= 500:
+        span.set_status(Status(StatusCode.ERROR))
+
+
+def _query_span_name(statement: str) -> str:
+    operation = statement.lstrip().split(None, 1)
+    return operation[0].upper() if operation else "SQL"
+
+
+def _start_query_span(conn, cursor, statement, parameters, context, executemany):
+    if _tracer is None:
+        return
+    # Only inside a sampled trace; queries outside a request or in
+    # unsampled requests cost one attribute lookup
+    if not trace.get_current_span().is_recording():
+        return
+    context._trace_span = _tracer.start_span(
+        _query_span_name(statement),
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": "postgresql",
+            "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            "db.executemany": executemany,
+        },
+    )
+
+
+def _end_query_span(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        if cursor.rowcount >= 0:
+            span.set_attribute("db.response.returned_rows", cursor.rowcount)
+        span.end()
+        context._trace_span = None
+
+
+def _fail_query_span(exception_context):
+    span = getattr(exception_context.execution_context, "_trace_span", None)
+    if span is not None:
+        span.record_exception(exception_context.original_exception)
+        span.set_status(Status(StatusCode.ERROR))
+        span.end()
+        exception_context.execution_context._trace_span = None
+
+
+def trace_engine(engine: Engine) -> None:
+    """Give each SQL statement run on engine its own span under the current one."""
+    if trace is None or event.contains(engine, "after_cursor_execute", _end_query_span):
+        return
+    event.listen(engine, "before_cursor_execute", _start_query_span)
+    event.listen(engine, "after_cursor_execute", _end_query_span)
+    event.listen(engine, "handle_error", _fail_query_span)
@@ -0,0 +1,97 @@
+from typing import Any, Callable, Dict, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.infrastructure.timeouts import Timeouts, set_timeouts_on_begin
+
+# Set in session.info: repositories leave their writes pending instead of
+# flushing after each call
+DEFER_FLUSH_KEY = "defer_flush"
+
+# Set in session.info: the session's own commits only flush, so work that
+# must follow the real COMMIT waits for UnitOfWork.commit()
+IN_UNIT_OF_WORK_KEY = "in_unit_of_work"
+
+# Set in session.info: callbacks waiting for the session's writes to commit
+_ON_COMMIT_KEY = "on_commit"
+
+
+def on_commit(session: Session, callback: Callable[[], Any], key: Hashable | None = None) -> None:
+    """
+    Run callback once the session's current writes are committed, or never
+    if they are rolled back. Inside a unit of work that is at
+    UnitOfWork.commit(), not at a service's session.commit(). Callbacks
+    registered under the same key run once.
+    """
+    callbacks = session.info.setdefault(_ON_COMMIT_KEY, {})
+    callbacks[key if key is not None else object()] = callback
+
+
+def _run_on_commit(info: Dict[str, Any]) -> None:
+    for callback in info.pop(_ON_COMMIT_KEY, {}).values():
+        callback()
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session: Session) -> None:
+    if not session.info.get(IN_UNIT_OF_WORK_KEY):
+        _run_on_commit(session.info)
+
+
+@event.listens_for(Session, "after_rollback")
+def _session_rolled_back(session: Session) -> None:
+    session.info.pop(_ON_COMMIT_KEY, None)
+
+
+class UnitOfWork:
+    """
+    One transaction shared by every service call of a unit of work (a request).
+
+    The session joins a transaction owned by the unit (join_transaction_mode
+    "rollback_only"): a service's session.commit() only flushes, a
+    session.rollback() abandons the whole unit, and commit() ends it with a
+    single COMMIT. After such a rollback the session refuses further work
+    and commit() raises, rather than run it in a new transaction nothing
+    commits and report success. Repository writes are not flushed one call
+    at a time; the pending changes go out together at the next query
+    (autoflush) or commit. With timeouts, statement_timeout and lock_timeout
+    are set whenever the session begins a transaction.
+    """
+
+    def __init__(self, bind: Engine, session_factory: sessionmaker, timeouts: Timeouts | None = None):
+        self.connection = bind.connect()
+        self.transaction = self.connection.begin()
+        self.session = session_factory(
+            bind=self.connection,
+            join_transaction_mode="rollback_only",
+            autoflush=True,
+        )
+        self.session.info[DEFER_FLUSH_KEY] = True
+        self.session.info[IN_UNIT_OF_WORK_KEY] = True
+        event.listen(self.session, "after_begin", self._refuse_after_rollback)
+        if timeouts is not None:
+            set_timeouts_on_begin(self.session, timeouts)
+
+    def _refuse_after_rollback(self, session, transaction, connection) -> None:
+        if not self.transaction.is_active:
+            raise InvalidRequestError("Unit of work was rolled back; start a new one for further work")
+
+    def commit(self) -> None:
+        if not self.transaction.is_active:
+            raise InvalidRequestError("Unit of work was rolled back; it cannot be committed")
+        self.session.flush()
+        if self.transaction.is_active:
+            self.transaction.commit()
+            _run_on_commit(self.session.info)
+
+    def rollback(self) -> None:
+        self.session.info.pop(_ON_COMMIT_KEY, None)
+        if self.transaction.is_active:
+            self.transaction.rollback()
+
+    def close(self) -> None:
+        self.session.close()
+        self.connection.close()
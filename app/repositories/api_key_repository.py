@@ -0,0 +1,22 @@
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.repositories.base import BaseRepository
+from app.domain.models.api_key import ApiKey
+
+
+class ApiKeyRepository(BaseRepository[ApiKey]):
+    def __init__(self, session: Session):
+        super().__init__(session, ApiKey)
+
+    def get_by_prefix(self, prefix: str) -> Optional[ApiKey]:
+        query = select(ApiKey).where(ApiKey.prefix == prefix)
+        return self.session.scalars(query).first()
+
+    def get_active_by_prefix(self, prefix: str) -> Optional[ApiKey]:
+        query = select(ApiKey).where(ApiKey.prefix == prefix, ApiKey.is_active.is_(True))
+        return self.session.scalars(query).first()
+
+    def get_all_ordered(self) -> List[ApiKey]:
+        return list(self.session.scalars(select(ApiKey).order_by(ApiKey.id)).all())
@@ -0,0 +1,39 @@
+import inspect
+from typing import Any, Callable, Coroutine, Generic, Type, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.base import BaseRepository
+
+R = TypeVar("R", bound=BaseRepository)
+
+
+class AsyncRepository(Generic[R]):
+    """
+    AsyncSession variant of a repository.
+
+    Each public method of repository_class is exposed as a coroutine that runs
+    the same query code through AsyncSession.run_sync, so SQL is shared with the
+    sync stack while the I/O goes through the async driver:
+
+        invoices = AsyncRepository(session, InvoiceRepository)
+        open_invoices = await invoices.search(open_only=True)
+    """
+
+    def __init__(self, session: AsyncSession, repository_class: Type[R]):
+        self.session = session
+        self.repository_class = repository_class
+
+    def __getattr__(self, name: str) -> Callable[..., Coroutine[Any, Any, Any]]:
+        if name.startswith("_") or not callable(getattr(self.repository_class, name, None)):
+            raise AttributeError(f"{self.repository_class.__name__} has no public method {name!r}")
+        if inspect.isgeneratorfunction(getattr(self.repository_class, name)):
+            # A generator would be consumed outside run_sync; use AsyncSession.stream() instead
+            raise AttributeError(f"{self.repository_class.__name__}.{name} streams rows and is sync-only")
+
+        async def method(*args, **kwargs):
+            return await self.session.run_sync(
+                lambda sync_session: getattr(self.repository_class(sync_session), name)(*args, **kwargs)
+            )
+
+        method.__name__ = name
+        return method
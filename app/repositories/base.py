@@ -1,11 +1,25 @@
-from typing import Generic, TypeVar, Type, Optional, List
+from dataclasses import dataclass
+from typing import Any, Generic, Iterator, TypeVar, Type, Optional, List, Sequence
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, insert, update, func, text, Select, Table
+from sqlalchemy.sql.util import find_tables
 
+from app.config import settings
 from app.infrastructure.database import Base
+from app.infrastructure.cache import count_cache
+from app.infrastructure.unit_of_work import DEFER_FLUSH_KEY, on_commit
 
 T = TypeVar("T", bound=Base)
 
+# Set on a session once it has written, so it never reads or fills the shared
+# count cache with rows other sessions cannot see yet
+_WROTE_KEY = "count_cache_bypass"
+
+@dataclass(frozen=True)
+class TotalCount:
+    value: int
+    exact: bool
+
 
 class BaseRepository(Generic[T]):
     def __init__(self, session: Session, model: Type[T]):
@@ -19,22 +33,150 @@ class BaseRepository(Generic[T]):
         query = select(self.model).limit(limit).offset(offset)
         return list(self.session.scalars(query).all())
 
+    def get_many(self, ids: Sequence[int]) -> List[T]:
+        if not ids:
+            return []
+        query = select(self.model).where(self.model.id.in_(ids)).order_by(self.model.id)
+        return list(self.session.scalars(query).all())
+
+    def iterate(self, query: Select | None = None, batch_size: int = 1000) -> Iterator[Any]:
+        """
+        Stream query's results (default: the whole table by id) through a
+        server-side cursor, fetching batch_size rows at a time, so memory stays
+        flat however many rows match. A select of the entity yields entities;
+        a select of columns (see _select(rows=True)) yields Row tuples, which
+        skip the identity map and are much cheaper for exports.
+
+        The cursor lives in the session's transaction: finish (or close()) the
+        iterator before committing. Entities are not retained by the session
+        once the caller drops them, and collection eager loads (joinedload)
+        cannot be streamed.
+        """
+        if query is None:
+            query = self._select().order_by(self.model.id)
+        result = self.session.execute(query.execution_options(yield_per=batch_size))
+        if self._selects_entity(query):
+            result = result.scalars()
+        try:
+            yield from result
+        finally:
+            result.close()
+
+    def _select(self, rows: bool = False) -> Select:
+        """select() of the entity, or of its table's columns for Row tuples."""
+        if rows:
+            return select(*self.model.__table__.columns)
+        return select(self.model)
+
+    @staticmethod
+    def _selects_entity(query: Select) -> bool:
+        descriptions = query.column_descriptions
+        return len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
+
     def create(self, obj: T) -> T:
         self.session.add(obj)
-        self.session.flush()
-        self.session.refresh(obj)
+        self._flush()
+        self._invalidate_counts()
         return obj
 
     def update(self, obj: T) -> T:
         self.session.add(obj)
-        self.session.flush()
-        self.session.refresh(obj)
+        self._flush()
+        self._invalidate_counts()
         return obj
 
+    def create_many(self, rows: Sequence[dict]) -> List[T]:
+        """
+        Insert rows (column -> value dicts) with multi-row INSERT ... RETURNING,
+        batched by SQLAlchemy. Returns the created entities in the order of rows.
+        """
+        if not rows:
+            return []
+        query = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        created = list(self.session.scalars(query, list(rows)).all())
+        self._invalidate_counts()
+        return created
+
+    def update_many(self, rows: Sequence[dict]) -> None:
+        """
+        Apply per-row changes keyed by primary key, e.g. [{"id": 1, "status": "PAID"}],
+        as one executemany UPDATE. Loaded entities are kept in sync.
+        """
+        if not rows:
+            return
+        self.session.execute(update(self.model), list(rows))
+        self._invalidate_counts()
+
     def delete(self, obj: T) -> None:
         self.session.delete(obj)
-        self.session.flush()
+        self._flush()
+        self._invalidate_counts()
 
     def count(self) -> int:
-        query = select(self.model)
-        return len(self.session.scalars(query).all())
\ No newline at end of file
+        return self._count(select(func.count()).select_from(self.model))
+
+    def count_where(self, *criteria) -> int:
+        return self._count(select(func.count()).select_from(self.model).where(*criteria))
+
+    def count_total(self, query: Select | None = None) -> TotalCount:
+        """
+        Total rows of a list query (the whole table when query is None).
+
+        Large results are not counted: unfiltered lists report pg_class.reltuples
+        and filtered ones the planner's row estimate. Only results estimated below
+        EXACT_COUNT_THRESHOLD get an exact COUNT(*).
+        """
+        if query is not None:
+            query = query.order_by(None).limit(None).offset(None)
+        estimate = self._table_estimate() if query is None else self._query_estimate(query)
+        if estimate is None or estimate < settings.EXACT_COUNT_THRESHOLD:
+            return TotalCount(value=self._exact_count(query), exact=True)
+        return TotalCount(value=estimate, exact=False)
+
+    def _exact_count(self, query: Select | None) -> int:
+        if query is None:
+            return self.count()
+        return self._count(select(func.count()).select_from(query.subquery()))
+
+    def _count(self, query: Select) -> int:
+        if not count_cache.enabled or self.session.info.get(_WROTE_KEY):
+            return self.session.scalar(query) or 0
+
+        compiled = query.compile(
+            dialect=self.session.get_bind().dialect,
+            compile_kwargs={"render_postcompile": True},
+        )
+        key = (str(compiled), repr(sorted(compiled.params.items())))
+        tables = {table.name for table in find_tables(query, include_joins=False) if isinstance(table, Table)}
+        return count_cache.get_or_load(key, tables, lambda: self.session.scalar(query) or 0)
+
+    def _flush(self) -> None:
+        # Inside a UnitOfWork writes stay pending and are flushed together
+        if not self.session.info.get(DEFER_FLUSH_KEY):
+            self.session.flush()
+
+    def _invalidate_counts(self) -> None:
+        self.session.info[_WROTE_KEY] = True
+        # Not before the commit: another session could re-cache the old count in between
+        table = self.model.__tablename__
+        on_commit(self.session, lambda: count_cache.invalidate(table), key=("count_cache", table))
+
+    def _table_estimate(self) -> Optional[int]:
+        reltuples = self.session.scalar(
+            text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": self.model.__tablename__},
+        )
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        if reltuples is None or reltuples < 0:
+            return None
+        return int(reltuples)
+
+    def _query_estimate(self, query: Select) -> int:
+        compiled = query.compile(
+            dialect=self.session.get_bind().dialect,
+            compile_kwargs={"render_postcompile": True},
+        )
+        plan = self.session.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
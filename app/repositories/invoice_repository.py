@@ -1,11 +1,25 @@
-from typing import List, Optional
+from typing import Any, Iterator, List, Optional, Tuple
+from datetime import date, datetime
 from decimal import Decimal
-from sqlalchemy import select, func
+from sqlalchemy import select, update, func, literal, true, Select
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.repositories.base import BaseRepository
-from app.domain.models.invoice import Invoice
+from app.repositories.base import BaseRepository, TotalCount
+from app.domain.models.invoice import Invoice, OPEN_INVOICE_STATUSES
 from app.domain.enums import InvoiceStatus
+from app.domain.utils import utc_now
+from app.infrastructure.drivers import PIPELINE_DEFERRED
+
+
+# Status values are rendered inline (literal_execute) so the planner can prove the
+# predicates of the partial indexes on invoices even for prepared statements.
+def status_equals(status: InvoiceStatus):
+    return Invoice.status == literal(status.value, literal_execute=True)
+
+
+NOT_VOID = Invoice.status != literal(InvoiceStatus.VOID.value, literal_execute=True)
+IS_OPEN = Invoice.status.in_([literal(value, literal_execute=True) for value in OPEN_INVOICE_STATUSES])
 
 
 class InvoiceRepository(BaseRepository[Invoice]):
@@ -16,11 +30,175 @@ class InvoiceRepository(BaseRepository[Invoice]):
         query = select(Invoice)
         
         if status is not None:
-            query = query.where(Invoice.status == status.value)
+            query = query.where(status_equals(status))
         
         query = query.limit(limit).offset(offset).order_by(Invoice.created_at.desc())
         return list(self.session.scalars(query).all())
 
+    def search(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        student_id: int | None = None,
+        school_id: int | None = None,
+        status: InvoiceStatus | None = None,
+        currency: str | None = None,
+        due_date_from: date | None = None,
+        due_date_to: date | None = None,
+        issued_from: datetime | None = None,
+        issued_to: datetime | None = None,
+        amount_min: Decimal | None = None,
+        amount_max: Decimal | None = None,
+        open_only: bool = False,
+    ) -> List[Invoice]:
+        query = self._search_query(
+            student_id=student_id,
+            school_id=school_id,
+            status=status,
+            currency=currency,
+            due_date_from=due_date_from,
+            due_date_to=due_date_to,
+            issued_from=issued_from,
+            issued_to=issued_to,
+            amount_min=amount_min,
+            amount_max=amount_max,
+            open_only=open_only,
+        )
+        query = query.limit(limit).offset(offset).order_by(*self._search_order(open_only))
+        return list(self.session.scalars(query).all())
+
+    def count_search(self, **filters) -> TotalCount:
+        if not any(value not in (None, False) for value in filters.values()):
+            return self.count_total()
+        return self.count_total(self._search_query(**filters))
+
+    def search_with_balance(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        **filters
+    ) -> List[Tuple[Invoice, Decimal]]:
+        query = self._with_paid(self._search_query(**filters))
+        query = query.limit(limit).offset(offset).order_by(*self._search_order(filters.get("open_only", False)))
+        return [(invoice, Decimal(str(paid))) for invoice, paid in self.session.execute(query).all()]
+
+    def get_by_id_with_balance(self, invoice_id: int) -> Optional[Tuple[Invoice, Decimal]]:
+        query = self._with_paid(select(Invoice).where(Invoice.id == invoice_id))
+        row = self.session.execute(query).first()
+        if row is None:
+            return None
+        invoice, paid = row
+        return invoice, Decimal(str(paid))
+
+    def get_school_id(self, invoice_id: int) -> Optional[int]:
+        from app.domain.models.student import Student
+        
+        query = select(Student.school_id).join(Invoice, Invoice.student_id == Student.id).where(Invoice.id == invoice_id)
+        return self.session.scalar(query)
+
+    def _search_order(self, open_only: bool) -> tuple:
+        # Open invoices are worked oldest-due first, which is also the order of the open partial indexes.
+        # Many share a due date; id breaks the tie so limit/offset pages are stable.
+        if open_only:
+            return Invoice.due_date.asc(), Invoice.id.asc()
+        return (Invoice.created_at.desc(),)
+
+    def _with_paid(self, query: Select) -> Select:
+        from app.domain.models.payment import Payment
+
+        paid = (
+            select(func.coalesce(func.sum(Payment.amount), 0).label("paid"))
+            .where(Payment.invoice_id == Invoice.id)
+            .lateral("invoice_paid")
+        )
+        return query.add_columns(paid.c.paid).join(paid, true())
+
+    def _search_query(
+        self,
+        student_id: int | None = None,
+        school_id: int | None = None,
+        status: InvoiceStatus | None = None,
+        currency: str | None = None,
+        due_date_from: date | None = None,
+        due_date_to: date | None = None,
+        issued_from: datetime | None = None,
+        issued_to: datetime | None = None,
+        amount_min: Decimal | None = None,
+        amount_max: Decimal | None = None,
+        open_only: bool = False,
+    ) -> Select:
+        from app.domain.models.student import Student
+
+        query = select(Invoice)
+
+        if school_id is not None:
+            query = query.join(Student).where(Student.school_id == school_id)
+        if student_id is not None:
+            query = query.where(Invoice.student_id == student_id)
+        if status is not None:
+            query = query.where(status_equals(status))
+        if open_only:
+            query = query.where(IS_OPEN)
+        if currency is not None:
+            query = query.where(Invoice.currency == currency)
+        if due_date_from is not None:
+            query = query.where(Invoice.due_date >= due_date_from)
+        if due_date_to is not None:
+            query = query.where(Invoice.due_date <= due_date_to)
+        if issued_from is not None:
+            query = query.where(Invoice.issued_at >= issued_from)
+        if issued_to is not None:
+            query = query.where(Invoice.issued_at <= issued_to)
+        if amount_min is not None:
+            query = query.where(Invoice.amount_total >= amount_min)
+        if amount_max is not None:
+            query = query.where(Invoice.amount_total <= amount_max)
+
+        return query
+
+    def lock_by_ids(self, ids: List[int]) -> List[Invoice]:
+        query = (
+            select(Invoice)
+            .where(Invoice.id.in_(ids))
+            .order_by(Invoice.id)
+            .with_for_update()
+        )
+        return list(self.session.scalars(query).all())
+
+    def lock_by_filter(self, limit: int, **filters) -> List[Invoice]:
+        query = (
+            self._search_query(**filters)
+            .order_by(Invoice.id)
+            .limit(limit)
+            .with_for_update(of=Invoice)
+        )
+        return list(self.session.scalars(query).all())
+
+    def bulk_update(self, ids: List[int], values: dict) -> int:
+        if not ids:
+            return 0
+        query = update(Invoice).where(Invoice.id.in_(ids)).values(**values)
+        result = self.session.execute(query)
+        self._invalidate_counts()
+        return result.rowcount
+
+    def save_status(self, invoice: Invoice) -> None:
+        """
+        Write invoice.status with a plain UPDATE that reads nothing back (unlike
+        the ORM flush, which checks the row count), so inside pipeline() it is
+        sent together with the next statement.
+        """
+        updated_at = utc_now()
+        self.session.execute(
+            update(Invoice)
+            .where(Invoice.id == invoice.id)
+            .values(status=invoice.status, updated_at=updated_at)
+            .execution_options(synchronize_session=False, **{PIPELINE_DEFERRED: True})
+        )
+        set_committed_value(invoice, "status", invoice.status)
+        set_committed_value(invoice, "updated_at", updated_at)
+        self._invalidate_counts()
+
     def get_by_student(
         self, 
         student_id: int, 
@@ -31,7 +209,7 @@ class InvoiceRepository(BaseRepository[Invoice]):
         query = select(Invoice).where(Invoice.student_id == student_id)
         
         if status:
-            query = query.where(Invoice.status == status.value)
+            query = query.where(status_equals(status))
         
         query = query.limit(limit).offset(offset).order_by(Invoice.created_at.desc())
         return list(self.session.scalars(query).all())
@@ -50,7 +228,7 @@ class InvoiceRepository(BaseRepository[Invoice]):
         )
         
         if exclude_void:
-            query = query.where(Invoice.status != InvoiceStatus.VOID.value)
+            query = query.where(NOT_VOID)
         
         query = query.limit(limit).offset(offset).order_by(Invoice.created_at.desc())
         return list(self.session.scalars(query).unique().all())
@@ -72,11 +250,27 @@ class InvoiceRepository(BaseRepository[Invoice]):
         )
         
         if exclude_void:
-            query = query.where(Invoice.status != InvoiceStatus.VOID.value)
+            query = query.where(NOT_VOID)
         
         query = query.limit(limit).offset(offset).order_by(Invoice.created_at.desc())
         return list(self.session.scalars(query).unique().all())
 
+    def iterate_by_school(
+        self,
+        school_id: int,
+        exclude_void: bool = True,
+        batch_size: int = 1000,
+        rows: bool = False
+    ) -> Iterator[Any]:
+        from app.domain.models.student import Student
+        
+        query = self._select(rows).join(Student).where(Student.school_id == school_id)
+        
+        if exclude_void:
+            query = query.where(NOT_VOID)
+        
+        yield from self.iterate(query.order_by(Invoice.id), batch_size)
+
     def get_total_invoiced_by_student(
         self, 
         student_id: int,
@@ -88,7 +282,7 @@ class InvoiceRepository(BaseRepository[Invoice]):
         )
         
         if exclude_void:
-            query = query.where(Invoice.status != InvoiceStatus.VOID.value)
+            query = query.where(NOT_VOID)
         
         result = self.session.scalar(query)
         return Decimal(str(result)) if result else Decimal("0")
@@ -107,7 +301,7 @@ class InvoiceRepository(BaseRepository[Invoice]):
         )
         
         if exclude_void:
-            query = query.where(Invoice.status != InvoiceStatus.VOID.value)
+            query = query.where(NOT_VOID)
         
         result = self.session.scalar(query)
         return Decimal(str(result)) if result else Decimal("0")
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Iterator, List
 from decimal import Decimal
 from sqlalchemy import select, func
 from sqlalchemy.orm import Session
@@ -19,6 +19,19 @@ class PaymentRepository(BaseRepository[Payment]):
         )
         return list(self.session.scalars(query).all())
 
+    def iterate_by_school(self, school_id: int, batch_size: int = 1000, rows: bool = False) -> Iterator[Any]:
+        from app.domain.models.invoice import Invoice
+        from app.domain.models.student import Student
+        
+        query = (
+            self._select(rows)
+            .join(Invoice)
+            .join(Student)
+            .where(Student.school_id == school_id)
+            .order_by(Payment.id)
+        )
+        yield from self.iterate(query, batch_size)
+
     def get_total_paid_by_invoice(self, invoice_id: int) -> Decimal:
         query = select(func.coalesce(func.sum(Payment.amount), 0)).where(
             Payment.invoice_id == invoice_id
@@ -2,7 +2,7 @@ from typing import Optional, List
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, TotalCount
 from app.domain.models.school import School
 
 
@@ -19,6 +19,11 @@ class SchoolRepository(BaseRepository[School]):
         query = query.limit(limit).offset(offset)
         return list(self.session.scalars(query).all())
 
+    def count_all(self, is_active: bool | None = None) -> TotalCount:
+        if is_active is None:
+            return self.count_total()
+        return self.count_total(select(School).where(School.is_active == is_active))
+
     def get_by_id_active(self, school_id: int) -> Optional[School]:
         query = select(School).where(
             School.id == school_id,
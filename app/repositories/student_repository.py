@@ -1,8 +1,8 @@
-from typing import List, Optional
-from sqlalchemy import select, func
+from typing import Any, Iterator, List, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, TotalCount
 from app.domain.models.student import Student
 
 
@@ -20,6 +20,10 @@ class StudentRepository(BaseRepository[Student]):
         )
         return list(self.session.scalars(query).all())
 
+    def iterate_by_school(self, school_id: int, batch_size: int = 1000, rows: bool = False) -> Iterator[Any]:
+        query = self._select(rows).where(Student.school_id == school_id).order_by(Student.id)
+        yield from self.iterate(query, batch_size)
+
     def get_by_id_with_school(self, student_id: int) -> Optional[Student]:
         query = (
             select(Student)
@@ -28,9 +32,16 @@ class StudentRepository(BaseRepository[Student]):
         )
         return self.session.scalars(query).unique().first()
 
+    def get_school_id(self, student_id: int) -> Optional[int]:
+        return self.session.scalar(select(Student.school_id).where(Student.id == student_id))
+
     def count_by_school(self, school_id: int) -> int:
-        query = select(func.count(Student.id)).where(Student.school_id == school_id)
-        return self.session.scalar(query) or 0
+        return self.count_where(Student.school_id == school_id)
+
+    def count_all(self, school_id: int | None = None) -> TotalCount:
+        if school_id is None:
+            return self.count_total()
+        return self.count_total(select(Student).where(Student.school_id == school_id))
 
     def get_by_email(self, email: str) -> Optional[Student]:
         query = select(Student).where(Student.email == email)
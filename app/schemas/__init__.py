@@ -1,6 +1,16 @@
 from app.schemas.school import SchoolCreate, SchoolUpdate, SchoolResponse
 from app.schemas.student import StudentCreate, StudentUpdate, StudentResponse
-from app.schemas.invoice import InvoiceCreate, InvoiceUpdate, InvoiceResponse
+from app.schemas.invoice import (
+    InvoiceCreate,
+    InvoiceUpdate,
+    InvoiceFilter,
+    InvoiceResponse,
+    InvoiceBalanceResponse,
+    InvoiceBulkVoid,
+    InvoiceBulkUpdate,
+    InvoiceBulkItemResult,
+    InvoiceBulkResponse,
+)
 from app.schemas.payment import PaymentCreate, PaymentResponse
 from app.schemas.statement import StudentStatementResponse, SchoolStatementResponse, StatementTotals
 
@@ -13,7 +23,13 @@ __all__ = [
     "StudentResponse",
     "InvoiceCreate",
     "InvoiceUpdate",
+    "InvoiceFilter",
     "InvoiceResponse",
+    "InvoiceBalanceResponse",
+    "InvoiceBulkVoid",
+    "InvoiceBulkUpdate",
+    "InvoiceBulkItemResult",
+    "InvoiceBulkResponse",
     "PaymentCreate",
     "PaymentResponse",
     "StudentStatementResponse",
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Any, List
+from pydantic import BaseModel
+
+
+class SlowQuerySample(BaseModel):
+    captured_at: datetime
+    duration_ms: float
+    repository_method: str | None
+    parameters: Any
+    plan: dict | None
+
+
+class SlowQueryResponse(BaseModel):
+    query_id: str
+    sql: str
+    count: int
+    max_duration_ms: float
+    samples: List[SlowQuerySample]
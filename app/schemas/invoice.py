@@ -1,6 +1,7 @@
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from decimal import Decimal
-from pydantic import BaseModel, Field, field_validator
+from typing import List
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.domain.enums import InvoiceStatus
 
@@ -27,6 +28,79 @@ class InvoiceUpdate(BaseModel):
     description: str | None = Field(None, max_length=500)
 
 
+class InvoiceFilter(BaseModel):
+    student_id: int | None = None
+    school_id: int | None = None
+    status: InvoiceStatus | None = None
+    currency: str | None = None
+    due_date_from: date | None = None
+    due_date_to: date | None = None
+    issued_from: datetime | None = None
+    issued_to: datetime | None = None
+    amount_min: Decimal | None = None
+    amount_max: Decimal | None = None
+    open_only: bool = False
+
+    @field_validator('currency')
+    @classmethod
+    def validate_currency_uppercase(cls, v: str | None) -> str | None:
+        return v.upper() if v else None
+
+    @field_validator('issued_from', 'issued_to')
+    @classmethod
+    def normalize_to_naive_utc(cls, v: datetime | None) -> datetime | None:
+        # issued_at is naive UTC; mixing aware and naive bounds would not compare
+        if v is not None and v.tzinfo is not None:
+            return v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+
+MAX_BULK_INVOICES = 1000
+
+
+class InvoiceBulkSelection(BaseModel):
+    ids: List[int] | None = Field(None, min_length=1, max_length=MAX_BULK_INVOICES)
+    filter: InvoiceFilter | None = None
+
+    @model_validator(mode='after')
+    def validate_selection(self) -> 'InvoiceBulkSelection':
+        if self.ids is None and self.filter is None:
+            raise ValueError("Provide 'ids' or 'filter'")
+        if self.ids is not None and self.filter is not None:
+            raise ValueError("Provide either 'ids' or 'filter', not both")
+        if self.filter is not None and not self.filter.model_dump(exclude_defaults=True):
+            raise ValueError("Filter must contain at least one criterion")
+        return self
+
+
+class InvoiceBulkVoid(InvoiceBulkSelection):
+    pass
+
+
+class InvoiceBulkUpdate(InvoiceBulkSelection):
+    due_date: date | None = None
+    description: str | None = Field(None, max_length=500)
+
+    @model_validator(mode='after')
+    def validate_changes(self) -> 'InvoiceBulkUpdate':
+        if self.due_date is None and self.description is None:
+            raise ValueError("Provide at least one of 'due_date' or 'description'")
+        return self
+
+
+class InvoiceBulkItemResult(BaseModel):
+    id: int
+    success: bool
+    status_code: int
+    detail: str | None = None
+
+
+class InvoiceBulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[InvoiceBulkItemResult]
+
+
 class InvoiceResponse(InvoiceBase):
     id: int
     student_id: int
@@ -38,3 +112,7 @@ class InvoiceResponse(InvoiceBase):
     class Config:
         from_attributes = True
 
+
+class InvoiceBalanceResponse(InvoiceResponse):
+    paid: Decimal
+    pending: Decimal
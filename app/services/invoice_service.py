@@ -1,16 +1,29 @@
-from typing import List
+from typing import Callable, Dict, List, Tuple
+from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.repositories.invoice_repository import InvoiceRepository
 from app.repositories.student_repository import StudentRepository
 from app.repositories.payment_repository import PaymentRepository
+from app.repositories.base import TotalCount
 from app.domain.models import Invoice
 from app.domain.enums import InvoiceStatus
-from app.domain.business_rules import derive_invoice_status
-from app.schemas import InvoiceCreate, InvoiceUpdate
+from app.domain.business_rules import derive_invoice_status, calculate_pending
+from app.schemas import (
+    InvoiceCreate,
+    InvoiceUpdate,
+    InvoiceFilter,
+    InvoiceBalanceResponse,
+    InvoiceBulkVoid,
+    InvoiceBulkUpdate,
+    InvoiceBulkItemResult,
+    InvoiceBulkResponse,
+)
+from app.schemas.invoice import InvoiceBulkSelection, MAX_BULK_INVOICES
 from app.infrastructure.logging import get_logger
-from app.exceptions import EntityNotFound, InvalidOperation, ValidationError, DatabaseError
+from app.infrastructure.tracing import traced
+from app.exceptions import AppException, EntityNotFound, InvalidOperation, ValidationError, DatabaseError
 
 logger = get_logger(__name__)
 
@@ -71,30 +84,75 @@ class InvoiceService:
             raise EntityNotFound("Invoice", invoice_id)
         return invoice
 
+    def get_school_id(self, invoice_id: int) -> int | None:
+        return self.invoice_repo.get_school_id(invoice_id)
+
+    def get_student_school_id(self, student_id: int) -> int | None:
+        return self.student_repo.get_school_id(student_id)
+
+    @traced("InvoiceService.get_all", "limit", "offset")
     def get_all(
         self, 
         limit: int = 100, 
         offset: int = 0, 
-        student_id: int | None = None,
-        status: InvoiceStatus | None = None
+        filters: InvoiceFilter | None = None
     ) -> List[Invoice]:
-        if student_id is not None:
-            return self.invoice_repo.get_by_student(
-                student_id=student_id,
-                status=status,
-                limit=limit,
-                offset=offset
-            )
-        return self.invoice_repo.get_all(limit=limit, offset=offset, status=status)
+        filters = filters or InvoiceFilter()
+        self._validate_filter_ranges(filters)
+        return self.invoice_repo.search(limit=limit, offset=offset, **filters.model_dump())
+
+    def count(self, filters: InvoiceFilter | None = None) -> TotalCount:
+        filters = filters or InvoiceFilter()
+        self._validate_filter_ranges(filters)
+        return self.invoice_repo.count_search(**filters.model_dump())
+
+    def _validate_filter_ranges(self, filters: InvoiceFilter) -> None:
+        ranges = (
+            ("due_date", filters.due_date_from, filters.due_date_to),
+            ("issued", filters.issued_from, filters.issued_to),
+            ("amount", filters.amount_min, filters.amount_max),
+        )
+        for name, lower, upper in ranges:
+            if lower is not None and upper is not None and lower > upper:
+                raise ValidationError(f"Invalid {name} range: lower bound ({lower}) is greater than upper bound ({upper})")
+
+    def get_by_id_with_balance(self, invoice_id: int) -> InvoiceBalanceResponse:
+        row = self.invoice_repo.get_by_id_with_balance(invoice_id)
+        if not row:
+            raise EntityNotFound("Invoice", invoice_id)
+        return self._build_balance_response(*row)
+
+    @traced("InvoiceService.get_all_with_balance", "limit", "offset")
+    def get_all_with_balance(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        filters: InvoiceFilter | None = None
+    ) -> List[InvoiceBalanceResponse]:
+        filters = filters or InvoiceFilter()
+        self._validate_filter_ranges(filters)
+        rows = self.invoice_repo.search_with_balance(limit=limit, offset=offset, **filters.model_dump())
+        return [self._build_balance_response(invoice, paid) for invoice, paid in rows]
+
+    def _build_balance_response(self, invoice: Invoice, paid: Decimal) -> InvoiceBalanceResponse:
+        return InvoiceBalanceResponse(
+            id=invoice.id,
+            student_id=invoice.student_id,
+            amount_total=invoice.amount_total,
+            paid=paid,
+            pending=calculate_pending(invoice.amount_total, paid),
+            currency=invoice.currency,
+            status=invoice.status,
+            issued_at=invoice.issued_at,
+            due_date=invoice.due_date,
+            description=invoice.description,
+            created_at=invoice.created_at,
+            updated_at=invoice.updated_at
+        )
 
     def update(self, invoice_id: int, invoice_data: InvoiceUpdate) -> Invoice:
         invoice = self.get_by_id(invoice_id)
-        
-        if invoice.status == InvoiceStatus.VOID.value:
-            raise InvalidOperation("Cannot update voided invoice")
-        
-        if invoice.status == InvoiceStatus.PAID.value:
-            raise InvalidOperation("Cannot update paid invoice")
+        self._ensure_updatable(invoice)
         
         if invoice_data.amount_total is not None:
             total_paid = self.payment_repo.get_total_paid_by_invoice(invoice_id)
@@ -151,9 +209,7 @@ class InvoiceService:
 
     def void(self, invoice_id: int) -> Invoice:
         invoice = self.get_by_id(invoice_id)
-        
-        if invoice.status == InvoiceStatus.VOID.value:
-            raise EntityNotFound("Invoice", invoice_id)
+        self._ensure_voidable(invoice)
         
         try:
             previous_status = invoice.status
@@ -180,3 +236,138 @@ class InvoiceService:
                 error=str(e)
             )
             raise DatabaseError("void invoice")
+
+    @traced("InvoiceService.bulk_void")
+    def bulk_void(self, selection: InvoiceBulkVoid) -> InvoiceBulkResponse:
+        invoices, results = self._lock_bulk_selection(selection)
+        
+        voided_ids = self._apply_rule(invoices, self._ensure_voidable, results)
+        
+        try:
+            self.invoice_repo.bulk_update(voided_ids, {"status": InvoiceStatus.VOID.value})
+            self.session.commit()
+            
+            logger.warning(
+                "invoices_bulk_voided",
+                voided_count=len(voided_ids),
+                failed_count=len(results) - len(voided_ids),
+                invoice_ids=voided_ids
+            )
+            
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(
+                "invoice_bulk_void_failed",
+                invoice_ids=voided_ids,
+                error_type=type(e).__name__,
+                error=str(e)
+            )
+            raise DatabaseError("bulk void invoices")
+        
+        return self._build_bulk_response(results)
+
+    @traced("InvoiceService.bulk_update")
+    def bulk_update(self, selection: InvoiceBulkUpdate) -> InvoiceBulkResponse:
+        invoices, results = self._lock_bulk_selection(selection)
+        
+        updated_ids = self._apply_rule(invoices, self._ensure_updatable, results)
+        
+        values = {}
+        if selection.due_date is not None:
+            values["due_date"] = selection.due_date
+        if selection.description is not None:
+            values["description"] = selection.description
+        
+        try:
+            self.invoice_repo.bulk_update(updated_ids, values)
+            self.session.commit()
+            
+            logger.info(
+                "invoices_bulk_updated",
+                updated_count=len(updated_ids),
+                failed_count=len(results) - len(updated_ids),
+                fields=sorted(values)
+            )
+            
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(
+                "invoice_bulk_update_failed",
+                invoice_ids=updated_ids,
+                error_type=type(e).__name__,
+                error=str(e)
+            )
+            raise DatabaseError("bulk update invoices")
+        
+        return self._build_bulk_response(results)
+
+    def _ensure_voidable(self, invoice: Invoice) -> None:
+        if invoice.status == InvoiceStatus.VOID.value:
+            raise EntityNotFound("Invoice", invoice.id)
+
+    def _ensure_updatable(self, invoice: Invoice) -> None:
+        if invoice.status == InvoiceStatus.VOID.value:
+            raise InvalidOperation("Cannot update voided invoice")
+        
+        if invoice.status == InvoiceStatus.PAID.value:
+            raise InvalidOperation("Cannot update paid invoice")
+
+    def _lock_bulk_selection(
+        self, 
+        selection: InvoiceBulkSelection
+    ) -> Tuple[List[Invoice], Dict[int, InvoiceBulkItemResult]]:
+        if selection.ids is not None:
+            requested_ids = list(dict.fromkeys(selection.ids))
+            invoices = self.invoice_repo.lock_by_ids(requested_ids)
+        else:
+            filters = selection.filter
+            self._validate_filter_ranges(filters)
+            invoices = self.invoice_repo.lock_by_filter(
+                limit=MAX_BULK_INVOICES + 1,
+                **filters.model_dump()
+            )
+            if len(invoices) > MAX_BULK_INVOICES:
+                self.session.rollback()
+                raise ValidationError(
+                    f"Filter matches more than {MAX_BULK_INVOICES} invoices. Narrow the filter."
+                )
+            requested_ids = [invoice.id for invoice in invoices]
+        
+        results = {
+            invoice_id: self._bulk_failure(invoice_id, EntityNotFound("Invoice", invoice_id))
+            for invoice_id in requested_ids
+        }
+        return invoices, results
+
+    def _apply_rule(
+        self,
+        invoices: List[Invoice],
+        rule: Callable[[Invoice], None],
+        results: Dict[int, InvoiceBulkItemResult]
+    ) -> List[int]:
+        accepted_ids = []
+        for invoice in invoices:
+            try:
+                rule(invoice)
+            except AppException as e:
+                results[invoice.id] = self._bulk_failure(invoice.id, e)
+                continue
+            results[invoice.id] = InvoiceBulkItemResult(id=invoice.id, success=True, status_code=200)
+            accepted_ids.append(invoice.id)
+        return accepted_ids
+
+    def _bulk_failure(self, invoice_id: int, error: AppException) -> InvoiceBulkItemResult:
+        return InvoiceBulkItemResult(
+            id=invoice_id,
+            success=False,
+            status_code=error.status_code,
+            detail=error.detail
+        )
+
+    def _build_bulk_response(self, results: Dict[int, InvoiceBulkItemResult]) -> InvoiceBulkResponse:
+        succeeded = sum(1 for result in results.values() if result.success)
+        return InvoiceBulkResponse(
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            results=list(results.values())
+        )
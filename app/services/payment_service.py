@@ -2,6 +2,7 @@ from typing import List
 from decimal import Decimal
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.payment_repository import PaymentRepository
 from app.repositories.invoice_repository import InvoiceRepository
@@ -10,6 +11,10 @@ from app.domain.enums import InvoiceStatus
 from app.domain.business_rules import derive_invoice_status, validate_payment_amount, calculate_pending
 from app.schemas import PaymentCreate
 from app.infrastructure.logging import get_logger
+from app.infrastructure.drivers import pipeline
+from app.infrastructure.metrics import PAYMENTS_PROCESSED, PAYMENT_FAILURES
+from app.infrastructure.tracing import traced
+from app.infrastructure.unit_of_work import on_commit
 from app.exceptions import EntityNotFound, InvalidOperation, ValidationError, DatabaseError
 
 logger = get_logger(__name__)
@@ -21,12 +26,17 @@ class PaymentService:
         self.payment_repo = PaymentRepository(session)
         self.invoice_repo = InvoiceRepository(session)
 
+    @traced("PaymentService.create", "invoice_id")
     def create(self, invoice_id: int, payment_data: PaymentCreate) -> Payment:
         invoice = self._get_and_validate_invoice(invoice_id)
         total_paid, pending = self._calculate_pending_and_total(invoice_id, invoice)
         self._validate_payment_amount(payment_data.amount, pending, invoice_id)
         return self._process_payment_transaction(invoice, payment_data, total_paid)
 
+    def get_school_id(self, invoice_id: int) -> int | None:
+        return self.invoice_repo.get_school_id(invoice_id)
+
+    @traced("PaymentService.get_by_invoice", "invoice_id")
     def get_by_invoice(self, invoice_id: int) -> List[Payment]:
         invoice = self.invoice_repo.get_by_id(invoice_id)
         if not invoice:
@@ -37,9 +47,11 @@ class PaymentService:
     def _get_and_validate_invoice(self, invoice_id: int) -> Invoice:
         invoice = self.invoice_repo.get_by_id(invoice_id)
         if not invoice:
+            PAYMENT_FAILURES.inc("invoice_not_found")
             raise EntityNotFound("Invoice", invoice_id)
         
         if invoice.status == InvoiceStatus.VOID.value:
+            PAYMENT_FAILURES.inc("invoice_void")
             raise InvalidOperation("Cannot create payment for voided invoice")
         
         return invoice
@@ -73,6 +85,7 @@ class PaymentService:
                 pending=str(pending),
                 error=str(e)
             )
+            PAYMENT_FAILURES.inc("invalid_amount")
             raise ValidationError(str(e))
 
     def _process_payment_transaction(
@@ -88,13 +101,19 @@ class PaymentService:
                 method=payment_data.method,
                 reference=payment_data.reference,
             )
-            created_payment = self.payment_repo.create(payment)
-            
             new_total_paid = current_total_paid + payment_data.amount
             new_status = derive_invoice_status(invoice.amount_total, new_total_paid)
             invoice.status = new_status.value
-            self.invoice_repo.update(invoice)
             
+            # With psycopg 3 the status UPDATE is queued and goes out together
+            # with the INSERT, whose RETURNING is the first result we wait for
+            with pipeline(self.session):
+                self.invoice_repo.save_status(invoice)
+                created_payment = self.payment_repo.create(payment)
+                self.session.flush()
+            
+            method = payment_data.method.value if payment_data.method else "unspecified"
+            on_commit(self.session, lambda: PAYMENTS_PROCESSED.inc(method))
             self.session.commit()
             
             logger.info(
@@ -117,4 +136,30 @@ class PaymentService:
                 error_type=type(e).__name__,
                 error=str(e)
             )
+            PAYMENT_FAILURES.inc("database_error")
             raise DatabaseError("process payment")
+
+
+class AsyncPaymentService:
+    """
+    PaymentService on an AsyncSession (DB_ASYNC). The same validation and
+    transaction run through run_sync, so only the driver I/O changes.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, invoice_id: int, payment_data: PaymentCreate) -> Payment:
+        return await self.session.run_sync(
+            lambda session: PaymentService(session).create(invoice_id, payment_data)
+        )
+
+    async def get_school_id(self, invoice_id: int) -> int | None:
+        return await self.session.run_sync(
+            lambda session: PaymentService(session).get_school_id(invoice_id)
+        )
+
+    async def get_by_invoice(self, invoice_id: int) -> List[Payment]:
+        return await self.session.run_sync(
+            lambda session: PaymentService(session).get_by_invoice(invoice_id)
+        )
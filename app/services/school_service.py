@@ -4,6 +4,7 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from app.repositories.school_repository import SchoolRepository
 from app.repositories.student_repository import StudentRepository
+from app.repositories.base import TotalCount
 from app.domain.models import School
 from app.schemas import SchoolCreate, SchoolUpdate
 from app.infrastructure.logging import get_logger
@@ -65,6 +66,9 @@ class SchoolService:
     def get_all(self, limit: int = 100, offset: int = 0, is_active: bool | None = None) -> List[School]:
         return self.school_repo.get_all(limit=limit, offset=offset, is_active=is_active)
 
+    def count(self, is_active: bool | None = None) -> TotalCount:
+        return self.school_repo.count_all(is_active=is_active)
+
     def update(self, school_id: int, school_data: SchoolUpdate) -> School:
         school = self.get_by_id(school_id)
         
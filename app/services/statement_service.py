@@ -2,6 +2,7 @@ from decimal import Decimal
 from typing import List, Tuple
 import time
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.student_repository import StudentRepository
 from app.repositories.school_repository import SchoolRepository
@@ -13,6 +14,8 @@ from app.schemas.statement import StudentStatementResponse, SchoolStatementRespo
 from app.schemas.student import StudentResponse
 from app.schemas.school import SchoolResponse
 from app.infrastructure.logging import get_logger
+from app.infrastructure.metrics import STATEMENT_DURATION, STATEMENT_INVOICES
+from app.infrastructure.tracing import set_span_attributes, traced
 from app.exceptions import EntityNotFound
 
 logger = get_logger(__name__)
@@ -26,6 +29,7 @@ class StatementService:
         self.invoice_repo = InvoiceRepository(session)
         self.payment_repo = PaymentRepository(session)
 
+    @traced("StatementService.get_student_statement", "student_id")
     def get_student_statement(self, student_id: int) -> StudentStatementResponse:
         start_time = time.time()
         
@@ -65,6 +69,7 @@ class StatementService:
             invoices=invoice_details
         )
 
+    @traced("StatementService.get_school_statement", "school_id")
     def get_school_statement(self, school_id: int) -> SchoolStatementResponse:
         start_time = time.time()
         
@@ -145,6 +150,10 @@ class StatementService:
         total_pending: Decimal,
         **extra_context
     ) -> None:
+        kind = event_name.removesuffix("_statement_generated")
+        STATEMENT_DURATION.observe(duration_ms / 1000, kind)
+        STATEMENT_INVOICES.observe(invoice_count, kind)
+        set_span_attributes(invoice_count=invoice_count, **extra_context)
         logger.info(
             event_name,
             invoice_count=invoice_count,
@@ -153,4 +162,21 @@ class StatementService:
             total_pending=str(total_pending),
             duration_ms=round(duration_ms, 2),
             **extra_context
-        )
\ No newline at end of file
+        )
+
+
+class AsyncStatementService:
+    """StatementService on an AsyncSession (DB_ASYNC), sharing its queries via run_sync."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_student_statement(self, student_id: int) -> StudentStatementResponse:
+        return await self.session.run_sync(
+            lambda session: StatementService(session).get_student_statement(student_id)
+        )
+
+    async def get_school_statement(self, school_id: int) -> SchoolStatementResponse:
+        return await self.session.run_sync(
+            lambda session: StatementService(session).get_school_statement(school_id)
+        )
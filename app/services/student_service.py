@@ -5,6 +5,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from app.repositories.student_repository import StudentRepository
 from app.repositories.school_repository import SchoolRepository
 from app.repositories.invoice_repository import InvoiceRepository
+from app.repositories.base import TotalCount
 from app.domain.models import Student
 from app.schemas import StudentCreate, StudentUpdate
 from app.infrastructure.logging import get_logger
@@ -66,11 +67,17 @@ class StudentService:
             raise EntityNotFound("Student", student_id)
         return student
 
+    def get_school_id(self, student_id: int) -> int | None:
+        return self.student_repo.get_school_id(student_id)
+
     def get_all(self, limit: int = 100, offset: int = 0, school_id: int | None = None) -> List[Student]:
         if school_id is not None:
             return self.student_repo.get_by_school(school_id=school_id, limit=limit, offset=offset)
         return self.student_repo.get_all(limit=limit, offset=offset)
 
+    def count(self, school_id: int | None = None) -> TotalCount:
+        return self.student_repo.count_all(school_id=school_id)
+
     def update(self, student_id: int, student_data: StudentUpdate) -> Student:
         student = self.get_by_id(student_id)
         
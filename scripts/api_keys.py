@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Manage API keys
+
+    python scripts/api_keys.py create "billing-bot" --scope invoices:write --scope payments:write
+    python scripts/api_keys.py create "school-3-portal" --scope payments:write --school-id 3
+    python scripts/api_keys.py list
+    python scripts/api_keys.py revoke <prefix>
+
+create prints the key once; only its prefix and SHA-256 hash are stored.
+The API caches keys for API_KEY_CACHE_TTL_SECONDS, so a revoked key keeps
+working for at most that long.
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import argparse
+
+from app.domain.enums import ApiKeyScope
+from app.domain.models import ApiKey
+from app.infrastructure.auth import generate_api_key
+from app.infrastructure.database import SessionLocal
+from app.repositories.api_key_repository import ApiKeyRepository
+
+
+def create(args: argparse.Namespace) -> None:
+    api_key, prefix, key_hash = generate_api_key()
+    with SessionLocal() as session:
+        ApiKeyRepository(session).create(ApiKey(
+            name=args.name,
+            prefix=prefix,
+            key_hash=key_hash,
+            scopes=sorted(set(args.scope)),
+            school_id=args.school_id,
+        ))
+        session.commit()
+    print(f"Created API key {args.name!r} (prefix {prefix}). Store it now, it is not shown again:")
+    print(api_key)
+
+
+def list_keys(args: argparse.Namespace) -> None:
+    with SessionLocal() as session:
+        api_keys = ApiKeyRepository(session).get_all_ordered()
+    print(f"{'prefix':<10} {'active':<7} {'school':<7} {'name':<30} scopes")
+    for api_key in api_keys:
+        school = api_key.school_id if api_key.school_id is not None else "-"
+        print(f"{api_key.prefix:<10} {str(api_key.is_active):<7} {school!s:<7} {api_key.name:<30} {', '.join(api_key.scopes)}")
+
+
+def revoke(args: argparse.Namespace) -> None:
+    with SessionLocal() as session:
+        repo = ApiKeyRepository(session)
+        api_key = repo.get_by_prefix(args.prefix)
+        if api_key is None:
+            sys.exit(f"No API key with prefix {args.prefix}")
+        api_key.is_active = False
+        repo.update(api_key)
+        session.commit()
+    print(f"Revoked API key {api_key.name!r} (prefix {args.prefix})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = commands.add_parser("create", help="Create a key and print it")
+    create_parser.add_argument("name")
+    create_parser.add_argument(
+        "--scope", action="append", required=True, choices=[scope.value for scope in ApiKeyScope],
+        help="Repeat for several scopes",
+    )
+    create_parser.add_argument("--school-id", type=int, default=None, help="Only allow writes for this school")
+    create_parser.set_defaults(handler=create)
+
+    commands.add_parser("list", help="List keys (never the keys themselves)").set_defaults(handler=list_keys)
+
+    revoke_parser = commands.add_parser("revoke", help="Deactivate a key")
+    revoke_parser.add_argument("prefix")
+    revoke_parser.set_defaults(handler=revoke)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
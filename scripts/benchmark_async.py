@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the sync vs async (DB_ASYNC) data layer
+
+Starts the API twice with uvicorn (one worker each): once on the sync stack
+(threadpool + psycopg2) and once with DB_ASYNC=true (event loop + asyncpg).
+Each server gets the same concurrent load on the statement and payment
+endpoints, and the script reports requests/s, p50 and p99 latency.
+
+Needs seeded data with open invoices, for example:
+    python scripts/seed.py --extra-students 2000
+    python scripts/benchmark_async.py --concurrency 64 --duration 15
+
+The load generator uses httpx (a FastAPI test dependency) and runs on the
+same host, so compare the two stacks with each other, not with production.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+
+
+def load_ids(limit: int) -> dict:
+    engine = create_engine(settings.DATABASE_URL)
+    with engine.connect() as conn:
+        ids = {
+            "students": conn.execute(text(
+                "SELECT DISTINCT student_id FROM invoices ORDER BY student_id LIMIT :limit"
+            ), {"limit": limit}).scalars().all(),
+            "schools": conn.execute(text(
+                "SELECT id FROM schools WHERE is_active ORDER BY id"
+            )).scalars().all(),
+            "open_invoices": conn.execute(text(
+                "SELECT id FROM invoices WHERE status IN ('ISSUED', 'PARTIAL') AND amount_total >= 100 "
+                "ORDER BY id LIMIT :limit"
+            ), {"limit": limit}).scalars().all(),
+        }
+    engine.dispose()
+    if not all(ids.values()):
+        sys.exit("Not enough data: run scripts/seed.py --extra-students N first")
+    return ids
+
+
+def start_server(port: int, db_async: bool) -> subprocess.Popen:
+    env = {**os.environ, "DB_ASYNC": "true" if db_async else "false", "LOG_LEVEL": "WARNING"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=project_root,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.kill()
+    sys.exit(f"Server on port {port} did not start")
+
+
+async def run_load(base_url: str, make_request, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def worker(worker_id: int, client: httpx.AsyncClient):
+        nonlocal errors
+        i = worker_id
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            response = await make_request(client, i)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+            i += concurrency
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.monotonic()
+        await asyncio.gather(*(worker(i, client) for i in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[max(int(len(latencies) * 0.99) - 1, 0)],
+        "errors": errors,
+    }
+
+
+def scenarios(ids: dict) -> dict:
+    students, schools, invoices = ids["students"], ids["schools"], ids["open_invoices"]
+    prefix = settings.API_V1_PREFIX
+    headers = {"X-API-Key": settings.API_KEY}
+
+    return {
+        "GET student statement": lambda client, i: client.get(
+            f"{prefix}/students/{students[i % len(students)]}/statement"
+        ),
+        "GET school statement": lambda client, i: client.get(
+            f"{prefix}/schools/{schools[i % len(schools)]}/statement"
+        ),
+        "POST payment": lambda client, i: client.post(
+            f"{prefix}/invoices/{invoices[i % len(invoices)]}/payments",
+            json={"amount": "0.01", "method": "CASH", "reference": "BENCH"},
+            headers=headers,
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15, help="Seconds per scenario")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    ids = load_ids(limit=500)
+    results = {}
+    for name, db_async in (("sync", False), ("async", True)):
+        print(f"Benchmarking {name} stack...")
+        server = start_server(args.port, db_async)
+        try:
+            results[name] = {
+                scenario: asyncio.run(run_load(f"http://127.0.0.1:{args.port}", request, args.concurrency, args.duration))
+                for scenario, request in scenarios(ids).items()
+            }
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"\nconcurrency={args.concurrency}, {args.duration:.0f}s per scenario")
+    print(f"{'scenario':<24} {'stack':<6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for scenario in results["sync"]:
+        for name in ("sync", "async"):
+            r = results[name][scenario]
+            print(f"{scenario:<24} {name:<6} {r['rps']:>8.1f} {r['p50']:>8.1f} {r['p99']:>8.1f} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
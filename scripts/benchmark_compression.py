@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark for response compression levels
+
+Compresses real payloads (a school statement and an invoice list page, as
+the API renders them) at each gzip level and brotli quality, and reports the
+compression ratio and CPU cost, to choose COMPRESSION_GZIP_LEVEL,
+COMPRESSION_BROTLI_QUALITY and the per-route levels in app/main.py.
+
+    python scripts/seed.py --extra-students 2000
+    python scripts/benchmark_compression.py --school-id 1 --limit 1000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.api.responses import ModelJSONResponse, model_list_response
+from app.infrastructure.compression import CompressionLevels, _Compressor, brotli
+from app.infrastructure.database import SessionLocal
+from app.schemas import InvoiceFilter, InvoiceResponse
+from app.services.invoice_service import InvoiceService
+from app.services.statement_service import StatementService
+
+GZIP_LEVELS = (1, 4, 6, 9)
+BROTLI_QUALITIES = (1, 4, 5, 6, 8, 11)
+
+
+def compress(encoding: str, level: int, payload: bytes) -> bytes:
+    levels = CompressionLevels(gzip=level) if encoding == "gzip" else CompressionLevels(br=level)
+    compressor = _Compressor(encoding, levels)
+    return compressor.compress(payload, flush=False) + compressor.finish()
+
+
+def measure(encoding: str, level: int, payload: bytes, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        compressed = compress(encoding, level, payload)
+        samples.append(time.perf_counter() - start)
+    seconds = statistics.median(samples)
+    return {
+        "size": len(compressed),
+        "ms": seconds * 1000,
+        "us_per_kib": seconds * 1_000_000 / (len(payload) / 1024),
+        "mib_per_s": len(payload) / seconds / (1024 * 1024),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--school-id", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=1000, help="Invoices in the list page")
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        statement = StatementService(session).get_school_statement(args.school_id)
+        page = InvoiceService(session).get_all(limit=args.limit, offset=0, filters=InvoiceFilter())
+        payloads = {
+            f"school statement {args.school_id}": ModelJSONResponse(statement).body,
+            f"invoice list limit={args.limit}": model_list_response(InvoiceResponse, page).body,
+        }
+
+    variants = [("gzip", level) for level in GZIP_LEVELS]
+    if brotli is not None:
+        variants += [("br", quality) for quality in BROTLI_QUALITIES]
+    else:
+        print("brotli is not installed; only gzip is measured")
+
+    for name, payload in payloads.items():
+        print(f"\n{name}: {len(payload) / 1024:.0f} KiB")
+        print(f"  {'encoding':<10} {'size KiB':>9} {'ratio':>7} {'ms':>8} {'us/KiB':>8} {'MiB/s':>8}")
+        for encoding, level in variants:
+            r = measure(encoding, level, payload, args.runs)
+            print(
+                f"  {encoding + '-' + str(level):<10} {r['size'] / 1024:>9.1f} {len(payload) / r['size']:>7.1f}"
+                f" {r['ms']:>8.2f} {r['us_per_kib']:>8.2f} {r['mib_per_s']:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
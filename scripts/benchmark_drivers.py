@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the database drivers
+
+Runs the hottest repository lookups and payment posting through:
+- psycopg2:           the default driver
+- psycopg3:           psycopg 3 with server-side prepared statements disabled
+- psycopg3+prepared:  psycopg 3 with prepare_threshold (DB_PREPARE_THRESHOLD)
+Both psycopg 3 variants post payments in pipeline mode.
+
+Each variant uses one connection, so the numbers are per-query latency
+without pool contention. Payment posting writes 0.01 payments to open
+invoices, so point it at seeded or scratch data:
+    python scripts/seed.py --extra-students 2000
+    python scripts/benchmark_drivers.py --runs 2000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.domain.enums import PaymentMethod
+from app.infrastructure.drivers import driver_options
+from app.repositories.payment_repository import PaymentRepository
+from app.repositories.student_repository import StudentRepository
+from app.schemas import PaymentCreate
+from app.services.payment_service import PaymentService
+
+
+def variants(prepare_threshold: int) -> dict:
+    url = make_url(settings.DATABASE_URL)
+    psycopg2_url = url.set(drivername="postgresql+psycopg2").render_as_string(hide_password=False)
+    psycopg_url = url.set(drivername="postgresql+psycopg").render_as_string(hide_password=False)
+    return {
+        "psycopg2": create_engine(psycopg2_url, **driver_options(psycopg2_url)),
+        "psycopg3": create_engine(psycopg_url, connect_args={"prepare_threshold": None}),
+        "psycopg3+prepared": create_engine(psycopg_url, connect_args={"prepare_threshold": prepare_threshold}),
+    }
+
+
+def load_ids(engine, limit: int) -> dict:
+    with engine.connect() as conn:
+        ids = {
+            "students": conn.execute(text("SELECT id, email FROM students ORDER BY id LIMIT :limit"), {"limit": limit}).all(),
+            "invoices": conn.execute(text("SELECT id FROM invoices ORDER BY id LIMIT :limit"), {"limit": limit}).scalars().all(),
+            "open_invoices": conn.execute(text(
+                "SELECT id FROM invoices WHERE status IN ('ISSUED', 'PARTIAL') AND amount_total >= 100 "
+                "ORDER BY id LIMIT :limit"
+            ), {"limit": limit}).scalars().all(),
+        }
+    if not all(ids.values()):
+        sys.exit("Not enough data: run scripts/seed.py --extra-students N first")
+    return ids
+
+
+def time_operation(fn, runs: int) -> dict:
+    for i in range(20):
+        fn(i)
+    samples = []
+    for i in range(runs):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    samples.sort()
+    return {
+        "mean": statistics.fmean(samples),
+        "p50": statistics.median(samples),
+        "p99": samples[max(int(len(samples) * 0.99) - 1, 0)],
+    }
+
+
+def run_variant(engine, ids: dict, runs: int) -> dict:
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    students = StudentRepository(session)
+    payments = PaymentRepository(session)
+    student_rows, invoices, open_invoices = ids["students"], ids["invoices"], ids["open_invoices"]
+
+    def reading(fn):
+        def op(i):
+            fn(i)
+            session.rollback()
+            session.expunge_all()
+        return op
+
+    def post_payment(i):
+        PaymentService(session).create(
+            open_invoices[i % len(open_invoices)],
+            PaymentCreate(amount=Decimal("0.01"), method=PaymentMethod.CASH, reference="BENCH"),
+        )
+        session.expunge_all()
+
+    operations = {
+        "get_by_id_with_school": reading(lambda i: students.get_by_id_with_school(student_rows[i % len(student_rows)].id)),
+        "get_total_paid_by_invoice": reading(lambda i: payments.get_total_paid_by_invoice(invoices[i % len(invoices)])),
+        "get_by_email": reading(lambda i: students.get_by_email(student_rows[i % len(student_rows)].email)),
+        "POST payment (4 statements)": post_payment,
+    }
+    try:
+        return {name: time_operation(fn, runs) for name, fn in operations.items()}
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=2000, help="Timed runs per operation")
+    parser.add_argument("--prepare-threshold", type=int, default=settings.DB_PREPARE_THRESHOLD)
+    args = parser.parse_args()
+
+    engines = variants(args.prepare_threshold)
+    ids = load_ids(engines["psycopg2"], limit=500)
+    results = {}
+    for name, engine in engines.items():
+        print(f"Benchmarking {name}...")
+        results[name] = run_variant(engine, ids, args.runs)
+
+    print(f"\n{args.runs} runs per operation, prepare_threshold={args.prepare_threshold}")
+    print(f"{'operation':<30} {'driver':<18} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}")
+    for operation in results["psycopg2"]:
+        for name in results:
+            r = results[name][operation]
+            print(f"{operation:<30} {name:<18} {r['mean']:>9.0f} {r['p50']:>9.0f} {r['p99']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark for response serialization
+
+For a school statement and an invoice list page, times:
+- service:  building the response (queries + models), the part both paths share
+- fastapi:  FastAPI's response_model path (dump, validate again, encode, json.dumps)
+- fast:     ModelJSONResponse / model_list_response (one pydantic-core pass)
+and reports serialization's share of the endpoint's time for each path.
+
+Statements only embed up to 100 invoices, so the list page (--limit) shows
+how serialization grows with item count. Point it at seeded data:
+    python scripts/seed.py --extra-students 2000
+    python scripts/benchmark_serialization.py --school-id 1 --limit 1000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from app.api.responses import ModelJSONResponse, model_list_response
+from app.infrastructure.database import SessionLocal
+from app.main import app
+from app.schemas import InvoiceFilter, InvoiceResponse
+from app.services.invoice_service import InvoiceService
+from app.services.statement_service import StatementService
+
+
+def route_field(path: str):
+    return next(
+        route.response_field for route in app.routes
+        if getattr(route, "path", None) == path and "GET" in route.methods
+    )
+
+
+def median_ms(fn, runs: int) -> float:
+    fn()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def fastapi_render(field, content) -> bytes:
+    serialized = asyncio.run(serialize_response(field=field, response_content=content, is_coroutine=False))
+    return JSONResponse(serialized).body
+
+
+def report(name: str, service_ms: float, fastapi_ms: float, fast_ms: float, size: int) -> None:
+    print(f"\n{name} ({size / 1024:.0f} KiB of JSON)")
+    print(f"  service                {service_ms:8.2f} ms")
+    for path, ms in (("fastapi response_model", fastapi_ms), ("fast path", fast_ms)):
+        print(f"  {path:<22} {ms:8.2f} ms   {ms / (service_ms + ms):5.1%} of the endpoint")
+    print(f"  speedup                {fastapi_ms / fast_ms:8.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--school-id", type=int, default=1)
+    parser.add_argument("--limit", type=int, default=1000, help="Invoices in the list page")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        statements = StatementService(session)
+        invoices = InvoiceService(session)
+
+        statement = statements.get_school_statement(args.school_id)
+        field = route_field("/api/v1/schools/{school_id}/statement")
+        assert fastapi_render(field, statement) == ModelJSONResponse(statement).body
+        report(
+            f"GET /schools/{args.school_id}/statement ({len(statement.invoices)} invoices)",
+            median_ms(lambda: statements.get_school_statement(args.school_id), args.runs),
+            median_ms(lambda: fastapi_render(field, statement), args.runs),
+            median_ms(lambda: ModelJSONResponse(statement).body, args.runs),
+            len(ModelJSONResponse(statement).body),
+        )
+
+        page = invoices.get_all(limit=args.limit, offset=0, filters=InvoiceFilter())
+        field = route_field("/api/v1/invoices")
+        assert fastapi_render(field, page) == model_list_response(InvoiceResponse, page).body
+        report(
+            f"GET /invoices?limit={args.limit}",
+            median_ms(lambda: invoices.get_all(limit=args.limit, offset=0, filters=InvoiceFilter()), args.runs),
+            median_ms(lambda: fastapi_render(field, page), args.runs),
+            median_ms(lambda: model_list_response(InvoiceResponse, page).body, args.runs),
+            len(model_list_response(InvoiceResponse, page).body),
+        )
+
+
+if __name__ == "__main__":
+    main()
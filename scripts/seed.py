@@ -5,8 +5,11 @@ Seed script to populate database
 Creates:
 - 3 schools (Mexico, Colombia, Ecuador - where Mattilda operates)
 - 8 students across different schools
-- 15+ invoices with varied statuses (ISSUED, PARTIAL, PAID, VOID)
+- 14 invoices with varied statuses (ISSUED, PARTIAL, PAID, VOID)
 - Multiple payments with different methods
+
+Rows are written with the repositories' create_many (multi-row INSERT ... RETURNING).
+Pass --extra-students N to add N synthetic students per school for volume testing.
 """
 
 import sys
@@ -15,264 +18,119 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import argparse
 from decimal import Decimal
 from datetime import date, timedelta
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
-from app.infrastructure.database import Base
-from tests.factories import SchoolFactory, StudentFactory, InvoiceFactory, PaymentFactory
+from app.repositories.school_repository import SchoolRepository
+from app.repositories.student_repository import StudentRepository
+from app.repositories.invoice_repository import InvoiceRepository
+from app.repositories.payment_repository import PaymentRepository
+
+
+SCHOOLS = [
+    {"name": "Instituto Tecnológico de Monterrey", "country": "MX", "currency": "MXN", "is_active": True},
+    {"name": "Universidad de Los Andes", "country": "CO", "currency": "COP", "is_active": True},
+    {"name": "Universidad San Francisco de Quito", "country": "EC", "currency": "USD", "is_active": True},
+]
+
+# (school index, first name, last name, email)
+STUDENTS = [
+    (0, "Carlos", "García Rodríguez", "carlos.garcia@tec.mx"),
+    (0, "María", "López Hernández", "maria.lopez@tec.mx"),
+    (0, "José", "Martínez Silva", "jose.martinez@tec.mx"),
+    (1, "Santiago", "Rodríguez Pérez", "s.rodriguez@uniandes.edu.co"),
+    (1, "Camila", "Gómez Castro", "c.gomez@uniandes.edu.co"),
+    (2, "Andrés", "Morales Vega", "andres.morales@usfq.edu.ec"),
+    (2, "Valentina", "Torres Ruiz", "valentina.torres@usfq.edu.ec"),
+    (2, "Diego", "Paredes Luna", "diego.paredes@usfq.edu.ec"),
+]
 
+# (student index, amount, currency, status, due in days, description, [(payment amount, method, reference)])
+INVOICES = [
+    (0, "15000.00", "MXN", "PAID", -30, "Colegiatura Semestre Enero-Junio", [("15000.00", "TRANSFER", "SPEI-001")]),
+    (1, "20000.00", "MXN", "PARTIAL", 15, "Colegiatura + Materiales", [("10000.00", "CARD", "CARD-MX-001"), ("5000.00", "TRANSFER", "SPEI-002")]),
+    (1, "8000.00", "MXN", "ISSUED", 30, "Inscripción Curso de Verano", []),
+    (2, "12000.00", "MXN", "VOID", -10, "Colegiatura (ANULADA por error)", []),
+    (2, "18000.00", "MXN", "ISSUED", 20, "Colegiatura Semestre Completo", []),
+    (3, "5000000.00", "COP", "PAID", -20, "Matrícula Pregrado", [("2500000.00", "TRANSFER", "PSE-001"), ("2500000.00", "CARD", "CARD-CO-001")]),
+    (3, "3000000.00", "COP", "PARTIAL", 10, "Curso de Inglés", [("1000000.00", "CASH", "CASH-CO-001")]),
+    (4, "4500000.00", "COP", "ISSUED", 25, "Colegiatura Semestre 2024-1", []),
+    (4, "800000.00", "COP", "ISSUED", 15, "Carnet y Seguro Estudiantil", []),
+    (5, "3500.00", "USD", "PAID", -15, "Tuition Fall Semester", [("3500.00", "TRANSFER", "WIRE-EC-001")]),
+    (6, "4000.00", "USD", "PARTIAL", 20, "Tuition + Lab Fees", [("2000.00", "CARD", "CARD-EC-001"), ("1500.00", "TRANSFER", "WIRE-EC-002")]),
+    (7, "2800.00", "USD", "ISSUED", 30, "Spring Semester Registration", []),
+    (7, "500.00", "USD", "ISSUED", 10, "Library Access Fee", []),
+    (7, "1200.00", "USD", "VOID", -5, "Cancelled Course", []),
+]
 
-def seed_database():    
+
+def seed_database(extra_students: int = 0):
     engine = create_engine(settings.DATABASE_URL)
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     session = SessionLocal()
     
-    for factory in [SchoolFactory, StudentFactory, InvoiceFactory, PaymentFactory]:
-        factory._meta.sqlalchemy_session = session
-        factory._meta.sqlalchemy_session_persistence = "flush"
+    school_repo = SchoolRepository(session)
+    student_repo = StudentRepository(session)
+    invoice_repo = InvoiceRepository(session)
+    payment_repo = PaymentRepository(session)
     
     try:
         print("Starting database seed...")
         print("Creating schools...")
         
-        school_mx = SchoolFactory(
-            name="Instituto Tecnológico de Monterrey",
-            country="MX",
-            currency="MXN",
-            is_active=True
-        )
-        
-        school_co = SchoolFactory(
-            name="Universidad de Los Andes",
-            country="CO",
-            currency="COP",
-            is_active=True
-        )
-        
-        school_ec = SchoolFactory(
-            name="Universidad San Francisco de Quito",
-            country="EC",
-            currency="USD",
-            is_active=True
-        )
-        
-        session.flush()
-        print(f"   ✓ {school_mx.name} (MX - MXN)")
-        print(f"   ✓ {school_co.name} (CO - COP)")
-        print(f"   ✓ {school_ec.name} (EC - USD)")
+        schools = school_repo.create_many(SCHOOLS)
+        for school in schools:
+            print(f"   ✓ {school.name} ({school.country} - {school.currency})")
 
         print("\n👥 Creating students...")
         
-        student_mx1 = StudentFactory(
-            school=school_mx,
-            first_name="Carlos",
-            last_name="García Rodríguez",
-            email="carlos.garcia@tec.mx"
-        )
-        student_mx2 = StudentFactory(
-            school=school_mx,
-            first_name="María",
-            last_name="López Hernández",
-            email="maria.lopez@tec.mx"
-        )
-        student_mx3 = StudentFactory(
-            school=school_mx,
-            first_name="José",
-            last_name="Martínez Silva",
-            email="jose.martinez@tec.mx"
-        )
-        
-        student_co1 = StudentFactory(
-            school=school_co,
-            first_name="Santiago",
-            last_name="Rodríguez Pérez",
-            email="s.rodriguez@uniandes.edu.co"
-        )
-        student_co2 = StudentFactory(
-            school=school_co,
-            first_name="Camila",
-            last_name="Gómez Castro",
-            email="c.gomez@uniandes.edu.co"
-        )
-        
-        student_ec1 = StudentFactory(
-            school=school_ec,
-            first_name="Andrés",
-            last_name="Morales Vega",
-            email="andres.morales@usfq.edu.ec"
-        )
-        student_ec2 = StudentFactory(
-            school=school_ec,
-            first_name="Valentina",
-            last_name="Torres Ruiz",
-            email="valentina.torres@usfq.edu.ec"
-        )
-        student_ec3 = StudentFactory(
-            school=school_ec,
-            first_name="Diego",
-            last_name="Paredes Luna",
-            email="diego.paredes@usfq.edu.ec"
-        )
-        
-        session.flush()
-        print("f8 students created across 3 schools")
+        students = student_repo.create_many([
+            {"school_id": schools[school].id, "first_name": first_name, "last_name": last_name, "email": email}
+            for school, first_name, last_name, email in STUDENTS
+        ])
+        print(f"   ✓ {len(students)} students created across {len(schools)} schools")
         print("Creating invoices and payments...")
         
-        inv_mx1 = InvoiceFactory(
-            student=student_mx1,
-            amount_total=Decimal("15000.00"),
-            currency="MXN",
-            status="PAID",
-            due_date=date.today() - timedelta(days=30),
-            description="Colegiatura Semestre Enero-Junio"
-        )
-        PaymentFactory(invoice=inv_mx1, amount=Decimal("15000.00"), method="TRANSFER", reference="SPEI-001")
-        
-        inv_mx2 = InvoiceFactory(
-            student=student_mx2,
-            amount_total=Decimal("20000.00"),
-            currency="MXN",
-            status="PARTIAL",
-            due_date=date.today() + timedelta(days=15),
-            description="Colegiatura + Materiales"
-        )
-        PaymentFactory(invoice=inv_mx2, amount=Decimal("10000.00"), method="CARD", reference="CARD-MX-001")
-        PaymentFactory(invoice=inv_mx2, amount=Decimal("5000.00"), method="TRANSFER", reference="SPEI-002")
-        
-        inv_mx3 = InvoiceFactory(
-            student=student_mx2,
-            amount_total=Decimal("8000.00"),
-            currency="MXN",
-            status="ISSUED",
-            due_date=date.today() + timedelta(days=30),
-            description="Inscripción Curso de Verano"
-        )
-        
-        inv_mx4 = InvoiceFactory(
-            student=student_mx3,
-            amount_total=Decimal("12000.00"),
-            currency="MXN",
-            status="VOID",
-            due_date=date.today() - timedelta(days=10),
-            description="Colegiatura (ANULADA por error)"
-        )
-        
-        inv_mx5 = InvoiceFactory(
-            student=student_mx3,
-            amount_total=Decimal("18000.00"),
-            currency="MXN",
-            status="ISSUED",
-            due_date=date.today() + timedelta(days=20),
-            description="Colegiatura Semestre Completo"
-        )
-        
-        inv_co1 = InvoiceFactory(
-            student=student_co1,
-            amount_total=Decimal("5000000.00"),
-            currency="COP",
-            status="PAID",
-            due_date=date.today() - timedelta(days=20),
-            description="Matrícula Pregrado"
-        )
-        PaymentFactory(invoice=inv_co1, amount=Decimal("2500000.00"), method="TRANSFER", reference="PSE-001")
-        PaymentFactory(invoice=inv_co1, amount=Decimal("2500000.00"), method="CARD", reference="CARD-CO-001")
-        
-        inv_co2 = InvoiceFactory(
-            student=student_co1,
-            amount_total=Decimal("3000000.00"),
-            currency="COP",
-            status="PARTIAL",
-            due_date=date.today() + timedelta(days=10),
-            description="Curso de Inglés"
-        )
-        PaymentFactory(invoice=inv_co2, amount=Decimal("1000000.00"), method="CASH", reference="CASH-CO-001")
-        
-        inv_co3 = InvoiceFactory(
-            student=student_co2,
-            amount_total=Decimal("4500000.00"),
-            currency="COP",
-            status="ISSUED",
-            due_date=date.today() + timedelta(days=25),
-            description="Colegiatura Semestre 2024-1"
-        )
-        
-        inv_co4 = InvoiceFactory(
-            student=student_co2,
-            amount_total=Decimal("800000.00"),
-            currency="COP",
-            status="ISSUED",
-            due_date=date.today() + timedelta(days=15),
-            description="Carnet y Seguro Estudiantil"
-        )
-        
-        inv_ec1 = InvoiceFactory(
-            student=student_ec1,
-            amount_total=Decimal("3500.00"),
-            currency="USD",
-            status="PAID",
-            due_date=date.today() - timedelta(days=15),
-            description="Tuition Fall Semester"
-        )
-        PaymentFactory(invoice=inv_ec1, amount=Decimal("3500.00"), method="TRANSFER", reference="WIRE-EC-001")
-        
-        inv_ec2 = InvoiceFactory(
-            student=student_ec2,
-            amount_total=Decimal("4000.00"),
-            currency="USD",
-            status="PARTIAL",
-            due_date=date.today() + timedelta(days=20),
-            description="Tuition + Lab Fees"
-        )
-        PaymentFactory(invoice=inv_ec2, amount=Decimal("2000.00"), method="CARD", reference="CARD-EC-001")
-        PaymentFactory(invoice=inv_ec2, amount=Decimal("1500.00"), method="TRANSFER", reference="WIRE-EC-002")
-        
-        inv_ec3 = InvoiceFactory(
-            student=student_ec3,
-            amount_total=Decimal("2800.00"),
-            currency="USD",
-            status="ISSUED",
-            due_date=date.today() + timedelta(days=30),
-            description="Spring Semester Registration"
-        )
-        
-        inv_ec4 = InvoiceFactory(
-            student=student_ec3,
-            amount_total=Decimal("500.00"),
-            currency="USD",
-            status="ISSUED",
-            due_date=date.today() + timedelta(days=10),
-            description="Library Access Fee"
-        )
-        
-        inv_ec5 = InvoiceFactory(
-            student=student_ec3,
-            amount_total=Decimal("1200.00"),
-            currency="USD",
-            status="VOID",
-            due_date=date.today() - timedelta(days=5),
-            description="Cancelled Course"
-        )
+        today = date.today()
+        invoices = invoice_repo.create_many([
+            {
+                "student_id": students[student].id,
+                "amount_total": Decimal(amount),
+                "currency": currency,
+                "status": status,
+                "due_date": today + timedelta(days=due_in_days),
+                "description": description,
+            }
+            for student, amount, currency, status, due_in_days, description, _ in INVOICES
+        ])
+        payments = payment_repo.create_many([
+            {"invoice_id": invoice.id, "amount": Decimal(amount), "method": method, "reference": reference}
+            for invoice, (*_, invoice_payments) in zip(invoices, INVOICES)
+            for amount, method, reference in invoice_payments
+        ])
+        
+        if extra_students:
+            seed_extra_students(student_repo, invoice_repo, schools, extra_students)
         
         session.commit()
         
-        print("   ✓ 16 invoices created")
-        print("   ✓ 12 payments created")
+        print(f"   ✓ {len(invoices)} invoices created")
+        print(f"   ✓ {len(payments)} payments created")
         
         print("\n" + "="*50)
         print("✅ SEED COMPLETED SUCCESSFULLY!")
         print("="*50)
         print("\nSummary:")
         print(f"   • 3 schools (MX, CO, EC)")
-        print(f"   • 8 students")
-        print(f"   • 16 invoices:")
-        print(f"      - 4 PAID")
-        print(f"      - 4 PARTIAL")
-        print(f"      - 6 ISSUED")
-        print(f"      - 2 VOID")
-        print(f"   • 12 payments")
+        print(f"   • {len(students)} students (+{extra_students * len(schools)} synthetic)")
+        print(f"   • {len(invoices)} invoices:")
+        for status in ("PAID", "PARTIAL", "ISSUED", "VOID"):
+            print(f"      - {sum(1 for invoice in invoices if invoice.status == status)} {status}")
+        print(f"   • {len(payments)} payments")
         print("\nYou can now test the API:")
         print("   curl http://localhost:8000/api/v1/schools")
         print("   curl http://localhost:8000/api/v1/students")
@@ -288,6 +146,40 @@ def seed_database():
         session.close()
 
 
+def seed_extra_students(student_repo, invoice_repo, schools, per_school: int) -> None:
+    print(f"Creating {per_school} synthetic students (with one open invoice each) per school...")
+    for school in schools:
+        students = student_repo.create_many([
+            {
+                "school_id": school.id,
+                "first_name": "Student",
+                "last_name": f"{school.country}-{i:06d}",
+                "email": f"student{i}.{school.id}@seed.example.com",
+            }
+            for i in range(per_school)
+        ])
+        invoice_repo.create_many([
+            {
+                "student_id": student.id,
+                "amount_total": Decimal("1000.00"),
+                "currency": school.currency,
+                "status": "ISSUED",
+                "due_date": date.today() + timedelta(days=30),
+                "description": "Colegiatura mensual",
+            }
+            for student in students
+        ])
+        print(f"   ✓ {school.name}: {len(students)} students")
+
+
 if __name__ == "__main__":
-    seed_database()
+    parser = argparse.ArgumentParser(description="Populate the database with sample data")
+    parser.add_argument(
+        "--extra-students",
+        type=int,
+        default=0,
+        help="Synthetic students (each with one open invoice) to add per school",
+    )
+    args = parser.parse_args()
+    seed_database(extra_students=args.extra_students)
 
@@ -1,8 +1,12 @@
+from contextlib import contextmanager
+
 import pytest
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from app.infrastructure.database import Base
+from app.infrastructure.instrumentation import instrument_engine, track_queries
 from tests.factories import SchoolFactory, StudentFactory, InvoiceFactory, PaymentFactory
 
 
@@ -11,6 +15,7 @@ def db_session():
     TEST_DATABASE_URL = "postgresql://mattilda:secret@db:5432/mattilda_billing_test"
     
     engine = create_engine(TEST_DATABASE_URL)
+    instrument_engine(engine)
     
     with engine.connect() as conn:
         conn.execute(text("DROP SCHEMA public CASCADE"))
@@ -18,7 +23,7 @@ def db_session():
         conn.commit()
     
     Base.metadata.create_all(engine)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
     session = SessionLocal()
     
     SchoolFactory._meta.sqlalchemy_session = session
@@ -34,6 +39,55 @@ def db_session():
         engine.dispose()
 
 
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_session(db_session: Session):
+    """AsyncSession (asyncpg) on the test database; seed data through db_session and commit."""
+    engine = create_async_engine("postgresql+asyncpg://mattilda:secret@db:5432/mattilda_billing_test")
+    session = AsyncSession(engine, autoflush=False, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        await session.close()
+        await engine.dispose()
+
+
+@pytest.fixture
+def query_counter(db_session: Session):
+    """SQL statements executed on the test database while the test runs."""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db_session.bind, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def max_queries(db_session: Session):
+    """
+    Query budget for a block, counted by the same engine hooks as production:
+
+        with max_queries(2):
+            get_student_statement(student_id, service=StatementService(db_session))
+    """
+    @contextmanager
+    def budget(limit: int):
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= limit, f"Expected at most {limit} queries, ran {stats.count}"
+    
+    return budget
+
+
 @pytest.fixture
 def sample_school(db_session: Session):
     return SchoolFactory(
@@ -0,0 +1,128 @@
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+import app.main
+from app.api.v1 import payments_async, statements_async
+from app.config import settings
+from app.domain.enums import InvoiceStatus
+from app.exceptions import AppException, app_exception_handler
+from app.infrastructure import async_database, database
+from app.infrastructure.pool import ConnectionGate
+from app.infrastructure.replicas import READ_AFTER_HEADER, Replica, ReplicaRouter, parse_lsn
+from app.infrastructure.routes import STATEMENTS
+from app.infrastructure.timeouts import TimeoutPolicy, Timeouts
+from app.repositories.invoice_repository import InvoiceRepository
+from tests.factories import SchoolFactory, StudentFactory, InvoiceFactory, PaymentFactory
+
+TEST_DATABASE_URL = "postgresql://mattilda:secret@db:5432/mattilda_billing_test"
+TEST_ASYNC_DATABASE_URL = "postgresql+asyncpg://mattilda:secret@db:5432/mattilda_billing_test"
+
+
+def _async_app() -> FastAPI:
+    """The DB_ASYNC routes with the main app's error handling and read-your-writes middleware."""
+    api = FastAPI()
+    api.add_exception_handler(AppException, app_exception_handler)
+    api.middleware("http")(app.main.read_your_writes)
+    api.include_router(payments_async.router, prefix=settings.API_V1_PREFIX)
+    api.include_router(statements_async.router, prefix=settings.API_V1_PREFIX)
+    return api
+
+
+class TestAsyncApiIntegration:
+    @pytest.fixture
+    def gate(self, monkeypatch):
+        gate = ConnectionGate("test-async-api", capacity=2, wait_budget=1)
+        monkeypatch.setattr(async_database, "connection_gate", gate)
+        return gate
+
+    @pytest.fixture
+    def client(self, db_session: Session, gate, monkeypatch):
+        # TestClient runs the app on its own event loop; unpooled connections stay off other loops
+        engine = create_async_engine(TEST_ASYNC_DATABASE_URL, poolclass=NullPool)
+        monkeypatch.setattr(
+            async_database,
+            "AsyncSessionLocal",
+            async_sessionmaker(autoflush=False, expire_on_commit=False, bind=engine),
+        )
+        replica_engine = create_engine(TEST_DATABASE_URL)
+        monkeypatch.setattr(database, "replica_router", ReplicaRouter([Replica("r", replica_engine)], check_interval=60))
+        try:
+            yield TestClient(_async_app())
+        finally:
+            replica_engine.dispose()
+
+    def test_payment_post(self, client, db_session: Session, gate):
+        invoice = InvoiceFactory(
+            student=StudentFactory(school=SchoolFactory()),
+            amount_total=Decimal("1000.00"),
+            status=InvoiceStatus.ISSUED.value,
+        )
+        db_session.commit()
+        
+        response = client.post(
+            f"/api/v1/invoices/{invoice.id}/payments",
+            json={"amount": "400.00", "method": "CARD"},
+            headers={"X-API-Key": settings.API_KEY},
+        )
+        
+        assert response.status_code == 201
+        assert response.json()["invoice_id"] == invoice.id
+        assert parse_lsn(response.headers[READ_AFTER_HEADER].split(":")[0]) > 0
+        assert gate.in_use == 0
+        db_session.expire_all()
+        assert InvoiceRepository(db_session).get_by_id(invoice.id).status == InvoiceStatus.PARTIAL.value
+
+    def test_statement_get(self, client, db_session: Session, gate):
+        student = StudentFactory(school=SchoolFactory(currency="MXN"))
+        invoice = InvoiceFactory(student=student, amount_total=Decimal("1000.00"), status=InvoiceStatus.PARTIAL.value)
+        PaymentFactory(invoice=invoice, amount=Decimal("300.00"))
+        db_session.commit()
+        
+        response = client.get(f"/api/v1/students/{student.id}/statement")
+        
+        assert response.status_code == 200
+        assert Decimal(response.json()["totals"]["pending"]) == Decimal("700.00")
+        assert READ_AFTER_HEADER not in response.headers
+        assert gate.in_use == 0
+
+    def test_domain_errors_keep_their_status(self, client, gate):
+        response = client.get("/api/v1/schools/99999/statement")
+        
+        assert response.status_code == 404
+        assert gate.in_use == 0
+
+    def test_statement_timeout_is_a_504(self, client, db_session: Session, gate, monkeypatch):
+        student = StudentFactory(school=SchoolFactory())
+        InvoiceFactory(student=student)
+        db_session.commit()
+        monkeypatch.setattr(
+            async_database,
+            "timeout_policy",
+            TimeoutPolicy({STATEMENTS: Timeouts(statement_ms=100, lock_ms=0)}),
+        )
+        # The statement's reads wait behind the lock until statement_timeout cancels them
+        db_session.execute(text("LOCK TABLE invoices IN ACCESS EXCLUSIVE MODE"))
+        
+        try:
+            response = client.get(f"/api/v1/students/{student.id}/statement")
+        finally:
+            db_session.rollback()
+        
+        assert response.status_code == 504
+        assert gate.in_use == 0
+
+    def test_full_gate_is_a_503(self, client, db_session: Session, gate):
+        gate.in_use = gate.capacity
+        gate.hold_seconds = 10
+        
+        response = client.get("/api/v1/students/1/statement")
+        
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
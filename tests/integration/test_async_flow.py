@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.domain.enums import InvoiceStatus
+from app.exceptions import AppException
+from app.repositories.invoice_repository import InvoiceRepository
+from app.schemas import PaymentCreate
+from app.services.payment_service import AsyncPaymentService
+from app.services.statement_service import AsyncStatementService
+from tests.factories import SchoolFactory, StudentFactory, InvoiceFactory, PaymentFactory
+
+
+pytestmark = pytest.mark.anyio
+
+
+class TestAsyncFlowIntegration:
+    async def test_student_statement(self, db_session: Session, async_session: AsyncSession):
+        student = StudentFactory(school=SchoolFactory(currency="MXN"))
+        invoice = InvoiceFactory(student=student, amount_total=Decimal("1000.00"), status=InvoiceStatus.PARTIAL.value)
+        PaymentFactory(invoice=invoice, amount=Decimal("300.00"))
+        InvoiceFactory(student=student, amount_total=Decimal("500.00"), status=InvoiceStatus.VOID.value)
+        db_session.commit()
+        
+        statement = await AsyncStatementService(async_session).get_student_statement(student.id)
+        
+        assert statement.currency == "MXN"
+        assert statement.totals.invoiced == Decimal("1000.00")
+        assert statement.totals.paid == Decimal("300.00")
+        assert statement.totals.pending == Decimal("700.00")
+
+    async def test_payment_updates_invoice_status(self, db_session: Session, async_session: AsyncSession):
+        invoice = InvoiceFactory(
+            student=StudentFactory(school=SchoolFactory()),
+            amount_total=Decimal("1000.00"),
+            status=InvoiceStatus.ISSUED.value,
+        )
+        db_session.commit()
+        service = AsyncPaymentService(async_session)
+        
+        payment = await service.create(invoice.id, PaymentCreate(amount=Decimal("1000.00"), method="CARD"))
+        
+        assert payment.id is not None
+        assert [p.id for p in await service.get_by_invoice(invoice.id)] == [payment.id]
+        db_session.expire_all()
+        assert InvoiceRepository(db_session).get_by_id(invoice.id).status == InvoiceStatus.PAID.value
+
+    async def test_domain_errors_propagate(self, async_session: AsyncSession):
+        with pytest.raises(AppException) as exc_info:
+            await AsyncStatementService(async_session).get_school_statement(99999)
+        
+        assert exc_info.value.status_code == 404
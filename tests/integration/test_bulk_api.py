@@ -0,0 +1,75 @@
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import app.main
+from app.config import settings
+from app.domain.enums import InvoiceStatus
+from app.infrastructure import database
+from app.repositories.invoice_repository import InvoiceRepository
+from tests.factories import SchoolFactory, StudentFactory, InvoiceFactory
+
+
+class TestBulkApiIntegration:
+    @pytest.fixture
+    def client(self, db_session: Session, monkeypatch):
+        monkeypatch.setattr(database, "engine", db_session.get_bind())
+        monkeypatch.setattr(database, "replica_router", None)
+        return TestClient(app.main.app, headers={"X-API-Key": settings.API_KEY})
+
+    @pytest.fixture
+    def school_invoices(self, db_session: Session):
+        school = SchoolFactory()
+        student = StudentFactory(school=school)
+        invoices = {
+            status: InvoiceFactory(student=student, status=status.value)
+            for status in (InvoiceStatus.ISSUED, InvoiceStatus.PARTIAL, InvoiceStatus.PAID)
+        }
+        other_school = InvoiceFactory(student=StudentFactory(school=SchoolFactory()), status=InvoiceStatus.ISSUED.value)
+        db_session.commit()
+        return school, invoices, other_school
+
+    def _statuses(self, db_session: Session) -> dict:
+        db_session.expire_all()
+        return {invoice.id: invoice.status for invoice in InvoiceRepository(db_session).get_all()}
+
+    def test_bulk_void_with_filter(self, client, db_session: Session, school_invoices):
+        school, invoices, other_school = school_invoices
+        
+        response = client.post("/api/v1/invoices:bulk-void", json={"filter": {"school_id": school.id, "open_only": True}})
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["succeeded"], body["failed"]) == (2, 0)
+        assert sorted(result["id"] for result in body["results"]) == [
+            invoices[InvoiceStatus.ISSUED].id,
+            invoices[InvoiceStatus.PARTIAL].id,
+        ]
+        assert self._statuses(db_session) == {
+            invoices[InvoiceStatus.ISSUED].id: InvoiceStatus.VOID.value,
+            invoices[InvoiceStatus.PARTIAL].id: InvoiceStatus.VOID.value,
+            invoices[InvoiceStatus.PAID].id: InvoiceStatus.PAID.value,
+            other_school.id: InvoiceStatus.ISSUED.value,
+        }
+
+    def test_bulk_update_with_filter(self, client, db_session: Session, school_invoices):
+        school, invoices, other_school = school_invoices
+        
+        response = client.post(
+            "/api/v1/invoices:bulk-update",
+            json={"filter": {"school_id": school.id}, "due_date": "2030-01-31"},
+        )
+        
+        assert response.status_code == 200
+        results = {result["id"]: result for result in response.json()["results"]}
+        assert results[invoices[InvoiceStatus.PAID].id]["status_code"] == 400
+        assert [invoice_id for invoice_id, result in results.items() if result["success"]] == [
+            invoices[InvoiceStatus.ISSUED].id,
+            invoices[InvoiceStatus.PARTIAL].id,
+        ]
+        db_session.expire_all()
+        repo = InvoiceRepository(db_session)
+        assert repo.get_by_id(invoices[InvoiceStatus.ISSUED].id).due_date == date(2030, 1, 31)
+        assert repo.get_by_id(other_school.id).due_date != date(2030, 1, 31)
@@ -0,0 +1,96 @@
+from decimal import Decimal
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from starlette.responses import Response
+
+from app.api.v1.invoices import list_invoices
+from app.api.v1.schools import list_schools
+from app.api.v1.statements import get_school_statement, get_student_statement
+from app.api.v1.students import list_students
+from app.domain.enums import InvoiceStatus
+from app.schemas import InvoiceFilter
+from app.schemas.invoice import InvoiceBalanceResponse
+from app.schemas.school import SchoolResponse
+from app.schemas.student import StudentResponse
+from app.services.invoice_service import InvoiceService
+from app.services.school_service import SchoolService
+from app.services.statement_service import StatementService
+from app.services.student_service import StudentService
+from tests.factories import SchoolFactory, StudentFactory, InvoiceFactory, PaymentFactory
+
+
+def _load_school(db_session: Session, students: int = 5):
+    """A school with several students, each with paid, partial and open invoices."""
+    school = SchoolFactory()
+    student_ids = []
+    for _ in range(students):
+        student = StudentFactory(school=school)
+        student_ids.append(student.id)
+        InvoiceFactory(student=student, amount_total=Decimal("500.00"), status=InvoiceStatus.ISSUED.value)
+        partial = InvoiceFactory(student=student, amount_total=Decimal("800.00"), status=InvoiceStatus.PARTIAL.value)
+        PaymentFactory(invoice=partial, amount=Decimal("300.00"))
+    db_session.commit()
+    school_id = school.id
+    db_session.expunge_all()
+    return school_id, student_ids
+
+
+class TestQueryBudgets:
+    """
+    Upper bounds on the queries each read endpoint runs, independent of how
+    many rows it returns: a lazy load per row (N+1) blows the budget.
+    List endpoints spend up to two queries on X-Total-Count (estimate, then
+    exact count on small tables) before fetching the page.
+    """
+
+    def test_student_statement(self, db_session: Session, max_queries):
+        _, student_ids = _load_school(db_session)
+        
+        with max_queries(2):
+            get_student_statement(student_ids[0], service=StatementService(db_session))
+
+    def test_school_statement(self, db_session: Session, max_queries):
+        school_id, _ = _load_school(db_session)
+        
+        with max_queries(3):
+            get_school_statement(school_id, service=StatementService(db_session))
+
+    def test_list_invoices_with_balance(self, db_session: Session, max_queries):
+        _load_school(db_session)
+        
+        with max_queries(3):
+            response = list_invoices(
+                Response(), limit=100, offset=0, include="balance",
+                filters=InvoiceFilter(), service=InvoiceService(db_session),
+            )
+        
+        invoices = TypeAdapter(List[InvoiceBalanceResponse]).validate_json(response.body)
+        
+        assert len(invoices) == 10
+
+    def test_list_students(self, db_session: Session, max_queries):
+        school_id, _ = _load_school(db_session)
+        
+        with max_queries(3):
+            response = list_students(
+                Response(), limit=100, offset=0, school_id=school_id, service=StudentService(db_session)
+            )
+        
+        students = TypeAdapter(List[StudentResponse]).validate_json(response.body)
+        
+        assert len(students) == 5
+
+    def test_list_schools(self, db_session: Session, max_queries):
+        _load_school(db_session)
+        _load_school(db_session)
+        
+        with max_queries(3):
+            response = list_schools(
+                Response(), limit=100, offset=0, is_active=None, service=SchoolService(db_session)
+            )
+        
+        schools = TypeAdapter(List[SchoolResponse]).validate_json(response.body)
+        
+        assert len(schools) == 2
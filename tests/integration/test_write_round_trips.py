@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.domain.enums import InvoiceStatus
+from app.domain.models import Invoice
+from app.infrastructure.drivers import driver_options
+from app.schemas import SchoolCreate, InvoiceUpdate, PaymentCreate
+from app.schemas.school import SchoolResponse
+from app.schemas.invoice import InvoiceResponse
+from app.schemas.payment import PaymentResponse
+from app.services.school_service import SchoolService
+from app.services.invoice_service import InvoiceService
+from app.services.payment_service import PaymentService
+from tests.factories import SchoolFactory, StudentFactory, InvoiceFactory
+
+
+def _verbs(statements: list) -> list:
+    return [statement.split()[0] for statement in statements]
+
+
+class TestWriteRoundTrips:
+    """Write paths read generated values from the INSERT/UPDATE itself: no refresh SELECT."""
+
+    def test_create_school(self, db_session: Session, query_counter):
+        school = SchoolService(db_session).create(SchoolCreate(name="Round Trip", country="MX", currency="MXN"))
+        SchoolResponse.model_validate(school)
+        
+        assert _verbs(query_counter) == ["SELECT", "INSERT"]
+
+    def test_update_invoice(self, db_session: Session, query_counter):
+        invoice = InvoiceFactory(student=StudentFactory(school=SchoolFactory()))
+        db_session.commit()
+        db_session.expunge_all()
+        query_counter.clear()
+        
+        updated = InvoiceService(db_session).update(
+            invoice.id, InvoiceUpdate(due_date=date.today() + timedelta(days=45))
+        )
+        InvoiceResponse.model_validate(updated)
+        
+        assert _verbs(query_counter) == ["SELECT", "UPDATE"]
+
+    def test_create_payment(self, db_session: Session, query_counter):
+        invoice = InvoiceFactory(
+            student=StudentFactory(school=SchoolFactory()),
+            amount_total=Decimal("1000.00"),
+            status=InvoiceStatus.ISSUED.value,
+        )
+        db_session.commit()
+        db_session.expunge_all()
+        query_counter.clear()
+        
+        payment = PaymentService(db_session).create(invoice.id, PaymentCreate(amount=Decimal("400.00"), method="CARD"))
+        PaymentResponse.model_validate(payment)
+        
+        assert _verbs(query_counter) == ["SELECT", "SELECT", "UPDATE", "INSERT"]
+
+
+@pytest.fixture
+def psycopg_session(db_session: Session):
+    """Session on the test database through psycopg 3, preparing every statement."""
+    url = "postgresql+psycopg://mattilda:secret@db:5432/mattilda_billing_test"
+    engine = create_engine(url, **{**driver_options(url), "connect_args": {"prepare_threshold": 0}})
+    session = Session(engine, autoflush=False, expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+class TestPsycopgPipeline:
+    def test_create_payment_in_pipeline(self, db_session: Session, psycopg_session: Session):
+        invoice = InvoiceFactory(
+            student=StudentFactory(school=SchoolFactory()),
+            amount_total=Decimal("1000.00"),
+            status=InvoiceStatus.ISSUED.value,
+        )
+        db_session.commit()
+        
+        service = PaymentService(psycopg_session)
+        first = service.create(invoice.id, PaymentCreate(amount=Decimal("400.00"), method="CARD"))
+        second = service.create(invoice.id, PaymentCreate(amount=Decimal("600.00"), method="CASH"))
+        
+        assert second.id > first.id
+        PaymentResponse.model_validate(second)
+        db_session.expire_all()
+        assert db_session.get(Invoice, invoice.id).status == InvoiceStatus.PAID.value
+        assert psycopg_session.get(Invoice, invoice.id).status == InvoiceStatus.PAID.value
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi._compat import ModelField
+from pydantic import TypeAdapter
+from pydantic.fields import FieldInfo
+
+from app.api.responses import ModelJSONResponse, model_list_response
+from app.domain.enums import InvoiceStatus
+from app.schemas.invoice import InvoiceResponse
+from app.schemas.school import SchoolResponse
+from app.schemas.statement import InvoiceStatementDetail, SchoolStatementResponse, StatementTotals
+
+
+def fastapi_body(response_model, content) -> bytes:
+    """What FastAPI renders for a route with response_model returning content."""
+    field = ModelField(name="Response", field_info=FieldInfo(annotation=response_model), mode="serialization")
+    return JSONResponse(asyncio.run(serialize_response(field=field, response_content=content))).body
+
+
+def school_statement() -> SchoolStatementResponse:
+    now = datetime(2026, 10, 19, 12, 30, 15, 123456)
+    detail = InvoiceStatementDetail(
+        id=1,
+        student_id=2,
+        amount_total=Decimal("1000.00"),
+        paid=Decimal("250.50"),
+        pending=Decimal("749.50"),
+        currency="MXN",
+        status=InvoiceStatus.PARTIAL,
+        issued_at=now,
+        due_date=date(2026, 11, 1),
+        description="Colegiatura – octubre",
+        created_at=now,
+        updated_at=now,
+    )
+    return SchoolStatementResponse(
+        school=SchoolResponse(id=1, name="Test School", country="MX", currency="MXN", is_active=True, created_at=now, updated_at=now),
+        currency="MXN",
+        student_count=1,
+        totals=StatementTotals(invoiced=Decimal("1000.00"), paid=Decimal("250.50"), pending=Decimal("749.50")),
+        invoices=[detail, detail],
+    )
+
+
+class TestModelJSONResponse:
+    def test_matches_response_model_output(self):
+        statement = school_statement()
+        
+        response = ModelJSONResponse(statement)
+        
+        assert response.body == fastapi_body(SchoolStatementResponse, statement)
+        assert response.media_type == "application/json"
+        assert b'"paid":"250.50"' in response.body
+
+    def test_list_from_orm_objects_matches_response_model_output(self, sample_invoice):
+        response = model_list_response(InvoiceResponse, [sample_invoice])
+        
+        assert response.body == fastapi_body(List[InvoiceResponse], [sample_invoice])
+        assert b'"amount_total":"1000.00"' in response.body
+
+    def test_list_passes_model_instances_through(self):
+        statement = school_statement()
+        
+        response = model_list_response(InvoiceStatementDetail, statement.invoices)
+        
+        assert response.body == TypeAdapter(List[InvoiceStatementDetail]).dump_json(statement.invoices)
+
+    def test_list_keeps_headers(self):
+        response = model_list_response(InvoiceResponse, [], headers={"X-Total-Count": "0"})
+        
+        assert response.body == b"[]"
+        assert response.headers["x-total-count"] == "0"
+        assert response.headers["content-length"] == "2"
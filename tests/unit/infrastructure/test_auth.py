@@ -1,38 +1,215 @@
 import pytest
 from fastapi import HTTPException
+from sqlalchemy.orm import sessionmaker
 
-from app.infrastructure.auth import verify_api_key
+from app.config import settings
+from app.domain.enums import ApiKeyScope
+from app.domain.models import ApiKey
+from app.infrastructure import auth
+from app.infrastructure.auth import (
+    BOOTSTRAP_PRINCIPAL,
+    ApiKeyPrincipal,
+    ApiKeyStore,
+    authenticate,
+    authorize_school,
+    generate_api_key,
+    hash_api_key,
+    require_scope,
+)
+from app.infrastructure.cache import TTLCache
 
 
 class TestAPIKeyAuth:
-    def test_verify_api_key_with_valid_key(self, monkeypatch):
+    def test_authenticate_with_valid_key(self, monkeypatch):
         monkeypatch.setenv("API_KEY", "test-secret-key")
         from app.config import settings
         settings.API_KEY = "test-secret-key"
         
-        result = verify_api_key("test-secret-key")
+        result = authenticate("test-secret-key")
         
-        assert result == "test-secret-key"
+        assert result == BOOTSTRAP_PRINCIPAL
 
-    def test_verify_api_key_with_invalid_key(self, monkeypatch):
+    def test_authenticate_with_invalid_key(self, monkeypatch):
         monkeypatch.setenv("API_KEY", "test-secret-key")
         from app.config import settings
         settings.API_KEY = "test-secret-key"
         
         with pytest.raises(HTTPException) as exc_info:
-            verify_api_key("wrong-key")
+            authenticate("wrong-key")
         
         assert exc_info.value.status_code == 403
         assert "Invalid API Key" in exc_info.value.detail
 
-    def test_verify_api_key_with_missing_key(self, monkeypatch):
+    def test_authenticate_with_missing_key(self, monkeypatch):
         monkeypatch.setenv("API_KEY", "test-secret-key")
         from app.config import settings
         settings.API_KEY = "test-secret-key"
         
         with pytest.raises(HTTPException) as exc_info:
-            verify_api_key(None)
+            authenticate(None)
         
         assert exc_info.value.status_code == 401
         assert "Missing API Key" in exc_info.value.detail
 
+
+
+@pytest.fixture
+def key_store(db_session):
+    return ApiKeyStore(sessionmaker(bind=db_session.bind), TTLCache(ttl_seconds=60))
+
+
+@pytest.fixture
+def issue_key(db_session):
+    def issue(scopes, school_id=None, is_active=True):
+        api_key, prefix, key_hash = generate_api_key()
+        db_session.add(ApiKey(
+            name="test-key",
+            prefix=prefix,
+            key_hash=key_hash,
+            scopes=[scope.value for scope in scopes],
+            school_id=school_id,
+            is_active=is_active,
+        ))
+        db_session.commit()
+        return api_key
+    
+    return issue
+
+
+class TestApiKeyStore:
+    def test_authenticates_stored_key(self, key_store, issue_key, sample_school):
+        api_key = issue_key([ApiKeyScope.PAYMENTS_WRITE], school_id=sample_school.id)
+        
+        principal = key_store.authenticate(api_key)
+        
+        assert principal == ApiKeyPrincipal(
+            name="test-key",
+            scopes=frozenset({"payments:write"}),
+            school_id=sample_school.id,
+        )
+
+    def test_only_hash_is_stored(self, db_session, issue_key):
+        api_key = issue_key([ApiKeyScope.ADMIN])
+        
+        stored = db_session.query(ApiKey).one()
+        
+        assert stored.key_hash == hash_api_key(api_key)
+        assert api_key not in (stored.key_hash, stored.prefix)
+
+    def test_cached_key_runs_no_queries(self, key_store, issue_key, query_counter):
+        api_key = issue_key([ApiKeyScope.ADMIN])
+        key_store.authenticate(api_key)
+        query_counter.clear()
+        
+        principal = key_store.authenticate(api_key)
+        
+        assert principal.name == "test-key"
+        assert query_counter == []
+
+    def test_only_authenticated_keys_are_verified(self, key_store, issue_key, query_counter):
+        api_key = issue_key([ApiKeyScope.ADMIN])
+        query_counter.clear()
+        
+        assert not key_store.is_verified(api_key)
+        key_store.authenticate(api_key)
+        assert key_store.is_verified(api_key)
+        assert not key_store.is_verified("mtl_00000000_unknown")
+        assert len(query_counter) == 1
+
+    def test_rejects_wrong_secret_for_known_prefix(self, key_store, issue_key):
+        api_key = issue_key([ApiKeyScope.ADMIN])
+        
+        assert key_store.authenticate(api_key[:-1] + ("x" if api_key[-1] != "x" else "y")) is None
+
+    def test_rejects_inactive_key(self, key_store, issue_key):
+        api_key = issue_key([ApiKeyScope.ADMIN], is_active=False)
+        
+        assert key_store.authenticate(api_key) is None
+
+    def test_unknown_keys_are_remembered_briefly(self, key_store, query_counter, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(auth.time, "monotonic", lambda: now[0])
+        
+        assert key_store.authenticate("mtl_00000000_unknown") is None
+        assert key_store.authenticate("mtl_00000000_unknown") is None
+        assert len(query_counter) == 1
+        
+        now[0] += auth.UNKNOWN_KEY_TTL_SECONDS
+        
+        assert key_store.authenticate("mtl_00000000_unknown") is None
+        assert len(query_counter) == 2
+        assert not key_store.is_verified("mtl_00000000_unknown")
+
+    def test_remembered_unknown_keys_are_bounded(self, key_store, query_counter, monkeypatch):
+        monkeypatch.setattr(auth, "MAX_UNKNOWN_KEYS", 2)
+        
+        for secret in ("a", "b", "c", "a"):
+            key_store.authenticate(f"mtl_00000000_{secret}")
+        
+        assert len(key_store._unknown) == 2
+        assert len(query_counter) == 4
+
+    def test_invalidate_forgets_unknown_keys(self, db_session, key_store):
+        api_key, prefix, key_hash = generate_api_key()
+        assert key_store.authenticate(api_key) is None
+        db_session.add(ApiKey(name="late-key", prefix=prefix, key_hash=key_hash, scopes=["admin"]))
+        db_session.commit()
+        
+        key_store.invalidate()
+        
+        assert key_store.authenticate(api_key).name == "late-key"
+
+    def test_malformed_key_runs_no_queries(self, key_store, query_counter):
+        assert key_store.authenticate("not-a-key") is None
+        assert key_store.authenticate("mtl_short_secret") is None
+        assert query_counter == []
+
+    def test_revoked_key_is_dropped_on_invalidate(self, db_session, key_store, issue_key):
+        api_key = issue_key([ApiKeyScope.ADMIN])
+        key_store.authenticate(api_key)
+        db_session.query(ApiKey).update({"is_active": False})
+        db_session.commit()
+        
+        key_store.invalidate()
+        
+        assert key_store.authenticate(api_key) is None
+
+
+class TestScopesAndSchools:
+    def test_bootstrap_key_has_every_scope(self, monkeypatch):
+        monkeypatch.setattr(settings, "API_KEY", "test-secret-key")
+        
+        principal = authenticate("test-secret-key")
+        
+        assert all(principal.has_scope(scope) for scope in ApiKeyScope)
+        assert principal.school_id is None
+
+    def test_empty_bootstrap_key_is_disabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "API_KEY", "")
+        
+        with pytest.raises(HTTPException) as exc_info:
+            authenticate("")
+        
+        assert exc_info.value.status_code == 403
+
+    def test_require_scope_rejects_key_without_scope(self):
+        principal = ApiKeyPrincipal(name="cashier", scopes=frozenset({"payments:write"}))
+        
+        assert require_scope(ApiKeyScope.PAYMENTS_WRITE)(principal=principal) is principal
+        with pytest.raises(HTTPException) as exc_info:
+            require_scope(ApiKeyScope.ADMIN)(principal=principal)
+        
+        assert exc_info.value.status_code == 403
+        assert "admin" in exc_info.value.detail
+
+    def test_authorize_school(self):
+        bound = ApiKeyPrincipal(name="portal", scopes=frozenset(), school_id=3)
+        unbound = ApiKeyPrincipal(name="bot", scopes=frozenset())
+        
+        authorize_school(bound, 3)
+        authorize_school(unbound, 4)
+        authorize_school(unbound, None)
+        for school_id in (4, None):
+            with pytest.raises(HTTPException) as exc_info:
+                authorize_school(bound, school_id)
+            assert exc_info.value.status_code == 403
@@ -0,0 +1,47 @@
+from unittest.mock import MagicMock
+
+from app.infrastructure import cache
+from app.infrastructure.cache import TTLCache
+
+
+class TestTTLCache:
+    def test_returns_cached_value_until_expired(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        ttl_cache = TTLCache(ttl_seconds=5)
+        loader = MagicMock(side_effect=[1, 2])
+        
+        assert ttl_cache.get_or_load("key", ["invoices"], loader) == 1
+        assert ttl_cache.get_or_load("key", ["invoices"], loader) == 1
+        
+        now[0] += 5
+        
+        assert ttl_cache.get_or_load("key", ["invoices"], loader) == 2
+        assert loader.call_count == 2
+
+    def test_invalidate_drops_only_tagged_entries(self):
+        ttl_cache = TTLCache(ttl_seconds=60)
+        ttl_cache.get_or_load("invoices", ["invoices", "students"], lambda: 10)
+        ttl_cache.get_or_load("schools", ["schools"], lambda: 3)
+        
+        ttl_cache.invalidate("students")
+        
+        assert ttl_cache.get_or_load("invoices", ["invoices", "students"], lambda: 11) == 11
+        assert ttl_cache.get_or_load("schools", ["schools"], lambda: 4) == 3
+
+    def test_value_loaded_across_invalidation_is_not_stored(self):
+        ttl_cache = TTLCache(ttl_seconds=60)
+        
+        def loader():
+            ttl_cache.invalidate("invoices")
+            return 1
+        
+        assert ttl_cache.get_or_load("key", ["invoices"], loader) == 1
+        assert ttl_cache.get_or_load("key", ["invoices"], lambda: 2) == 2
+
+    def test_zero_ttl_disables_cache(self):
+        ttl_cache = TTLCache(ttl_seconds=0)
+        loader = MagicMock(side_effect=[1, 2])
+        
+        assert ttl_cache.get_or_load("key", [], loader) == 1
+        assert ttl_cache.get_or_load("key", [], loader) == 2
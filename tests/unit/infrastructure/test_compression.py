@@ -0,0 +1,121 @@
+import asyncio
+import gzip
+import zlib
+
+import brotli
+import pytest
+
+from app.infrastructure.compression import CompressionLevels, CompressionMiddleware, negotiate_encoding
+
+JSON_BODY = b'{"invoices":[' + b",".join(b'{"id":%d,"amount_total":"1000.00"}' % i for i in range(200)) + b"]}"
+
+
+def json_app(body: bytes = JSON_BODY, chunks: int = 1, content_type: bytes = b"application/json"):
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type)]
+        if chunks == 1:
+            headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        size = len(body) // chunks + 1
+        for index in range(chunks):
+            part = body[index * size:(index + 1) * size]
+            await send({"type": "http.response.body", "body": part, "more_body": index < chunks - 1})
+    return app
+
+
+def call(middleware, accept_encoding: str = "gzip, br", path: str = "/api/v1/invoices"):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "path": path, "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(middleware(scope, None, send))
+    headers = {key.decode(): value.decode() for key, value in messages[0]["headers"]}
+    return headers, [message.get("body", b"") for message in messages[1:]]
+
+
+class TestNegotiation:
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("gzip;q=0, br;q=0", None),
+        ("*", "br"),
+        ("identity", None),
+        ("", None),
+        ("gzip;q=bogus, br;q=0.1", "br"),
+    ])
+    def test_negotiate_encoding(self, header, expected):
+        assert negotiate_encoding(header) == expected
+
+
+class TestCompressionMiddleware:
+    def test_compresses_large_json_with_negotiated_encoding(self):
+        headers, bodies = call(CompressionMiddleware(json_app()), accept_encoding="br")
+        
+        assert headers["content-encoding"] == "br"
+        assert headers["vary"] == "Accept-Encoding"
+        assert int(headers["content-length"]) == len(bodies[0])
+        assert brotli.decompress(bodies[0]) == JSON_BODY
+
+    def test_gzip(self):
+        headers, bodies = call(CompressionMiddleware(json_app()), accept_encoding="gzip")
+        
+        assert headers["content-encoding"] == "gzip"
+        assert gzip.decompress(bodies[0]) == JSON_BODY
+
+    def test_small_bodies_are_not_compressed(self):
+        headers, bodies = call(CompressionMiddleware(json_app(b'{"status":"ok"}')))
+        
+        assert "content-encoding" not in headers
+        assert headers["vary"] == "Accept-Encoding"
+        assert bodies == [b'{"status":"ok"}']
+
+    def test_identity_and_non_text_pass_through(self):
+        headers, bodies = call(CompressionMiddleware(json_app()), accept_encoding="identity")
+        assert "content-encoding" not in headers and bodies == [JSON_BODY]
+        
+        headers, bodies = call(CompressionMiddleware(json_app(content_type=b"image/png")))
+        assert "content-encoding" not in headers and bodies == [JSON_BODY]
+
+    def test_streaming_chunks_are_decodable_as_they_arrive(self):
+        headers, bodies = call(CompressionMiddleware(json_app(chunks=4)), accept_encoding="gzip")
+        
+        assert headers["content-encoding"] == "gzip"
+        assert "content-length" not in headers
+        assert len(bodies) == 4
+        decoder = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        received = decoder.decompress(bodies[0])
+        assert received == JSON_BODY[:len(received)] and len(received) > 0
+        received += b"".join(decoder.decompress(body) for body in bodies[1:])
+        assert received == JSON_BODY
+
+    def test_route_levels(self):
+        middleware = CompressionMiddleware(
+            json_app(),
+            levels=CompressionLevels(gzip=1, br=1),
+            route_levels=[(r"/statement$", CompressionLevels(gzip=9, br=9))],
+        )
+        
+        assert middleware.levels_for("/api/v1/schools/1/statement") == CompressionLevels(gzip=9, br=9)
+        assert middleware.levels_for("/api/v1/invoices") == CompressionLevels(gzip=1, br=1)
+        _, fast = call(middleware, accept_encoding="gzip")
+        _, small = call(middleware, accept_encoding="gzip", path="/api/v1/schools/1/statement")
+        # gzip header XFL byte: 4 = fastest, 2 = maximum compression
+        assert fast[0][8] == 4
+        assert small[0][8] == 2
+
+    def test_small_streams_are_buffered_and_sent_uncompressed(self):
+        headers, bodies = call(CompressionMiddleware(json_app(b'{"status":"ok"}', chunks=3)))
+        
+        assert "content-encoding" not in headers
+        assert headers["content-length"] == "15"
+        assert bodies == [b'{"status":"ok"}']
+
+    def test_stream_starts_compressing_once_past_minimum_size(self):
+        headers, bodies = call(CompressionMiddleware(json_app(chunks=20), minimum_size=1024), accept_encoding="gzip")
+        
+        assert headers["content-encoding"] == "gzip"
+        assert len(bodies) < 20
+        assert gzip.decompress(b"".join(bodies)) == JSON_BODY
@@ -0,0 +1,126 @@
+import signal
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.infrastructure import health
+from app.infrastructure.health import ReadinessCheck, alembic_heads, drain_on_sigterm
+from app.infrastructure.pool import ConnectionGate
+
+TEST_DATABASE_URL = "postgresql://mattilda:secret@db:5432/mattilda_billing_test"
+[HEAD] = alembic_heads()
+
+
+@pytest.fixture
+def migrated(db_session: Session):
+    db_session.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)"))
+    db_session.execute(text("INSERT INTO alembic_version VALUES (:head)"), {"head": HEAD})
+    db_session.commit()
+
+
+@pytest.fixture
+def gate():
+    return ConnectionGate("test-health", capacity=2, wait_budget=1.0)
+
+
+def _check(gate, url=TEST_DATABASE_URL, heads=frozenset({HEAD}), **kwargs) -> ReadinessCheck:
+    return ReadinessCheck(url, gate, heads, timeout_seconds=1, **kwargs)
+
+
+class TestReadinessCheck:
+    def test_ready_when_database_answers_and_is_migrated(self, migrated, gate):
+        readiness = _check(gate).check()
+
+        assert readiness.ready is True
+        assert readiness.checks["database"]["status"] == "ok"
+        assert readiness.checks["migrations"] == {"status": "ok", "database": [HEAD], "expected": [HEAD]}
+        assert readiness.checks["pool"] == {"status": "ok", "in_use": 0, "capacity": 2, "waiting": 0}
+
+    def test_not_ready_when_migrations_are_behind(self, db_session, gate):
+        readiness = _check(gate).check()
+
+        assert readiness.ready is False
+        assert readiness.checks["database"]["status"] == "ok"
+        assert readiness.checks["migrations"]["status"] == "mismatch"
+
+    def test_not_ready_when_database_is_unreachable(self, gate):
+        readiness = _check(gate, url="postgresql://mattilda:secret@db:1/mattilda_billing_test").check()
+
+        assert readiness.ready is False
+        assert readiness.checks["database"] == {"status": "unreachable", "error": "OperationalError"}
+
+    def test_not_ready_when_pool_is_saturated(self, migrated, gate):
+        gate.in_use = gate.capacity
+        gate.hold_seconds = 5.0
+
+        readiness = _check(gate).check()
+
+        assert readiness.ready is False
+        assert readiness.checks["pool"]["status"] == "saturated"
+
+    def test_result_is_cached(self, migrated, gate, db_session):
+        check = _check(gate, cache_seconds=60)
+        assert check.check().ready is True
+
+        db_session.execute(text("UPDATE alembic_version SET version_num = 'older'"))
+        db_session.commit()
+
+        assert check.check().ready is True
+        check.cache_seconds = 0
+        check._cached = None
+        assert check.check().ready is False
+
+    def test_draining_is_never_ready(self, migrated, gate):
+        check = _check(gate)
+        check.draining = True
+
+        assert check.check().ready is False
+        assert check.check().checks == {"shutdown": "draining"}
+
+
+class TestDrainOnSigterm:
+    @pytest.fixture
+    def sigterm(self):
+        original = signal.getsignal(signal.SIGTERM)
+        shutdowns = []
+        shut_down = threading.Event()
+
+        def server_handler(signum, frame):
+            shutdowns.append(threading.current_thread())
+            shut_down.set()
+
+        signal.signal(signal.SIGTERM, server_handler)
+        yield shutdowns, shut_down
+        signal.signal(signal.SIGTERM, original)
+
+    def test_reports_draining_then_hands_over_to_the_server(self, gate, sigterm, monkeypatch):
+        shutdowns, shut_down = sigterm
+        logged_from = []
+        monkeypatch.setattr(health.logger, "info", lambda *args, **kwargs: logged_from.append(threading.current_thread()))
+        check = _check(gate)
+        drain_on_sigterm(check, drain_seconds=0.05)
+
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+
+        assert check.draining is True
+        assert shutdowns == []
+        assert shut_down.wait(5)
+        assert logged_from and shutdowns
+        assert threading.main_thread() not in logged_from + shutdowns
+
+    def test_second_signal_shuts_down_at_once(self, gate, sigterm):
+        shutdowns, shut_down = sigterm
+        check = _check(gate)
+        drain_on_sigterm(check, drain_seconds=60)
+        handler = signal.getsignal(signal.SIGTERM)
+
+        handler(signal.SIGTERM, None)
+        handler(signal.SIGTERM, None)
+
+        assert shutdowns == [threading.main_thread()]
+
+
+def test_alembic_heads_without_shipped_migrations(tmp_path):
+    assert alembic_heads(tmp_path / "missing") is None
@@ -0,0 +1,48 @@
+from contextvars import copy_context
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.infrastructure.instrumentation import (
+    QueryStats,
+    add_query_stats,
+    current_query_stats,
+    server_timing,
+    track_queries,
+)
+
+
+class TestQueryInstrumentation:
+    def test_tracks_query_count_and_time(self, db_session: Session):
+        with track_queries() as stats:
+            db_session.execute(text("SELECT 1"))
+            db_session.execute(text("SELECT pg_sleep(0.01)"))
+        
+        assert stats.count == 2
+        assert stats.duration_ms >= 10
+
+    def test_queries_outside_tracking_are_ignored(self, db_session: Session):
+        db_session.execute(text("SELECT 1"))
+        
+        assert current_query_stats() is None
+
+    def test_copied_contexts_report_into_request_stats(self, db_session: Session):
+        with track_queries() as stats:
+            # what the threadpool does for sync routes and dependencies
+            copy_context().run(db_session.execute, text("SELECT 1"))
+        
+        assert stats.count == 1
+
+    def test_log_processor_adds_request_stats(self):
+        assert add_query_stats(None, "info", {"event": "outside"}) == {"event": "outside"}
+        
+        with track_queries() as stats:
+            stats.count, stats.duration_ms = 3, 4.567
+            event = add_query_stats(None, "info", {"event": "inside"})
+        
+        assert event == {"event": "inside", "db_queries": 3, "db_time_ms": 4.57}
+
+    def test_server_timing_header(self):
+        header = server_timing(QueryStats(count=4, duration_ms=12.345), total_ms=30.01)
+        
+        assert header == 'db;dur=12.3;desc="4 queries", total;dur=30.0'
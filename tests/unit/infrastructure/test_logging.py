@@ -0,0 +1,74 @@
+import io
+import threading
+
+import pytest
+import structlog
+
+from app.infrastructure.logging import EventSampler, QueueLogWriter, parse_sample_rates
+from app.infrastructure.metrics import LOG_EVENTS_DROPPED, LOG_EVENTS_SAMPLED_OUT
+
+
+class BlockedStream(io.StringIO):
+    """A stream whose writes wait until released, like a stalled stdout pipe."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.release.wait()
+        return super().write(text)
+
+
+class TestQueueLogWriter:
+    def test_writes_lines_in_order_from_background_thread(self):
+        stream = io.StringIO()
+        writer = QueueLogWriter(stream)
+
+        for index in range(500):
+            writer.write(f"line {index}")
+        writer.flush()
+
+        assert stream.getvalue().splitlines() == [f"line {index}" for index in range(500)]
+        writer.close()
+
+    def test_full_queue_drops_and_counts_instead_of_blocking(self):
+        stream = BlockedStream()
+        writer = QueueLogWriter(stream, max_size=5, batch_size=1)
+        dropped_before = LOG_EVENTS_DROPPED.value("buffer_full")
+
+        for index in range(20):
+            writer.write(f"line {index}")
+
+        dropped = LOG_EVENTS_DROPPED.value("buffer_full") - dropped_before
+        stream.release.set()
+        writer.flush()
+        written = stream.getvalue().splitlines()
+        assert dropped >= 14
+        assert len(written) == 20 - dropped
+        writer.close()
+
+
+class TestEventSampler:
+    def test_parse_sample_rates(self):
+        assert parse_sample_rates("payment_validation:0.01, school_statement_generated:0.1") == {
+            "payment_validation": 0.01,
+            "school_statement_generated": 0.1,
+        }
+        assert parse_sample_rates("") == {}
+
+    def test_drops_sampled_events_and_counts_them(self):
+        sampler = EventSampler({"payment_validation": 0.0})
+        before = LOG_EVENTS_SAMPLED_OUT.value("payment_validation")
+
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "debug", {"event": "payment_validation"})
+
+        assert LOG_EVENTS_SAMPLED_OUT.value("payment_validation") == before + 1
+
+    def test_keeps_other_events_and_warnings(self):
+        sampler = EventSampler({"payment_validation": 0.0, "statement": 1.0})
+
+        assert sampler(None, "info", {"event": "payment_processed"}) == {"event": "payment_processed"}
+        assert sampler(None, "warning", {"event": "payment_validation"}) == {"event": "payment_validation"}
+        assert sampler(None, "info", {"event": "statement"}) == {"event": "statement"}
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+from app.infrastructure.cache import TTLCache
+from app.infrastructure import metrics
+from app.infrastructure.metrics import CallbackMetric, Counter, Histogram, Registry, watch_cache
+from app.main import metrics as metrics_endpoint
+
+
+class TestMetrics:
+    def test_counter_exposition(self):
+        registry = Registry()
+        counter = registry.register(Counter("payments_total", "Payments", ("method",)))
+
+        counter.inc("cash")
+        counter.inc("cash", amount=2)
+        counter.inc('card "visa"')
+
+        assert counter.value("cash") == 3
+        assert registry.exposition().splitlines() == [
+            "# HELP payments_total Payments",
+            "# TYPE payments_total counter",
+            'payments_total{method="card \\"visa\\""} 1',
+            'payments_total{method="cash"} 3',
+        ]
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "/a")
+
+        assert histogram.collect() == [
+            'latency_seconds_bucket{route="/a",le="0.1"} 2',
+            'latency_seconds_bucket{route="/a",le="1"} 3',
+            'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+            'latency_seconds_sum{route="/a"} 3.65',
+            'latency_seconds_count{route="/a"} 4',
+        ]
+
+    def test_shards_from_many_threads_are_merged(self):
+        counter = Counter("hits_total", "Hits")
+        histogram = Histogram("work_seconds", "Work")
+
+        def work():
+            for _ in range(1000):
+                counter.inc()
+                histogram.observe(0.01)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.value() == 8000
+        assert histogram.count() == 8000
+
+    def test_shards_of_finished_threads_are_retired(self):
+        histogram = Histogram("work_seconds", "Work")
+
+        for _ in range(500):
+            thread = threading.Thread(target=histogram.observe, args=(0.01,))
+            thread.start()
+            thread.join()
+
+        assert len(histogram._shards) <= 1
+        assert histogram.count() == 500
+        assert histogram._shards == []
+
+    def test_callback_sources_are_read_at_scrape_time(self):
+        gauge = CallbackMetric("pool_checked_out", "Checked out", ("pool",))
+        checked_out = [1]
+        gauge.add_source(lambda: checked_out[0], "primary")
+        gauge.add_source(lambda: 0, "replica")
+
+        checked_out[0] = 4
+
+        assert gauge.collect() == ['pool_checked_out{pool="primary"} 4', 'pool_checked_out{pool="replica"} 0']
+
+    def test_duplicate_names_are_rejected(self):
+        registry = Registry()
+        registry.register(Counter("x_total", "X"))
+
+        with pytest.raises(ValueError):
+            registry.register(Counter("x_total", "X"))
+
+    def test_watch_cache_exports_hits_and_misses(self, monkeypatch):
+        monkeypatch.setattr(metrics, "CACHE_REQUESTS", CallbackMetric(
+            "cache_requests_total", "Cache", ("cache", "result"), type="counter",
+        ))
+        cache = TTLCache(ttl_seconds=60)
+        watch_cache(cache, "test")
+
+        cache.get_or_load("a", (), lambda: 1)
+        cache.get_or_load("a", (), lambda: 1)
+        cache.get_or_load("b", (), lambda: 2)
+
+        assert metrics.CACHE_REQUESTS.collect() == [
+            'cache_requests_total{cache="test",result="hit"} 1',
+            'cache_requests_total{cache="test",result="miss"} 2',
+        ]
+
+
+class TestMetricsEndpoint:
+    def test_serves_registry_in_prometheus_text_format(self):
+        metrics.HTTP_REQUEST_DURATION.observe(0.02, "GET", "/health", "200")
+
+        response = metrics_endpoint()
+
+        assert response.media_type == "text/plain; version=0.0.4; charset=utf-8"
+        assert b'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.body
+        assert b"# TYPE db_pool_checked_out_connections gauge" in response.body
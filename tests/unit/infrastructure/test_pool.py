@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from app.exceptions import ServiceUnavailable, app_exception_handler
+from app.infrastructure import pool
+from app.infrastructure.metrics import DB_POOL_REJECTED
+from app.infrastructure.pool import ConnectionGate
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestConnectionGate:
+    def test_admits_up_to_capacity_then_hands_slots_to_waiters_in_order(self):
+        gate = ConnectionGate("test-order", capacity=2, wait_budget=5)
+        order = []
+
+        async def request(name, hold):
+            async with gate.slot():
+                order.append(name)
+                await asyncio.sleep(hold)
+
+        async def scenario():
+            await asyncio.gather(request("a", 0.02), request("b", 0.02), request("c", 0), request("d", 0))
+            return gate.in_use, gate.waiting
+
+        assert run(scenario()) == (0, 0)
+        assert order == ["a", "b", "c", "d"]
+
+    def test_rejects_when_expected_wait_exceeds_budget(self):
+        gate = ConnectionGate("test-budget", capacity=1, wait_budget=0.5)
+        gate.hold_seconds = 2.0
+        rejected_before = DB_POOL_REJECTED.value("test-budget")
+
+        async def scenario():
+            async with gate.slot():
+                with pytest.raises(ServiceUnavailable) as exc_info:
+                    async with gate.slot():
+                        pass
+                return exc_info.value
+
+        error = run(scenario())
+
+        assert error.status_code == 503
+        assert error.headers == {"Retry-After": "2"}
+        assert DB_POOL_REJECTED.value("test-budget") == rejected_before + 1
+        assert gate.in_use == 0
+
+    def test_rejects_waiters_still_queued_when_budget_runs_out(self):
+        gate = ConnectionGate("test-timeout", capacity=1, wait_budget=0.05)
+        gate.hold_seconds = 0.001
+
+        async def holder(release):
+            async with gate.slot():
+                await release.wait()
+
+        async def scenario():
+            release = asyncio.Event()
+            task = asyncio.create_task(holder(release))
+            await asyncio.sleep(0)
+            with pytest.raises(ServiceUnavailable):
+                async with gate.slot():
+                    pass
+            waiting = gate.waiting
+            release.set()
+            await task
+            return waiting
+
+        assert run(scenario()) == 0
+        assert gate.in_use == 0
+
+    def test_cancelled_waiter_leaves_the_queue(self):
+        gate = ConnectionGate("test-cancel", capacity=1, wait_budget=5)
+
+        async def waiter():
+            async with gate.slot():
+                pass
+
+        async def scenario():
+            async with gate.slot():
+                task = asyncio.create_task(waiter())
+                await asyncio.sleep(0)
+                assert gate.waiting == 1
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+            return gate.waiting, gate.in_use
+
+        assert run(scenario()) == (0, 0)
+
+
+class TestThreadpoolSize:
+    def test_defaults_to_pool_capacity_plus_headroom(self, monkeypatch):
+        monkeypatch.setattr(pool.settings, "DB_POOL_SIZE", 10)
+        monkeypatch.setattr(pool.settings, "DB_MAX_OVERFLOW", 5)
+        monkeypatch.setattr(pool.settings, "THREADPOOL_SIZE", None)
+
+        assert pool.threadpool_size() == 15 + pool.THREADPOOL_HEADROOM
+
+    def test_explicit_size_wins(self, monkeypatch):
+        monkeypatch.setattr(pool.settings, "THREADPOOL_SIZE", 64)
+
+        assert pool.threadpool_size() == 64
+
+
+def test_service_unavailable_response_carries_retry_after():
+    response = run(app_exception_handler(None, ServiceUnavailable("Database connection pool exhausted", retry_after=3)))
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+
+class TestBuildGate:
+    def test_reserve_is_left_outside_the_gate(self, monkeypatch):
+        monkeypatch.setattr(pool.settings, "DB_POOL_SIZE", 10)
+        monkeypatch.setattr(pool.settings, "DB_MAX_OVERFLOW", 5)
+
+        assert pool.build_gate("test-reserve", reserve=2).capacity == 13
+        assert pool.build_gate("test-no-reserve").capacity == 15
@@ -0,0 +1,129 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main
+from app.infrastructure import rate_limit
+from app.infrastructure.rate_limit import (
+    InMemoryBackend,
+    Limit,
+    RateLimiter,
+    parse_limit,
+    retry_after_header,
+    route_group,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestTokenBucket:
+    def test_allows_burst_then_waits_for_refill(self, clock):
+        backend = InMemoryBackend()
+        limit = Limit(rate=2, burst=3)
+
+        assert [backend.take("client", limit) for _ in range(3)] == [0, 0, 0]
+        assert backend.take("client", limit) == pytest.approx(0.5)
+
+        clock[0] += 0.5
+
+        assert backend.take("client", limit) == 0
+        assert backend.take("client", limit) == pytest.approx(0.5)
+
+    def test_rejected_requests_do_not_consume_tokens(self, clock):
+        backend = InMemoryBackend()
+        limit = Limit(rate=1, burst=1)
+        backend.take("client", limit)
+
+        for _ in range(5):
+            backend.take("client", limit)
+        clock[0] += 1
+
+        assert backend.take("client", limit) == 0
+
+    def test_buckets_are_per_key(self, clock):
+        backend = InMemoryBackend()
+        limit = Limit(rate=1, burst=1)
+
+        assert backend.take("a", limit) == 0
+        assert backend.take("b", limit) == 0
+        assert backend.take("a", limit) > 0
+
+    def test_evicts_least_recently_used_bucket_when_full(self, clock):
+        backend = InMemoryBackend(max_keys=2)
+        limit = Limit(rate=1, burst=2)
+        backend.take("idle", limit)
+        backend.take("busy", limit)
+        backend.take("idle", limit)
+        backend.take("busy", limit)
+
+        for key in ("new-1", "new-2", "new-3"):
+            backend.take(key, limit)
+
+        assert list(backend._buckets) == ["new-2", "new-3"]
+
+
+class TestRateLimiter:
+    def test_route_groups(self):
+        assert route_group("POST", "/api/v1/invoices/1/payments") == "writes"
+        assert route_group("DELETE", "/api/v1/students/3") == "writes"
+        assert route_group("GET", "/api/v1/schools/1/statement") == "statements"
+        assert route_group("GET", "/api/v1/invoices") == "lists"
+        assert route_group("POST", "/api/v1/invoices:bulk-void") == "writes"
+        assert route_group("GET", "/health") is None
+
+    def test_writes_are_limited_per_key_and_reads_per_ip(self, clock):
+        limiter = RateLimiter(
+            {"writes": Limit(1, 1), "lists": Limit(1, 1)},
+            InMemoryBackend(),
+            verify_key=lambda api_key: True,
+        )
+
+        assert limiter.check("POST", "/api/v1/schools", "key-a", "10.0.0.1") == 0
+        assert limiter.check("POST", "/api/v1/schools", "key-b", "10.0.0.1") == 0
+        assert limiter.check("POST", "/api/v1/schools", "key-a", "10.0.0.2") > 0
+        assert limiter.check("GET", "/api/v1/schools", "key-c", "10.0.0.1") == 0
+        assert limiter.check("GET", "/api/v1/schools", "key-d", "10.0.0.1") > 0
+
+    def test_unverified_keys_are_limited_per_ip(self, clock):
+        limiter = RateLimiter({"writes": Limit(1, 1)}, InMemoryBackend(), verify_key=lambda api_key: api_key == "real")
+
+        assert limiter.check("POST", "/api/v1/schools", "fake-1", "10.0.0.1") == 0
+        assert limiter.check("POST", "/api/v1/schools", "fake-2", "10.0.0.1") > 0
+        assert limiter.check("POST", "/api/v1/schools", "real", "10.0.0.1") == 0
+
+    def test_unlimited_groups_pass(self):
+        limiter = RateLimiter({"writes": None}, InMemoryBackend())
+
+        assert all(limiter.check("POST", "/api/v1/schools", "key", None) == 0 for _ in range(100))
+        assert limiter.check("GET", "/health", None, "10.0.0.1") == 0
+
+    def test_parse_limit(self):
+        assert parse_limit("20:40") == Limit(20, 40)
+        assert parse_limit("5") == Limit(5, 5)
+        assert parse_limit("0.5:2") == Limit(0.5, 2)
+        assert parse_limit("") is None
+        assert parse_limit("0:10") is None
+        with pytest.raises(ValueError):
+            parse_limit("0.5")
+
+    def test_retry_after_rounds_up_to_whole_seconds(self):
+        assert retry_after_header(0.01) == "1"
+        assert retry_after_header(1.2) == "2"
+
+
+def test_middleware_rejects_with_retry_after(monkeypatch):
+    limiter = RateLimiter({"writes": Limit(rate=0.1, burst=1)}, InMemoryBackend(), verify_key=lambda api_key: False)
+    monkeypatch.setattr(app.main, "rate_limiter", limiter)
+    client = TestClient(app.main.app)
+
+    first = client.post("/api/v1/schools", json={}, headers={"X-API-Key": "made-up-1"})
+    second = client.post("/api/v1/schools", json={}, headers={"X-API-Key": "made-up-2"})
+
+    assert first.status_code == 403
+    assert second.status_code == 429
+    assert second.headers["Retry-After"] == "10"
+    assert second.json() == {"detail": "Rate limit exceeded"}
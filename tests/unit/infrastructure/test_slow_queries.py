@@ -0,0 +1,122 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.infrastructure import slow_queries
+from app.infrastructure.slow_queries import (
+    REDACTED,
+    SlowQueryLog,
+    normalize_sql,
+    redact_parameters,
+    watch_slow_queries,
+)
+from app.repositories.school_repository import SchoolRepository
+
+
+@pytest.fixture
+def slow_log(db_session: Session, monkeypatch):
+    log = SlowQueryLog(threshold_ms=20, history=3, explain=True)
+    monkeypatch.setattr(slow_queries, "slow_query_log", log)
+    watch_slow_queries(db_session.get_bind())
+    yield log
+    if log._explainer is not None:
+        log._explainer.shutdown(wait=True)
+
+
+def _wait_for_plans(log: SlowQueryLog) -> None:
+    log._explainer.shutdown(wait=True)
+    log._explainer = None
+
+
+class TestSlowQueryLog:
+    def test_fast_queries_are_not_recorded(self, db_session: Session, slow_log):
+        db_session.execute(text("SELECT 1"))
+        
+        assert slow_log.snapshot() == []
+
+    def test_records_slow_query_with_redacted_parameters(self, db_session: Session, slow_log):
+        db_session.execute(text("SELECT pg_sleep(:seconds), :email"), {"seconds": 0.03, "email": "ana@example.com"})
+        
+        [entry] = slow_log.snapshot()
+        [sample] = entry["samples"]
+        assert entry["sql"] == "SELECT pg_sleep(%(seconds)s), %(email)s"
+        assert entry["count"] == 1
+        assert sample["duration_ms"] >= 20
+        assert sample["parameters"] == {"seconds": 0.03, "email": REDACTED}
+
+    def test_captures_plan_in_background(self, db_session: Session, slow_log):
+        db_session.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": 0.03})
+        _wait_for_plans(slow_log)
+        
+        [entry] = slow_log.snapshot()
+        assert entry["samples"][0]["plan"]["Plan"]["Node Type"] == "Result"
+
+    def test_explains_run_outside_the_request_pool(self, db_session: Session, slow_log):
+        db_session.execute(text("SELECT 1"))
+        checkouts = []
+        event.listen(db_session.get_bind(), "checkout", lambda *args: checkouts.append(args))
+        
+        db_session.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": 0.03})
+        _wait_for_plans(slow_log)
+        
+        assert slow_log.snapshot()[0]["samples"][0]["plan"] is not None
+        assert checkouts == []
+
+    def test_one_pending_explain_per_query(self, db_session: Session, slow_log, monkeypatch):
+        explainer = MagicMock()
+        monkeypatch.setattr(slow_log, "_explainer_pool", lambda: explainer)
+        
+        for _ in range(3):
+            db_session.execute(text("SELECT pg_sleep(0.021)"))
+        db_session.execute(text("SELECT pg_sleep(0.022)"))
+        
+        assert explainer.submit.call_count == 2
+        assert sum(entry["count"] for entry in slow_log.snapshot()) == 4
+
+    def test_ring_buffer_keeps_latest_samples(self, db_session: Session, slow_log):
+        for _ in range(4):
+            db_session.execute(text("SELECT pg_sleep(0.021)"))
+        
+        [entry] = slow_log.snapshot()
+        assert entry["count"] == 4
+        assert len(entry["samples"]) == 3
+
+    def test_names_the_repository_method_called_by_the_service(self, db_session: Session, slow_log):
+        slow_log.threshold_ms = 0.001
+        slow_log.explain = False
+        
+        SchoolRepository(db_session).count_all()
+        
+        methods = {sample["repository_method"] for entry in slow_log.snapshot() for sample in entry["samples"]}
+        assert methods == {"SchoolRepository.count_all"}
+
+    def test_disabled_with_zero_threshold(self, db_session: Session, slow_log):
+        slow_log.threshold_ms = 0
+        
+        db_session.execute(text("SELECT pg_sleep(0.03)"))
+        
+        assert slow_log.snapshot() == []
+
+
+class TestNormalization:
+    def test_expanded_in_lists_share_a_fingerprint(self):
+        short = "SELECT * FROM invoices WHERE id IN (%(id_1_1)s, %(id_1_2)s)"
+        long = "SELECT *\n  FROM invoices\n WHERE id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s)"
+        
+        assert normalize_sql(short) == normalize_sql(long) == "SELECT * FROM invoices WHERE id IN (...)"
+        assert normalize_sql("WHERE id IN ($1, $2, $3)") == "WHERE id IN (...)"
+
+    def test_redaction_keeps_identifiers_and_amounts_only(self):
+        params = {"id": 7, "amount": Decimal("10.00"), "due": date(2025, 1, 1), "ref": "REF-1", "flags": [True, "x"]}
+        
+        assert redact_parameters(params) == {
+            "id": 7,
+            "amount": Decimal("10.00"),
+            "due": date(2025, 1, 1),
+            "ref": REDACTED,
+            "flags": [True, REDACTED],
+        }
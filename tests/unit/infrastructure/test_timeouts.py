@@ -0,0 +1,125 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.exceptions import DatabaseError, DatabaseTimeout, ServiceUnavailable
+from app.infrastructure.metrics import DB_TIMEOUTS
+from app.infrastructure.routes import BULK, READS, STATEMENTS, WRITES, route_class
+from app.infrastructure.timeouts import (
+    TimeoutPolicy,
+    Timeouts,
+    parse_timeouts,
+    set_timeouts_on_begin,
+    timeout_error,
+)
+from app.infrastructure.unit_of_work import UnitOfWork
+
+
+@pytest.fixture
+def engine(db_session: Session):
+    return db_session.get_bind()
+
+
+def _unit(engine, timeouts: Timeouts | None) -> UnitOfWork:
+    return UnitOfWork(engine, sessionmaker(autoflush=False, expire_on_commit=False), timeouts=timeouts)
+
+
+class TestPolicy:
+    def test_parse_timeouts(self):
+        assert parse_timeouts("5000:1000") == Timeouts(statement_ms=5000, lock_ms=1000)
+        assert parse_timeouts("300") == Timeouts(statement_ms=300, lock_ms=0)
+        assert parse_timeouts("") is None
+
+    @pytest.mark.parametrize("method, path, expected", [
+        ("GET", "/api/v1/invoices", READS),
+        ("GET", "/api/v1/schools/1/statement", STATEMENTS),
+        ("POST", "/api/v1/invoices/1/payments", WRITES),
+        ("PATCH", "/api/v1/students/4", WRITES),
+        ("POST", "/api/v1/invoices:bulk-void", BULK),
+        ("GET", "/health", None),
+    ])
+    def test_route_class(self, method, path, expected):
+        assert route_class(method, path) == expected
+
+    def test_for_request(self):
+        policy = TimeoutPolicy({STATEMENTS: Timeouts(15000, 1000), READS: None})
+
+        assert policy.for_request("GET", "/api/v1/students/1/statement") == Timeouts(15000, 1000)
+        assert policy.for_request("GET", "/api/v1/students") is None
+        assert policy.for_request("GET", "/health") is None
+
+
+class TestAppliedTimeouts:
+    def test_unit_of_work_sets_timeouts_for_its_transaction(self, engine):
+        uow = _unit(engine, Timeouts(statement_ms=1500, lock_ms=250))
+
+        assert uow.session.execute(text("SHOW statement_timeout")).scalar_one() == "1500ms"
+        assert uow.session.execute(text("SHOW lock_timeout")).scalar_one() == "250ms"
+        uow.rollback()
+        uow.close()
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SHOW statement_timeout")).scalar_one() == "0"
+
+    def test_unit_of_work_sets_timeouts_once_across_service_commits(self, engine, query_counter):
+        uow = _unit(engine, Timeouts(statement_ms=1500, lock_ms=250))
+
+        uow.session.execute(text("SELECT 1"))
+        uow.session.commit()
+        assert uow.session.execute(text("SHOW statement_timeout")).scalar_one() == "1500ms"
+        uow.rollback()
+        uow.close()
+
+        assert sum("set_config" in statement for statement in query_counter) == 1
+
+    def test_session_sets_timeouts_on_every_transaction(self, engine):
+        with Session(engine) as session:
+            set_timeouts_on_begin(session, Timeouts(statement_ms=700, lock_ms=70))
+
+            assert session.execute(text("SHOW statement_timeout")).scalar_one() == "700ms"
+            session.commit()
+            assert session.execute(text("SHOW lock_timeout")).scalar_one() == "70ms"
+            session.rollback()
+            assert session.execute(text("SHOW statement_timeout")).scalar_one() == "700ms"
+
+
+class TestTimeoutErrors:
+    def test_statement_timeout_is_a_504(self, engine):
+        uow = _unit(engine, Timeouts(statement_ms=50, lock_ms=0))
+        before = DB_TIMEOUTS.value("statement", STATEMENTS)
+
+        with pytest.raises(OperationalError) as exc_info:
+            uow.session.execute(text("SELECT pg_sleep(1)"))
+        uow.rollback()
+        uow.close()
+
+        error = timeout_error(exc_info.value, STATEMENTS)
+        assert isinstance(error, DatabaseTimeout)
+        assert error.status_code == 504
+        assert DB_TIMEOUTS.value("statement", STATEMENTS) == before + 1
+
+    def test_lock_timeout_is_a_503_even_when_wrapped_by_a_service(self, engine, db_session, sample_invoice):
+        db_session.commit()
+        holder = _unit(engine, None)
+        holder.session.execute(text("SELECT 1 FROM invoices WHERE id = :id FOR UPDATE"), {"id": sample_invoice.id})
+        uow = _unit(engine, Timeouts(statement_ms=5000, lock_ms=50))
+
+        try:
+            try:
+                uow.session.execute(text("UPDATE invoices SET description = 'x' WHERE id = :id"), {"id": sample_invoice.id})
+            except OperationalError:
+                raise DatabaseError("update invoice")
+        except DatabaseError as wrapped:
+            error = timeout_error(wrapped, WRITES)
+        finally:
+            uow.rollback()
+            uow.close()
+            holder.rollback()
+            holder.close()
+
+        assert isinstance(error, ServiceUnavailable)
+        assert error.headers == {"Retry-After": "1"}
+
+    def test_other_errors_are_left_alone(self):
+        assert timeout_error(ValueError("boom"), READS) is None
@@ -0,0 +1,96 @@
+import pytest
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import SpanKind, StatusCode
+
+from app.infrastructure import tracing
+from app.services.statement_service import StatementService
+
+
+class Route:
+    path = "/api/v1/schools/{school_id}/statement"
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    tracing.configure_tracing(exporter, sample_ratio=1.0, batch=False)
+    yield exporter
+    tracing.shutdown_tracing()
+
+
+def spans_by_name(exporter):
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+class TestTracing:
+    def test_disabled_tracing_records_nothing(self, db_session, sample_school):
+        assert not tracing.tracing_enabled()
+
+        with tracing.request_span("GET", "/", {}) as span:
+            StatementService(db_session).get_school_statement(sample_school.id)
+
+        assert span is None
+
+    def test_statement_spans_nest_request_service_and_sql(self, exporter, db_session, sample_payment):
+        school_id = sample_payment.invoice.student.school_id
+        db_session.expire_all()
+
+        with tracing.request_span("GET", f"/api/v1/schools/{school_id}/statement", {}) as span:
+            StatementService(db_session).get_school_statement(school_id)
+            tracing.finish_request_span(span, "GET", Route(), 200)
+
+        spans = exporter.get_finished_spans()
+        request = spans_by_name(exporter)["GET /api/v1/schools/{school_id}/statement"]
+        service = spans_by_name(exporter)["StatementService.get_school_statement"]
+        queries = [span for span in spans if span.attributes.get("db.system") == "postgresql"]
+
+        assert request.kind == SpanKind.SERVER
+        assert request.attributes["http.route"] == Route.path
+        assert service.parent.span_id == request.context.span_id
+        assert service.attributes["school_id"] == school_id
+        assert service.attributes["invoice_count"] == 1
+        assert service.attributes["student_count"] == 1
+        assert len(queries) == 3
+        assert all(query.parent.span_id == service.context.span_id for query in queries)
+        assert all(query.name == "SELECT" and "FROM" in query.attributes["db.statement"] for query in queries)
+        assert {query.attributes["db.response.returned_rows"] for query in queries} == {1}
+
+    def test_incoming_traceparent_is_continued(self, exporter):
+        traceparent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+        with tracing.request_span("GET", "/health", {"traceparent": traceparent}):
+            pass
+
+        [span] = exporter.get_finished_spans()
+        assert format(span.context.trace_id, "032x") == "0af7651916cd43dd8448eb211c80319c"
+        assert span.parent.span_id == 0xb7ad6b7169203331
+
+    def test_unsampled_requests_skip_sql_spans(self, db_session, sample_school):
+        exporter = InMemorySpanExporter()
+        tracing.configure_tracing(exporter, sample_ratio=0.0, batch=False)
+        try:
+            with tracing.request_span("GET", "/", {}):
+                StatementService(db_session).get_school_statement(sample_school.id)
+        finally:
+            tracing.shutdown_tracing()
+
+        assert exporter.get_finished_spans() == ()
+
+    def test_server_errors_mark_the_request_span(self, exporter):
+        with tracing.request_span("POST", "/api/v1/payments", {}) as span:
+            tracing.finish_request_span(span, "POST", None, 503)
+
+        [span] = exporter.get_finished_spans()
+        assert span.status.status_code == StatusCode.ERROR
+        assert span.name == "POST /api/v1/payments"
+
+    def test_file_exporter_writes_json_lines(self, tmp_path):
+        path = tmp_path / "spans.jsonl"
+        tracing.configure_tracing(tracing.build_exporter("file", file_path=str(path)), batch=False)
+        try:
+            with tracing.request_span("GET", "/health", {}):
+                pass
+        finally:
+            tracing.shutdown_tracing()
+
+        assert '"name": "GET /health"' in path.read_text().splitlines()[0]
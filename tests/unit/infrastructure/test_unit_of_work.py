@@ -0,0 +1,213 @@
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.requests import Request
+
+from app.domain.enums import PaymentMethod
+from app.domain.models import School, Student
+from app.exceptions import AppException
+from app.infrastructure import database
+from app.infrastructure.cache import count_cache
+from app.infrastructure.metrics import PAYMENTS_PROCESSED
+from app.infrastructure.unit_of_work import UnitOfWork
+from app.repositories.school_repository import SchoolRepository
+from app.schemas import PaymentCreate, SchoolCreate, StudentCreate
+from app.services.payment_service import PaymentService
+from app.services.school_service import SchoolService
+from app.services.student_service import StudentService
+
+
+@pytest.fixture
+def engine(db_session: Session):
+    return db_session.get_bind()
+
+
+@pytest.fixture
+def commits(engine):
+    recorded = []
+    listener = lambda conn: recorded.append(conn)
+    event.listen(engine, "commit", listener)
+    yield recorded
+    event.remove(engine, "commit", listener)
+
+
+def _unit(engine) -> UnitOfWork:
+    return UnitOfWork(engine, sessionmaker(autoflush=False, expire_on_commit=False))
+
+
+def _school_count(db_session: Session) -> int:
+    db_session.rollback()
+    return db_session.scalar(select(func.count()).select_from(School))
+
+
+class TestUnitOfWork:
+    def test_service_calls_share_one_commit(self, db_session: Session, engine, commits):
+        uow = _unit(engine)
+        
+        school = SchoolService(uow.session).create(SchoolCreate(name="Unit School", country="MX", currency="MXN"))
+        StudentService(uow.session).create(
+            StudentCreate(school_id=school.id, first_name="Ana", last_name="Lopez", email="ana@unit.test")
+        )
+        
+        assert commits == []
+        assert _school_count(db_session) == 0
+        
+        uow.commit()
+        uow.close()
+        
+        assert len(commits) == 1
+        assert _school_count(db_session) == 1
+        assert db_session.scalar(select(Student.email)) == "ana@unit.test"
+
+    def test_failed_service_write_abandons_earlier_service_writes(self, db_session: Session, engine):
+        uow = _unit(engine)
+        SchoolService(uow.session).create(SchoolCreate(name="Abandoned", country="MX", currency="MXN"))
+        
+        # what a service does when its flush fails
+        SchoolRepository(uow.session).create(School(name=None, country="MX", currency="MXN"))
+        with pytest.raises(IntegrityError):
+            uow.session.commit()
+        uow.session.rollback()
+        with pytest.raises(InvalidRequestError):
+            uow.commit()
+        uow.close()
+        
+        assert _school_count(db_session) == 0
+
+    def test_work_after_a_rollback_cannot_be_committed(self, db_session: Session, engine):
+        uow = _unit(engine)
+        SchoolRepository(uow.session).create(School(name="Rolled Back", country="MX", currency="MXN"))
+        uow.session.flush()
+        uow.session.rollback()
+        
+        with pytest.raises(InvalidRequestError):
+            SchoolService(uow.session).create(SchoolCreate(name="After Rollback", country="MX", currency="MXN"))
+        with pytest.raises(InvalidRequestError):
+            uow.commit()
+        uow.close()
+        
+        assert _school_count(db_session) == 0
+
+    def test_repository_writes_are_flushed_together(self, engine, query_counter):
+        uow = _unit(engine)
+        repo = SchoolRepository(uow.session)
+        
+        for name in ("First", "Second", "Third"):
+            repo.create(School(name=name, country="MX", currency="MXN"))
+        assert query_counter == []
+        
+        uow.commit()
+        uow.close()
+        
+        assert [statement.split()[0] for statement in query_counter] == ["INSERT"]
+
+    def test_queries_see_pending_writes(self, engine):
+        uow = _unit(engine)
+        repo = SchoolRepository(uow.session)
+        
+        repo.create(School(name="Pending", country="MX", currency="MXN"))
+        
+        assert repo.get_by_name("Pending") is not None
+        uow.rollback()
+        uow.close()
+
+
+    def test_counts_are_invalidated_at_the_units_commit(self, engine, monkeypatch):
+        monkeypatch.setattr(count_cache, "ttl_seconds", 60)
+        count_cache.clear()
+        reader_session = Session(bind=engine)
+        reader = SchoolRepository(reader_session)
+        uow = _unit(engine)
+        
+        try:
+            SchoolService(uow.session).create(SchoolCreate(name="Unit School", country="MX", currency="MXN"))
+            assert reader.count() == 0
+            reader_session.rollback()
+            
+            uow.commit()
+            uow.close()
+            
+            assert reader.count() == 1
+        finally:
+            reader_session.close()
+            count_cache.clear()
+
+    def test_payments_are_counted_at_the_units_commit(self, engine, db_session: Session, sample_invoice):
+        db_session.commit()
+        before = PAYMENTS_PROCESSED.value(PaymentMethod.CASH.value)
+        uow = _unit(engine)
+        
+        PaymentService(uow.session).create(sample_invoice.id, PaymentCreate(amount=Decimal("100.00"), method=PaymentMethod.CASH))
+        assert PAYMENTS_PROCESSED.value(PaymentMethod.CASH.value) == before
+        
+        uow.commit()
+        uow.close()
+        
+        assert PAYMENTS_PROCESSED.value(PaymentMethod.CASH.value) == before + 1
+
+    def test_rolled_back_payments_are_not_counted(self, engine, db_session: Session, sample_invoice):
+        db_session.commit()
+        before = PAYMENTS_PROCESSED.value(PaymentMethod.CASH.value)
+        uow = _unit(engine)
+        
+        PaymentService(uow.session).create(sample_invoice.id, PaymentCreate(amount=Decimal("100.00"), method=PaymentMethod.CASH))
+        uow.rollback()
+        uow.close()
+        
+        assert PAYMENTS_PROCESSED.value(PaymentMethod.CASH.value) == before
+
+class TestGetUow:
+    @pytest.fixture(autouse=True)
+    def primary(self, engine, monkeypatch):
+        monkeypatch.setattr(database, "engine", engine)
+        monkeypatch.setattr(database, "replica_router", None)
+
+    def _request(self) -> Request:
+        return Request({"type": "http", "method": "POST", "path": "/", "headers": [], "query_string": b""})
+
+    def test_commits_after_endpoint(self, db_session: Session):
+        dependency = database.get_uow(self._request())
+        uow = next(dependency)
+        SchoolService(uow.session).create(SchoolCreate(name="Committed", country="MX", currency="MXN"))
+        
+        with pytest.raises(StopIteration):
+            next(dependency)
+        
+        assert _school_count(db_session) == 1
+
+    def test_rolls_back_when_endpoint_raises(self, db_session: Session):
+        dependency = database.get_uow(self._request())
+        uow = next(dependency)
+        SchoolService(uow.session).create(SchoolCreate(name="Failed Later", country="MX", currency="MXN"))
+        
+        with pytest.raises(ValueError):
+            dependency.throw(ValueError("endpoint failed"))
+        
+        assert _school_count(db_session) == 0
+
+    def test_failed_commit_is_a_database_error(self, db_session: Session):
+        dependency = database.get_uow(self._request())
+        uow = next(dependency)
+        SchoolRepository(uow.session).create(School(name=None, country="MX", currency="MXN"))
+        
+        with pytest.raises(AppException) as exc_info:
+            next(dependency)
+        
+        assert exc_info.value.status_code == 500
+        assert exc_info.value.detail == "Failed to commit transaction"
+
+    def test_endpoint_returning_after_a_rollback_is_a_database_error(self, db_session: Session):
+        dependency = database.get_uow(self._request())
+        uow = next(dependency)
+        SchoolRepository(uow.session).create(School(name="Rolled Back", country="MX", currency="MXN"))
+        uow.session.flush()
+        uow.session.rollback()
+        
+        with pytest.raises(AppException) as exc_info:
+            next(dependency)
+        
+        assert exc_info.value.status_code == 500
+        assert _school_count(db_session) == 0
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.domain.enums import InvoiceStatus
+from app.repositories.async_repository import AsyncRepository
+from app.repositories.invoice_repository import InvoiceRepository
+from app.repositories.school_repository import SchoolRepository
+from tests.factories import SchoolFactory, StudentFactory, InvoiceFactory
+
+
+pytestmark = pytest.mark.anyio
+
+
+class TestAsyncRepository:
+    async def test_proxies_base_methods(self, db_session: Session, async_session: AsyncSession):
+        school = SchoolFactory(name="Async School")
+        db_session.commit()
+        
+        repo = AsyncRepository(async_session, SchoolRepository)
+        
+        found = await repo.get_by_id(school.id)
+        
+        assert found.name == "Async School"
+        assert await repo.count() == 1
+
+    async def test_proxies_entity_queries(self, db_session: Session, async_session: AsyncSession):
+        student = StudentFactory(school=SchoolFactory())
+        issued = InvoiceFactory(student=student, status=InvoiceStatus.ISSUED.value)
+        InvoiceFactory(student=student, status=InvoiceStatus.PAID.value)
+        db_session.commit()
+        
+        repo = AsyncRepository(async_session, InvoiceRepository)
+        
+        invoices = await repo.search(student_id=student.id, open_only=True)
+        
+        assert [invoice.id for invoice in invoices] == [issued.id]
+
+    async def test_writes_commit_through_async_session(self, db_session: Session, async_session: AsyncSession):
+        repo = AsyncRepository(async_session, SchoolRepository)
+        
+        created = await repo.create_many([{"name": "Written Async", "country": "MX", "currency": "MXN"}])
+        await async_session.commit()
+        
+        assert SchoolRepository(db_session).get_by_name("Written Async").id == created[0].id
+
+    async def test_private_and_unknown_attributes_are_not_proxied(self, async_session: AsyncSession):
+        repo = AsyncRepository(async_session, SchoolRepository)
+        
+        with pytest.raises(AttributeError):
+            repo._count
+        with pytest.raises(AttributeError):
+            repo.not_a_method
+        with pytest.raises(AttributeError, match="sync-only"):
+            repo.iterate
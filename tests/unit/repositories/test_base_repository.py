@@ -1,10 +1,22 @@
+import pytest
+from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 
-from app.repositories.base import BaseRepository
+from app.config import settings
+from app.infrastructure.cache import count_cache
+from app.repositories.base import BaseRepository, TotalCount
 from app.domain.models.school import School
 from tests.factories import SchoolFactory
 
 
+@pytest.fixture
+def enabled_count_cache(monkeypatch):
+    monkeypatch.setattr(count_cache, "ttl_seconds", 60)
+    count_cache.clear()
+    yield count_cache
+    count_cache.clear()
+
+
 class TestBaseRepository:
     def test_create_adds_and_returns_entity(self, db_session: Session):
         repo = BaseRepository(db_session, School)
@@ -83,3 +95,203 @@ class TestBaseRepository:
         
         assert first_page[0].id != second_page[0].id
 
+    def test_count_total_is_exact_below_threshold(self, db_session: Session):
+        repo = BaseRepository(db_session, School)
+        SchoolFactory(is_active=True)
+        SchoolFactory(is_active=True)
+        SchoolFactory(is_active=False)
+        
+        assert repo.count_total() == TotalCount(value=3, exact=True)
+        assert repo.count_total(select(School).where(School.is_active == True)) == TotalCount(value=2, exact=True)
+
+    def test_count_total_ignores_pagination_of_query(self, db_session: Session):
+        repo = BaseRepository(db_session, School)
+        for _ in range(5):
+            SchoolFactory()
+        
+        total = repo.count_total(select(School).order_by(School.name).limit(2).offset(2))
+        
+        assert total == TotalCount(value=5, exact=True)
+
+    def test_count_total_uses_table_estimate_when_large(self, db_session: Session, monkeypatch):
+        repo = BaseRepository(db_session, School)
+        for _ in range(4):
+            SchoolFactory()
+        db_session.commit()
+        db_session.execute(text("ANALYZE schools"))
+        monkeypatch.setattr(settings, "EXACT_COUNT_THRESHOLD", 1)
+        
+        total = repo.count_total()
+        
+        assert total == TotalCount(value=4, exact=False)
+
+    def test_count_total_uses_planner_estimate_for_filtered_query(self, db_session: Session, monkeypatch):
+        repo = BaseRepository(db_session, School)
+        for _ in range(4):
+            SchoolFactory(is_active=True)
+        db_session.commit()
+        db_session.execute(text("ANALYZE schools"))
+        monkeypatch.setattr(settings, "EXACT_COUNT_THRESHOLD", 1)
+        
+        total = repo.count_total(select(School).where(School.is_active == True))
+        
+        assert total.exact is False
+        assert total.value == 4
+
+    def test_count_total_falls_back_to_exact_without_statistics(self, db_session: Session, monkeypatch):
+        repo = BaseRepository(db_session, School)
+        SchoolFactory()
+        monkeypatch.setattr(settings, "EXACT_COUNT_THRESHOLD", 0)
+        
+        total = repo.count_total()
+        
+        assert total == TotalCount(value=1, exact=True)
+
+    def test_count_runs_sql_count(self, db_session: Session, query_counter):
+        repo = BaseRepository(db_session, School)
+        SchoolFactory()
+        SchoolFactory()
+        query_counter.clear()
+        
+        assert repo.count() == 2
+        assert len(query_counter) == 1
+        assert "count(*)" in query_counter[0]
+
+    def test_count_where_applies_criteria(self, db_session: Session):
+        repo = BaseRepository(db_session, School)
+        SchoolFactory(is_active=True)
+        SchoolFactory(is_active=False)
+        
+        assert repo.count_where(School.is_active == False) == 1
+
+    def test_count_cache_reuses_counts_across_sessions(self, db_session: Session, enabled_count_cache):
+        SchoolFactory()
+        db_session.commit()
+        assert BaseRepository(db_session, School).count() == 1
+        
+        SchoolFactory()
+        db_session.commit()
+        
+        assert BaseRepository(db_session, School).count() == 1
+
+    def test_count_cache_is_invalidated_by_repository_writes(self, db_session: Session, enabled_count_cache):
+        SchoolFactory()
+        db_session.commit()
+        reader_session = Session(bind=db_session.get_bind())
+        reader = BaseRepository(reader_session, School)
+        assert reader.count() == 1
+        
+        BaseRepository(db_session, School).create(School(name="New School", country="MX", currency="MXN", is_active=True))
+        db_session.commit()
+        
+        try:
+            assert reader.count() == 2
+        finally:
+            reader_session.close()
+
+    def test_count_cached_before_commit_is_dropped_on_commit(self, db_session: Session, enabled_count_cache):
+        reader_session = Session(bind=db_session.get_bind())
+        reader = BaseRepository(reader_session, School)
+        BaseRepository(db_session, School).create(School(name="New School", country="MX", currency="MXN", is_active=True))
+        
+        try:
+            assert reader.count() == 0
+            reader_session.rollback()
+            db_session.commit()
+            assert reader.count() == 1
+        finally:
+            reader_session.close()
+
+    def test_rolled_back_writes_keep_cached_counts(self, db_session: Session, enabled_count_cache):
+        SchoolFactory()
+        db_session.commit()
+        assert BaseRepository(db_session, School).count() == 1
+        writer_session = Session(bind=db_session.get_bind())
+        BaseRepository(writer_session, School).create(School(name="New School", country="MX", currency="MXN", is_active=True))
+        
+        writer_session.rollback()
+        writer_session.close()
+        hits = enabled_count_cache.hits
+        
+        assert BaseRepository(db_session, School).count() == 1
+        assert enabled_count_cache.hits == hits + 1
+
+    def test_create_many_returns_entities_in_input_order(self, db_session: Session):
+        repo = BaseRepository(db_session, School)
+        rows = [{"name": f"School {i}", "country": "MX", "currency": "MXN"} for i in range(5)]
+        
+        created = repo.create_many(rows)
+        db_session.commit()
+        
+        assert [school.name for school in created] == [row["name"] for row in rows]
+        assert all(school.id is not None and school.is_active for school in created)
+        assert all(school.created_at is not None for school in created)
+
+    def test_create_many_batches_inserts(self, db_session: Session, query_counter):
+        repo = BaseRepository(db_session, School)
+        rows = [{"name": f"School {i}", "country": "MX", "currency": "MXN"} for i in range(2500)]
+        
+        created = repo.create_many(rows)
+        
+        assert len(created) == 2500
+        assert len(query_counter) <= 3
+
+    def test_update_many_applies_per_row_values(self, db_session: Session, query_counter):
+        repo = BaseRepository(db_session, School)
+        first, second = SchoolFactory(name="First"), SchoolFactory(name="Second")
+        
+        repo.update_many([
+            {"id": first.id, "name": "First v2", "is_active": True},
+            {"id": second.id, "name": "Second v2", "is_active": False},
+        ])
+        db_session.commit()
+        
+        assert len([s for s in query_counter if s.startswith("UPDATE")]) == 1
+        assert (first.name, first.is_active) == ("First v2", True)
+        assert (second.name, second.is_active) == ("Second v2", False)
+
+    def test_get_many_returns_requested_entities(self, db_session: Session):
+        repo = BaseRepository(db_session, School)
+        schools = [SchoolFactory() for _ in range(4)]
+        
+        found = repo.get_many([schools[2].id, schools[0].id, 99999])
+        
+        assert [school.id for school in found] == [schools[0].id, schools[2].id]
+        assert repo.get_many([]) == []
+
+    def test_create_and_update_skip_refresh_select(self, db_session: Session, query_counter):
+        repo = BaseRepository(db_session, School)
+        
+        school = repo.create(School(name="No Refresh", country="MX", currency="MXN"))
+        school.name = "Still No Refresh"
+        repo.update(school)
+        db_session.commit()
+        
+        assert school.id is not None
+        assert school.created_at is not None and school.updated_at is not None
+        assert [s.split()[0] for s in query_counter] == ["INSERT", "UPDATE"]
+
+    def test_iterate_streams_entities_through_server_side_cursor(self, db_session: Session):
+        repo = BaseRepository(db_session, School)
+        schools = [SchoolFactory() for _ in range(5)]
+        
+        streamed = []
+        open_cursors = set()
+        for school in repo.iterate(batch_size=2):
+            streamed.append(school)
+            open_cursors.add(db_session.scalar(text("SELECT count(*) FROM pg_cursors")))
+        
+        assert streamed == schools
+        assert open_cursors == {1}
+        assert db_session.scalar(text("SELECT count(*) FROM pg_cursors")) == 0
+
+    def test_iterate_yields_row_tuples_for_column_selects(self, db_session: Session):
+        repo = BaseRepository(db_session, School)
+        school = SchoolFactory(name="Row School")
+        
+        [row] = list(repo.iterate(repo._select(rows=True).where(School.id == school.id)))
+        [(name,)] = list(repo.iterate(select(School.name).where(School.id == school.id)))
+        
+        assert not isinstance(row, School)
+        assert (row.id, row.name) == (school.id, "Row School")
+        assert name == "Row School"
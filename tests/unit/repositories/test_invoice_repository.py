@@ -1,7 +1,11 @@
 from decimal import Decimal
+from datetime import date, datetime, timedelta
+import pytest
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.repositories.invoice_repository import InvoiceRepository
+from app.repositories.base import TotalCount
 from app.domain.enums import InvoiceStatus
 from tests.factories import SchoolFactory, StudentFactory, InvoiceFactory, PaymentFactory
 
@@ -98,6 +102,20 @@ class TestInvoiceRepository:
         
         assert len(invoices) == 2
 
+    def test_iterate_by_school_streams_non_void_invoices_by_id(self, db_session: Session):
+        school = SchoolFactory()
+        student = StudentFactory(school=school)
+        invoices = [InvoiceFactory(student=student, status=InvoiceStatus.ISSUED.value) for _ in range(3)]
+        InvoiceFactory(student=student, status=InvoiceStatus.VOID.value)
+        InvoiceFactory(student=StudentFactory(school=SchoolFactory()))
+        
+        repo = InvoiceRepository(db_session)
+        
+        streamed = [row.id for row in repo.iterate_by_school(school.id, batch_size=2, rows=True)]
+        
+        assert streamed == [invoice.id for invoice in invoices]
+        assert len(list(repo.iterate_by_school(school.id, exclude_void=False))) == 4
+
     def test_get_total_invoiced_by_student_sums_amounts(self, db_session: Session):
         school = SchoolFactory()
         student = StudentFactory(school=school)
@@ -138,3 +156,244 @@ class TestInvoiceRepository:
         
         assert total == Decimal("1800.00")
 
+    def test_search_filters_by_school(self, db_session: Session):
+        school = SchoolFactory()
+        other_school = SchoolFactory()
+        InvoiceFactory(student=StudentFactory(school=school))
+        InvoiceFactory(student=StudentFactory(school=school))
+        InvoiceFactory(student=StudentFactory(school=other_school))
+        
+        repo = InvoiceRepository(db_session)
+        
+        invoices = repo.search(school_id=school.id)
+        
+        assert len(invoices) == 2
+        assert all(inv.student.school_id == school.id for inv in invoices)
+
+    def test_count_search_counts_filtered_invoices_exactly(self, db_session: Session):
+        school = SchoolFactory()
+        InvoiceFactory(student=StudentFactory(school=school), status=InvoiceStatus.ISSUED.value)
+        InvoiceFactory(student=StudentFactory(school=school), status=InvoiceStatus.PAID.value)
+        InvoiceFactory(student=StudentFactory(school=SchoolFactory()))
+        
+        repo = InvoiceRepository(db_session)
+        
+        assert repo.count_search(school_id=school.id, open_only=False) == TotalCount(value=2, exact=True)
+        assert repo.count_search(school_id=school.id, open_only=True) == TotalCount(value=1, exact=True)
+        assert repo.count_search(student_id=None, open_only=False) == TotalCount(value=3, exact=True)
+
+    def test_search_filters_by_due_date_and_amount_ranges(self, db_session: Session):
+        student = StudentFactory(school=SchoolFactory())
+        today = date.today()
+        
+        target = InvoiceFactory(student=student, amount_total=Decimal("500.00"), due_date=today + timedelta(days=10))
+        InvoiceFactory(student=student, amount_total=Decimal("500.00"), due_date=today + timedelta(days=60))
+        InvoiceFactory(student=student, amount_total=Decimal("5000.00"), due_date=today + timedelta(days=10))
+        
+        repo = InvoiceRepository(db_session)
+        
+        invoices = repo.search(
+            due_date_from=today,
+            due_date_to=today + timedelta(days=30),
+            amount_min=Decimal("100.00"),
+            amount_max=Decimal("1000.00"),
+        )
+        
+        assert [inv.id for inv in invoices] == [target.id]
+
+    def test_search_filters_by_currency_and_issued_range(self, db_session: Session):
+        mx_student = StudentFactory(school=SchoolFactory(currency="MXN"))
+        co_student = StudentFactory(school=SchoolFactory(currency="COP"))
+        now = datetime.now()
+        
+        target = InvoiceFactory(student=mx_student, issued_at=now - timedelta(days=1))
+        InvoiceFactory(student=mx_student, issued_at=now - timedelta(days=90))
+        InvoiceFactory(student=co_student, issued_at=now - timedelta(days=1))
+        
+        repo = InvoiceRepository(db_session)
+        
+        invoices = repo.search(currency="MXN", issued_from=now - timedelta(days=7), issued_to=now)
+        
+        assert [inv.id for inv in invoices] == [target.id]
+
+    @pytest.mark.parametrize(
+        "filters, index",
+        [
+            ({"student_id": 1, "status": InvoiceStatus.ISSUED}, "ix_invoices_student_status_created"),
+            ({"school_id": 1}, "ix_students_school_id"),
+            ({"due_date_from": date(2025, 1, 1), "due_date_to": date(2025, 1, 31)}, "ix_invoices_due_date"),
+            ({"issued_from": datetime(2025, 1, 1), "issued_to": datetime(2025, 1, 31)}, "ix_invoices_issued_at"),
+            ({"currency": "USD"}, "ix_invoices_currency_created"),
+            ({}, "ix_invoices_created_at"),
+        ],
+    )
+    def test_search_hot_filters_use_their_index(self, db_session: Session, filters, index):
+        _load_invoices(db_session)
+        
+        repo = InvoiceRepository(db_session)
+        query = repo._search_query(**filters).order_by(repo.model.created_at.desc()).limit(100)
+        compiled = query.compile(dialect=db_session.bind.dialect, compile_kwargs={"render_postcompile": True})
+        
+        plan = db_session.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        
+        assert index in _used_indexes(plan[0]["Plan"])
+
+    def test_lock_by_ids_returns_existing_invoices_ordered_by_id(self, db_session: Session):
+        student = StudentFactory(school=SchoolFactory())
+        first = InvoiceFactory(student=student)
+        second = InvoiceFactory(student=student)
+        
+        repo = InvoiceRepository(db_session)
+        
+        invoices = repo.lock_by_ids([second.id, 99999, first.id])
+        
+        assert [inv.id for inv in invoices] == [first.id, second.id]
+
+    def test_lock_by_filter_locks_only_the_matching_invoices(self, db_session: Session):
+        school = SchoolFactory()
+        student = StudentFactory(school=school)
+        issued = InvoiceFactory(student=student, status=InvoiceStatus.ISSUED.value)
+        paid = InvoiceFactory(student=student, status=InvoiceStatus.PAID.value)
+        partial = InvoiceFactory(student=student, status=InvoiceStatus.PARTIAL.value)
+        other_school = InvoiceFactory(student=StudentFactory(school=SchoolFactory()), status=InvoiceStatus.ISSUED.value)
+        db_session.commit()
+        
+        repo = InvoiceRepository(db_session)
+        
+        invoices = repo.lock_by_filter(limit=10, school_id=school.id, open_only=True)
+        
+        assert [inv.id for inv in invoices] == [issued.id, partial.id]
+        with db_session.get_bind().connect() as other:
+            unlocked_invoices = other.execute(text("SELECT id FROM invoices ORDER BY id FOR UPDATE SKIP LOCKED")).scalars()
+            assert list(unlocked_invoices) == [paid.id, other_school.id]
+            # FOR UPDATE OF invoices: the joined student row stays unlocked
+            unlocked_students = other.execute(text("SELECT id FROM students FOR UPDATE SKIP LOCKED")).scalars()
+            assert student.id in list(unlocked_students)
+            other.rollback()
+
+    def test_bulk_update_changes_only_selected_invoices(self, db_session: Session):
+        student = StudentFactory(school=SchoolFactory())
+        selected = InvoiceFactory(student=student, status=InvoiceStatus.ISSUED.value)
+        untouched = InvoiceFactory(student=student, status=InvoiceStatus.ISSUED.value)
+        previous_updated_at = selected.updated_at
+        
+        repo = InvoiceRepository(db_session)
+        
+        updated = repo.bulk_update([selected.id], {"status": InvoiceStatus.VOID.value})
+        db_session.commit()
+        db_session.expire_all()
+        
+        assert updated == 1
+        assert repo.get_by_id(selected.id).status == InvoiceStatus.VOID.value
+        assert repo.get_by_id(selected.id).updated_at > previous_updated_at
+        assert repo.get_by_id(untouched.id).status == InvoiceStatus.ISSUED.value
+
+    def test_search_with_balance_computes_paid_per_invoice(self, db_session: Session):
+        student = StudentFactory(school=SchoolFactory())
+        partial = InvoiceFactory(student=student, amount_total=Decimal("1000.00"))
+        unpaid = InvoiceFactory(student=student, amount_total=Decimal("400.00"))
+        PaymentFactory(invoice=partial, amount=Decimal("300.00"))
+        PaymentFactory(invoice=partial, amount=Decimal("200.00"))
+        
+        repo = InvoiceRepository(db_session)
+        
+        rows = repo.search_with_balance(student_id=student.id)
+        
+        paid_by_id = {invoice.id: paid for invoice, paid in rows}
+        assert paid_by_id == {partial.id: Decimal("500.00"), unpaid.id: Decimal("0")}
+
+    def test_search_with_balance_runs_single_query(self, db_session: Session, query_counter):
+        student = StudentFactory(school=SchoolFactory())
+        for _ in range(5):
+            PaymentFactory(invoice=InvoiceFactory(student=student))
+        repo = InvoiceRepository(db_session)
+        query_counter.clear()
+        
+        rows = repo.search_with_balance(limit=10)
+        
+        assert len(rows) == 5
+        assert len(query_counter) == 1
+
+    def test_get_by_id_with_balance(self, db_session: Session):
+        invoice = InvoiceFactory(student=StudentFactory(school=SchoolFactory()), amount_total=Decimal("1000.00"))
+        PaymentFactory(invoice=invoice, amount=Decimal("250.00"))
+        
+        repo = InvoiceRepository(db_session)
+        
+        found, paid = repo.get_by_id_with_balance(invoice.id)
+        
+        assert found.id == invoice.id
+        assert paid == Decimal("250.00")
+        assert repo.get_by_id_with_balance(99999) is None
+
+    def test_search_open_only_returns_open_invoices_by_due_date(self, db_session: Session):
+        student = StudentFactory(school=SchoolFactory())
+        today = date.today()
+        issued = InvoiceFactory(student=student, status=InvoiceStatus.ISSUED.value, due_date=today + timedelta(days=20))
+        partial = InvoiceFactory(student=student, status=InvoiceStatus.PARTIAL.value, due_date=today + timedelta(days=5))
+        same_due = InvoiceFactory(student=student, status=InvoiceStatus.ISSUED.value, due_date=today + timedelta(days=5))
+        InvoiceFactory(student=student, status=InvoiceStatus.PAID.value)
+        InvoiceFactory(student=student, status=InvoiceStatus.VOID.value)
+        
+        repo = InvoiceRepository(db_session)
+        
+        invoices = repo.search(student_id=student.id, open_only=True)
+        
+        assert [inv.id for inv in invoices] == [partial.id, same_due.id, issued.id]
+        assert [inv.id for inv in repo.search(student_id=student.id, open_only=True, limit=1, offset=1)] == [same_due.id]
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {"open_only": True, "due_date_from": date(2025, 1, 1)},
+            {"open_only": True, "student_id": 1, "due_date_to": date(2025, 1, 1)},
+            {"status": InvoiceStatus.ISSUED, "due_date_from": date(2025, 1, 1)},
+        ],
+    )
+    def test_open_invoice_queries_use_partial_indexes(self, db_session: Session, filters):
+        _load_invoices(db_session)
+        
+        repo = InvoiceRepository(db_session)
+        query = repo._search_query(**filters)
+        compiled = query.compile(dialect=db_session.bind.dialect, compile_kwargs={"render_postcompile": True})
+        
+        plan = db_session.connection().exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+        ).scalar()
+        
+        open_indexes = {"ix_invoices_open_due_date", "ix_invoices_open_student_due"}
+        assert _used_indexes(plan[0]["Plan"]) & open_indexes
+
+
+def _load_invoices(db_session: Session) -> None:
+    # 500 schools of 10 students each
+    db_session.execute(text(
+        "INSERT INTO schools (name, country, currency, is_active, created_at, updated_at)"
+        " SELECT 'School ' || n, 'MX', 'MXN', true, now(), now()"
+        " FROM generate_series(1, 500) AS n"
+    ))
+    db_session.execute(text(
+        "INSERT INTO students (school_id, first_name, last_name, email, created_at, updated_at)"
+        " SELECT n % 500 + 1, 'Student', 'Test', 'student' || n || '@example.com', now(), now()"
+        " FROM generate_series(1, 5000) AS n"
+    ))
+    # 20k invoices over two years; one in a hundred in USD. Like real data, most
+    # open invoices are recent: older ones are settled but for one in fifty.
+    db_session.execute(text(
+        "INSERT INTO invoices (student_id, amount_total, currency, status, issued_at, due_date, created_at, updated_at)"
+        " SELECT n % 5000 + 1, 100, CASE WHEN n % 100 = 0 THEN 'USD' ELSE 'MXN' END,"
+        " CASE WHEN n > 18000 OR n % 50 = 0 THEN (ARRAY['ISSUED', 'PARTIAL'])[n % 2 + 1]"
+        " WHEN n % 10 = 0 THEN 'VOID' ELSE 'PAID' END,"
+        " ts, ts::date + 30, ts, ts"
+        " FROM generate_series(1, 20000) AS n, LATERAL (SELECT timestamp '2024-01-01' + n * interval '1 hour' AS ts) AS t"
+    ))
+    db_session.execute(text("ANALYZE schools, students, invoices"))
+
+
+def _used_indexes(node: dict) -> set:
+    indexes = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", []):
+        indexes |= _used_indexes(child)
+    return indexes
@@ -1,12 +1,13 @@
 from unittest.mock import MagicMock
 from decimal import Decimal
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 
 import pytest
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.services.invoice_service import InvoiceService
-from app.schemas.invoice import InvoiceCreate, InvoiceUpdate
+from app.repositories.base import TotalCount
+from app.schemas.invoice import InvoiceCreate, InvoiceUpdate, InvoiceFilter, InvoiceBulkVoid, InvoiceBulkUpdate
 from app.domain.enums import InvoiceStatus
 from app.exceptions import AppException
 
@@ -275,35 +276,205 @@ class TestInvoiceService:
     def test_get_all_invoices(self):
         invoices_mock = [MagicMock(), MagicMock()]
         
-        self.invoice_repo_mock.get_all.return_value = invoices_mock
+        self.invoice_repo_mock.search.return_value = invoices_mock
         
         result = self.service.get_all(limit=100, offset=0)
         
         assert len(result) == 2
-        self.invoice_repo_mock.get_all.assert_called_once_with(limit=100, offset=0, status=None)
+        self.invoice_repo_mock.search.assert_called_once()
+        call_kwargs = self.invoice_repo_mock.search.call_args.kwargs
+        assert call_kwargs["limit"] == 100
+        assert call_kwargs["offset"] == 0
+        assert call_kwargs["student_id"] is None
+        assert call_kwargs["status"] is None
 
     def test_get_all_invoices_by_student(self):
         invoices_mock = [MagicMock()]
         
-        self.invoice_repo_mock.get_by_student.return_value = invoices_mock
+        self.invoice_repo_mock.search.return_value = invoices_mock
         
-        result = self.service.get_all(limit=100, offset=0, student_id=1)
+        result = self.service.get_all(limit=100, offset=0, filters=InvoiceFilter(student_id=1))
         
         assert len(result) == 1
-        self.invoice_repo_mock.get_by_student.assert_called_once_with(
-            student_id=1,
-            status=None,
-            limit=100,
-            offset=0
-        )
+        call_kwargs = self.invoice_repo_mock.search.call_args.kwargs
+        assert call_kwargs["student_id"] == 1
+        assert call_kwargs["status"] is None
 
     def test_get_all_invoices_by_status(self):
         invoices_mock = [MagicMock()]
         
-        self.invoice_repo_mock.get_all.return_value = invoices_mock
+        self.invoice_repo_mock.search.return_value = invoices_mock
+        
+        result = self.service.get_all(limit=100, offset=0, filters=InvoiceFilter(status=InvoiceStatus.PAID))
+        
+        assert len(result) == 1
+        call_kwargs = self.invoice_repo_mock.search.call_args.kwargs
+        assert call_kwargs["status"] == InvoiceStatus.PAID
+
+    def test_get_all_invoices_passes_search_filters(self):
+        self.invoice_repo_mock.search.return_value = []
+        
+        filters = InvoiceFilter(
+            school_id=3,
+            currency="mxn",
+            due_date_from=date(2025, 1, 1),
+            due_date_to=date(2025, 6, 30),
+            amount_min=Decimal("100.00"),
+            amount_max=Decimal("500.00"),
+        )
+        
+        self.service.get_all(limit=50, offset=10, filters=filters)
+        
+        call_kwargs = self.invoice_repo_mock.search.call_args.kwargs
+        assert call_kwargs["school_id"] == 3
+        assert call_kwargs["currency"] == "MXN"
+        assert call_kwargs["due_date_from"] == date(2025, 1, 1)
+        assert call_kwargs["due_date_to"] == date(2025, 6, 30)
+        assert call_kwargs["amount_min"] == Decimal("100.00")
+        assert call_kwargs["amount_max"] == Decimal("500.00")
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            InvoiceFilter(due_date_from=date(2025, 6, 30), due_date_to=date(2025, 1, 1)),
+            InvoiceFilter(amount_min=Decimal("500.00"), amount_max=Decimal("100.00")),
+        ],
+    )
+    def test_get_all_invoices_rejects_inverted_ranges(self, filters):
+        with pytest.raises(AppException) as exc_info:
+            self.service.get_all(filters=filters)
+        
+        assert exc_info.value.status_code == 400
+        assert "range" in exc_info.value.detail
+        self.invoice_repo_mock.search.assert_not_called()
+
+    def test_get_all_invoices_accepts_mixed_timezone_bounds(self):
+        filters = InvoiceFilter(
+            issued_from=datetime(2025, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=-6))),
+            issued_to=datetime(2025, 1, 1, 19, 0),
+        )
+        
+        self.service.get_all(filters=filters)
+        
+        call_kwargs = self.invoice_repo_mock.search.call_args.kwargs
+        assert call_kwargs["issued_from"] == datetime(2025, 1, 1, 18, 0)
+        assert call_kwargs["issued_to"] == datetime(2025, 1, 1, 19, 0)
+
+    def test_count_invoices_passes_search_filters(self):
+        self.invoice_repo_mock.count_search.return_value = TotalCount(value=12, exact=True)
+        
+        result = self.service.count(filters=InvoiceFilter(student_id=3, open_only=True))
+        
+        assert result == TotalCount(value=12, exact=True)
+        kwargs = self.invoice_repo_mock.count_search.call_args.kwargs
+        assert kwargs["student_id"] == 3
+        assert kwargs["open_only"] is True
+
+    def test_get_all_with_balance_builds_paid_and_pending(self):
+        invoice_mock = MagicMock()
+        invoice_mock.id = 1
+        invoice_mock.student_id = 1
+        invoice_mock.amount_total = Decimal("1000.00")
+        invoice_mock.currency = "MXN"
+        invoice_mock.status = InvoiceStatus.PARTIAL.value
+        invoice_mock.issued_at = datetime(2025, 1, 1)
+        invoice_mock.due_date = date(2025, 2, 1)
+        invoice_mock.description = None
+        invoice_mock.created_at = datetime(2025, 1, 1)
+        invoice_mock.updated_at = datetime(2025, 1, 1)
+        
+        self.invoice_repo_mock.search_with_balance.return_value = [(invoice_mock, Decimal("300.00"))]
         
-        result = self.service.get_all(limit=100, offset=0, status=InvoiceStatus.PAID)
+        result = self.service.get_all_with_balance(filters=InvoiceFilter(student_id=1))
         
         assert len(result) == 1
-        self.invoice_repo_mock.get_all.assert_called_once_with(limit=100, offset=0, status=InvoiceStatus.PAID)
+        assert result[0].paid == Decimal("300.00")
+        assert result[0].pending == Decimal("700.00")
+        assert self.invoice_repo_mock.search_with_balance.call_args.kwargs["student_id"] == 1
 
+    def test_get_by_id_with_balance_not_found(self):
+        self.invoice_repo_mock.get_by_id_with_balance.return_value = None
+        
+        with pytest.raises(AppException) as exc_info:
+            self.service.get_by_id_with_balance(999)
+        
+        assert exc_info.value.status_code == 404
+
+    def _invoice_mock(self, invoice_id, status):
+        invoice_mock = MagicMock()
+        invoice_mock.id = invoice_id
+        invoice_mock.status = status
+        return invoice_mock
+
+    def test_bulk_void_reports_per_id_outcomes(self):
+        self.invoice_repo_mock.lock_by_ids.return_value = [
+            self._invoice_mock(1, InvoiceStatus.ISSUED.value),
+            self._invoice_mock(2, InvoiceStatus.VOID.value),
+        ]
+        
+        result = self.service.bulk_void(InvoiceBulkVoid(ids=[1, 2, 3]))
+        
+        assert result.succeeded == 1
+        assert result.failed == 2
+        assert [(r.id, r.success, r.status_code) for r in result.results] == [
+            (1, True, 200),
+            (2, False, 404),
+            (3, False, 404),
+        ]
+        self.invoice_repo_mock.lock_by_ids.assert_called_once_with([1, 2, 3])
+        self.invoice_repo_mock.bulk_update.assert_called_once_with([1], {"status": InvoiceStatus.VOID.value})
+        self.session_mock.commit.assert_called_once()
+
+    def test_bulk_void_by_filter_rejects_oversized_selection(self):
+        self.invoice_repo_mock.lock_by_filter.return_value = [
+            self._invoice_mock(i, InvoiceStatus.ISSUED.value) for i in range(1002)
+        ]
+        
+        with pytest.raises(AppException) as exc_info:
+            self.service.bulk_void(InvoiceBulkVoid(filter=InvoiceFilter(currency="MXN")))
+        
+        assert exc_info.value.status_code == 400
+        assert "Narrow the filter" in exc_info.value.detail
+        self.invoice_repo_mock.bulk_update.assert_not_called()
+        self.session_mock.rollback.assert_called_once()
+
+    def test_bulk_void_database_error(self):
+        self.invoice_repo_mock.lock_by_ids.return_value = [self._invoice_mock(1, InvoiceStatus.ISSUED.value)]
+        self.session_mock.commit.side_effect = SQLAlchemyError("Connection lost")
+        
+        with pytest.raises(AppException) as exc_info:
+            self.service.bulk_void(InvoiceBulkVoid(ids=[1]))
+        
+        assert exc_info.value.status_code == 500
+        assert "Failed to bulk void invoices" in exc_info.value.detail
+        self.session_mock.rollback.assert_called_once()
+
+    def test_bulk_update_applies_update_rules(self):
+        self.invoice_repo_mock.lock_by_filter.return_value = [
+            self._invoice_mock(1, InvoiceStatus.ISSUED.value),
+            self._invoice_mock(2, InvoiceStatus.PAID.value),
+            self._invoice_mock(3, InvoiceStatus.PARTIAL.value),
+        ]
+        new_due_date = date(2026, 1, 31)
+        
+        result = self.service.bulk_update(
+            InvoiceBulkUpdate(filter=InvoiceFilter(school_id=1), due_date=new_due_date)
+        )
+        
+        assert result.succeeded == 2
+        assert result.results[1].detail == "Cannot update paid invoice"
+        self.invoice_repo_mock.bulk_update.assert_called_once_with([1, 3], {"due_date": new_due_date})
+        self.session_mock.commit.assert_called_once()
+
+    def test_bulk_selection_requires_ids_or_filter(self):
+        with pytest.raises(ValueError, match="Provide 'ids' or 'filter'"):
+            InvoiceBulkVoid()
+        
+        with pytest.raises(ValueError, match="not both"):
+            InvoiceBulkVoid(ids=[1], filter=InvoiceFilter(school_id=1))
+        
+        with pytest.raises(ValueError):
+            InvoiceBulkVoid(filter=InvoiceFilter())
+        
+        with pytest.raises(ValueError):
+            InvoiceBulkUpdate(ids=[1])
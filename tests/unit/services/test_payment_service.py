@@ -48,7 +48,7 @@ class TestPaymentService:
         self.invoice_repo_mock.get_by_id.assert_called_once_with(1)
         self.payment_repo_mock.get_total_paid_by_invoice.assert_called_once()
         self.payment_repo_mock.create.assert_called_once()
-        self.invoice_repo_mock.update.assert_called_once()
+        self.invoice_repo_mock.save_status.assert_called_once_with(invoice_mock)
         self.session_mock.commit.assert_called_once()
 
     @pytest.mark.parametrize(
@@ -4,6 +4,7 @@ import pytest
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.services.school_service import SchoolService
+from app.repositories.base import TotalCount
 from app.schemas.school import SchoolCreate, SchoolUpdate
 from app.exceptions import AppException
 
@@ -285,3 +286,11 @@ class TestSchoolService:
         assert len(result) == 1
         self.school_repo_mock.get_all.assert_called_once_with(limit=100, offset=0, is_active=True)
 
+    def test_count_schools_delegates_to_repository(self):
+        self.school_repo_mock.count_all.return_value = TotalCount(value=7, exact=True)
+        
+        result = self.service.count(is_active=True)
+        
+        assert result == TotalCount(value=7, exact=True)
+        self.school_repo_mock.count_all.assert_called_once_with(is_active=True)
+
@@ -5,6 +5,7 @@ import pytest
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.services.student_service import StudentService
+from app.repositories.base import TotalCount
 from app.schemas.student import StudentCreate, StudentUpdate
 from app.exceptions import AppException
 
@@ -245,3 +246,11 @@ class TestStudentService:
         assert len(result) == 1
         self.student_repo_mock.get_by_school.assert_called_once_with(school_id=1, limit=100, offset=0)
 
+    def test_count_students_by_school(self):
+        self.student_repo_mock.count_all.return_value = TotalCount(value=250000, exact=False)
+        
+        result = self.service.count(school_id=1)
+        
+        assert result == TotalCount(value=250000, exact=False)
+        self.student_repo_mock.count_all.assert_called_once_with(school_id=1)
+